@@ -29,14 +29,23 @@ __license__ = "MIT License"
 
 import logging
 from URBasic.connectionState import ConnectionState
+from URBasic.asyncDashboard import AsyncDashBoard
 from URBasic.dashboard import DashBoard
 from URBasic.dataLog import DataLog
 from URBasic.dataLogging import DataLogging
+from URBasic.dynamics import DynamicsModel
+from URBasic.dynamicsSimulator import DynamicsSimulator
+from URBasic.ikCache import IkCache
 #from URBasic.kinematic import *
 from URBasic.manipulation import *
+from URBasic.programBuilder import ProgramBuilder
 from URBasic.realTimeClient import RealTimeClient
 from URBasic.robotConnector import RobotConnector
 from URBasic.robotModel import RobotModel
+from URBasic.robotRegistry import RobotParameter, RegisterRobot, GetRobot
+from URBasic.robotStateCache import RobotStateCache
+from URBasic.singularityMonitor import SingularityMonitor
 from URBasic.rtde import RTDE
+from URBasic.trajectoryStreamer import TrajectoryStreamer
 from URBasic.urScript import UrScript
 from URBasic.urScriptExt import UrScriptExt
@@ -0,0 +1,258 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import asyncio
+import collections
+import logging
+import time
+
+DEFAULT_TIMEOUT = 2.0
+
+
+class DashBoardNotConnectedError(ConnectionError):
+    '''
+    Raised by SendCommand before anything is written, so the DashBoard server has not received the command.
+    Any other ConnectionError or a timeout leaves open whether the command was executed.
+    '''
+
+
+class AsyncDashBoard(object):
+    '''
+    asyncio client for the DashBoard server (port 29999).
+
+    Every reply of the DashBoard server is a single line, sent in the order the commands were received.
+    Commands are written immediately and a future per command is kept in a FIFO; the reader task resolves
+    the oldest pending future with each complete line. Several commands can be in flight at the same time
+    and each caller gets the reply to its own command.
+
+    Input parameters:
+    host (string): hostname or IP of UR Robot
+    port (int): DashBoard server port
+    timeout (float): Default time to wait for a reply [s]
+
+    Example:
+    dashboard = URBasic.asyncDashboard.AsyncDashBoard('192.168.56.101')
+    await dashboard.connect()
+    await dashboard.ur_power_on()
+    mode = await dashboard.ur_robotmode()
+    '''
+
+    def __init__(self, host, port=29999, timeout=DEFAULT_TIMEOUT):
+        self.__host = host
+        self.__port = port
+        self.__timeout = timeout
+        self.__reader = None
+        self.__writer = None
+        self.__readTask = None
+        self.__pending = collections.deque()
+        self.__sentCommands = 0
+        self.__receivedReplies = 0
+        self.__maxPending = 0
+        self.welcome = None
+        self.last_respond = None
+
+    def IsConnected(self):
+        return self.__writer is not None and self.__readTask is not None and not self.__readTask.done()
+
+    def GetStatistics(self):
+        '''
+        Return value:
+        statistics (dict): sent commands, received replies, currently pending and the most pending at once
+        '''
+        return {'sent_commands': self.__sentCommands,
+                'received_replies': self.__receivedReplies,
+                'pending': len(self.__pending),
+                'max_pending': self.__maxPending}
+
+    async def connect(self):
+        '''
+        Open the connection and read the welcome message.
+
+        Return value:
+        success (boolean)
+        '''
+        if self.IsConnected():
+            return True
+        try:
+            self.__reader, self.__writer = await asyncio.wait_for(
+                asyncio.open_connection(self.__host, self.__port), self.__timeout)
+            self.welcome = (await asyncio.wait_for(self.__reader.readline(), self.__timeout)).decode().strip()
+        except (OSError, asyncio.TimeoutError) as error:
+            logging.error('AsyncDashBoard: Connecting failed ' + str(error))
+            await self.close()
+            return False
+        self.__readTask = asyncio.ensure_future(self.__readLoop())
+        logging.info('AsyncDashBoard: Connected ' + self.welcome)
+        return True
+
+    async def close(self):
+        if self.__readTask is not None:
+            self.__readTask.cancel()
+            self.__readTask = None
+        if self.__writer is not None:
+            self.__writer.close()
+            try:
+                await self.__writer.wait_closed()
+            except OSError:
+                pass
+            self.__writer = None
+        self.__reader = None
+        self.__failPending(ConnectionError('AsyncDashBoard: Connection closed'))
+
+    async def SendCommand(self, cmd, timeout=None):
+        '''
+        Send one command and wait for its reply.
+
+        Input parameters:
+        cmd (str): DashBoard command without the trailing newline
+        timeout (float): Time to wait for the reply [s], defaults to the client timeout
+
+        Return value:
+        reply (str): The reply line without the trailing newline
+
+        Raises DashBoardNotConnectedError when not connected, ConnectionError when the connection is lost after
+        the write and asyncio.TimeoutError when no reply arrives in time.
+        '''
+        future = self.__write(cmd)
+        await self.__writer.drain()
+        return await self.__waitForReply(future, cmd, timeout)
+
+    async def SendCommands(self, cmds, timeout=None):
+        '''
+        Pipeline several commands, all are written before the first reply is awaited.
+
+        Input parameters:
+        cmds (list of str): DashBoard commands
+
+        Return value:
+        replies (list of str): One reply per command, in the same order
+        '''
+        futures = [self.__write(cmd) for cmd in cmds]
+        await self.__writer.drain()
+        return [await self.__waitForReply(future, cmd, timeout) for future, cmd in zip(futures, cmds)]
+
+    async def WaitForRobotMode(self, modes, timeout=10.0, interval=0.2):
+        '''
+        Poll robotmode until it is one of modes.
+
+        Input parameters:
+        modes (list of str): Accepted modes, e.g. ['IDLE', 'RUNNING']
+        timeout (float): Maximum time to wait [s]
+        interval (float): Time between two enquiries [s]
+
+        Return value:
+        mode (str): The last reported mode
+        '''
+        deadline = time.monotonic() + timeout
+        mode = None
+        while True:
+            mode = (await self.ur_robotmode()).split(':')[-1].strip()
+            if mode in modes or time.monotonic() >= deadline:
+                return mode
+            await asyncio.sleep(interval)
+
+    def __write(self, cmd):
+        if not self.IsConnected():
+            raise DashBoardNotConnectedError('AsyncDashBoard: Not connected')
+        future = asyncio.get_running_loop().create_future()
+        self.__pending.append(future)
+        self.__writer.write((cmd + '\n').encode())
+        self.__sentCommands += 1
+        self.__maxPending = max(self.__maxPending, len(self.__pending))
+        return future
+
+    async def __waitForReply(self, future, cmd, timeout):
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.__timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            logging.error('AsyncDashBoard: No reply to ' + cmd)
+            raise
+
+    async def __readLoop(self):
+        try:
+            while True:
+                line = await self.__reader.readline()
+                if not line:
+                    break
+                self.__receivedReplies += 1
+                self.last_respond = line.decode().strip()
+                logging.debug('AsyncDashBoard: respond ' + self.last_respond)
+                if not self.__pending:
+                    logging.warning('AsyncDashBoard: Unexpected respond ' + self.last_respond)
+                    continue
+                future = self.__pending.popleft()
+                if not future.done():
+                    future.set_result(self.last_respond)
+        except (OSError, asyncio.IncompleteReadError) as error:
+            logging.error('AsyncDashBoard: Connection lost ' + str(error))
+        self.__failPending(ConnectionError('AsyncDashBoard: Connection lost'))
+
+    def __failPending(self, error):
+        while self.__pending:
+            future = self.__pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+                future.exception()
+
+    async def ur_load(self, file):
+        return await self.SendCommand('load ' + file)
+
+    async def ur_play(self):
+        return await self.SendCommand('play')
+
+    async def ur_stop(self):
+        return await self.SendCommand('stop')
+
+    async def ur_pause(self):
+        return await self.SendCommand('pause')
+
+    async def ur_shutdown(self):
+        return await self.SendCommand('shutdown')
+
+    async def ur_running(self):
+        return await self.SendCommand('running')
+
+    async def ur_robotmode(self):
+        return await self.SendCommand('robotmode')
+
+    async def ur_get_loaded_program(self):
+        return await self.SendCommand('get loaded program')
+
+    async def ur_popup(self, popupText=''):
+        return await self.SendCommand('popup ' + popupText)
+
+    async def ur_close_popup(self):
+        return await self.SendCommand('close popup')
+
+    async def ur_addToLog(self, logMessage):
+        return await self.SendCommand('addToLog ' + logMessage)
+
+    async def ur_isProgramSaved(self):
+        return await self.SendCommand('isProgramSaved')
+
+    async def ur_programState(self):
+        return await self.SendCommand('programState')
+
+    async def ur_polyscopeVersion(self):
+        return await self.SendCommand('polyscopeVersion')
+
+    async def ur_power_on(self):
+        return await self.SendCommand('power on')
+
+    async def ur_power_off(self):
+        return await self.SendCommand('power off')
+
+    async def ur_brake_release(self):
+        return await self.SendCommand('brake release')
+
+    async def ur_safetymode(self):
+        return await self.SendCommand('safetymode')
+
+    async def ur_unlock_protective_stop(self):
+        return await self.SendCommand('unlock protective stop')
+
+    async def ur_close_safety_popup(self):
+        return await self.SendCommand('close safety popup')
+
+    async def ur_load_installation(self, instal='default.installation'):
+        return await self.SendCommand('load installation ' + instal)
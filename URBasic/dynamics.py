@@ -0,0 +1,270 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import numpy as np
+from URBasic.manipulation import MatrixExp6Array, TransInv, Adjoint
+
+
+def AdjointArray(T):
+    '''
+    Vectorized Adjoint for an S x 4 x 4 array of transformation matrices, returns S x 6 x 6.
+    '''
+    T = np.asarray(T, dtype=float)
+    R = T[..., :3, :3]
+    p = T[..., :3, 3]
+    p_skew = np.zeros(p.shape + (3,))
+    p_skew[..., 0, 1] = -p[..., 2]
+    p_skew[..., 0, 2] = p[..., 1]
+    p_skew[..., 1, 0] = p[..., 2]
+    p_skew[..., 1, 2] = -p[..., 0]
+    p_skew[..., 2, 0] = -p[..., 1]
+    p_skew[..., 2, 1] = p[..., 0]
+    adT = np.zeros(T.shape[:-2] + (6, 6))
+    adT[..., :3, :3] = R
+    adT[..., 3:, :3] = np.matmul(p_skew, R)
+    adT[..., 3:, 3:] = R
+    return adT
+
+
+def CrossArray(a, b):
+    '''
+    Cross product of S x 3 arrays, without the axis handling overhead of numpy.cross for small S.
+    '''
+    a0, a1, a2 = a[..., 0], a[..., 1], a[..., 2]
+    b0, b1, b2 = b[..., 0], b[..., 1], b[..., 2]
+    c = np.empty(np.broadcast(a, b).shape)
+    c[..., 0] = a1 * b2 - a2 * b1
+    c[..., 1] = a2 * b0 - a0 * b2
+    c[..., 2] = a0 * b1 - a1 * b0
+    return c
+
+
+def adArray(V):
+    '''
+    Vectorized [ad_V] of S x 6 twists (w, v), returns S x 6 x 6.
+    '''
+    V = np.asarray(V, dtype=float)
+    ad = np.zeros(V.shape[:-1] + (6, 6))
+    for offset, (row, column) in [(0, (0, 0)), (3, (3, 0)), (0, (3, 3))]:
+        x, y, z = V[..., offset], V[..., offset + 1], V[..., offset + 2]
+        ad[..., row, column + 1] = -z
+        ad[..., row, column + 2] = y
+        ad[..., row + 1, column] = z
+        ad[..., row + 1, column + 2] = -x
+        ad[..., row + 2, column] = -y
+        ad[..., row + 2, column + 1] = x
+    return ad
+
+
+def LieBracketArray(V1, V2):
+    '''
+    Vectorized LieBracket [ad_V1] V2 for S x 6 twists (w, v), returns S x 6.
+    '''
+    w1, v1 = V1[..., :3], V1[..., 3:]
+    w2, v2 = V2[..., :3], V2[..., 3:]
+    return np.concatenate((CrossArray(w1, w2), CrossArray(v1, w2) + CrossArray(w1, v2)), axis=-1)
+
+
+def TruthBracketArray(V, F):
+    '''
+    Vectorized TruthBracket [ad_V]^T F for S x 6 twists V (w, v) and wrenches F (m, f), returns S x 6.
+    '''
+    # w x m, v x f and w x f in one call
+    cross = CrossArray(V[..., [0, 1, 2, 3, 4, 5, 0, 1, 2]].reshape(V.shape[:-1] + (3, 3)),
+                       F[..., [0, 1, 2, 3, 4, 5, 3, 4, 5]].reshape(F.shape[:-1] + (3, 3)))
+    return -np.concatenate((cross[..., 0, :] + cross[..., 1, :], cross[..., 2, :]), axis=-1)
+
+
+class DynamicsModel(object):
+    '''
+    Rigid body dynamics of an open chain, with the time-invariant terms computed once.
+
+    Uses the product of exponentials formulation of manipulation.InverseDynamics (Lynch and Park,
+    Modern Robotics, ch. 8): relative home frames M_rels, spatial inertia matrices Glist and fixed screw
+    axes Slist. The link frames, the screw axes in the link frames and the adjoints of the home frames
+    are precomputed, and every method evaluates T samples at once with stacked NumPy operations, so the
+    Python loops only run over the n joints. For revolute joints (unit axis, zero pitch) Ad_T_{i,i-1} is
+    C0 + sin(theta) C1 + cos(theta) C2 and the three coefficient matrices are precomputed as well.
+
+    Unlike manipulation.InverseDynamics, the recursion starts at the base (joint 1 velocity and gravity
+    are propagated into link 1) and the wrench of each link is passed to its parent, as in the
+    reference algorithm.
+
+    Input parameters:
+    M_rels (list of 4x4): M_{i-1,i} of the n links, optionally followed by M_{n,tip} of the end-effector frame
+    Glist (list of 6x6): Spatial inertia matrix of each link in its link frame
+    Slist (n x 6 list): Fixed screw axes, one per row
+
+    Example:
+    dynamicsModel = URBasic.dynamics.DynamicsModel(M_rels, Glist, Slist)
+    tau_traj = dynamicsModel.InverseDynamics(thetas_traj, thetadots_traj, thetadotdots_traj, [0, 0, -9.81])
+    '''
+
+    def __init__(self, M_rels, Glist, Slist):
+        Slist = np.asarray(Slist, dtype=float)
+        self.__n = len(Slist)
+        M_rels = [np.asarray(M_rel, dtype=float) for M_rel in M_rels]
+        M_tip = M_rels[self.__n] if len(M_rels) > self.__n else np.identity(4)
+        self.__Glist = np.array(Glist, dtype=float).reshape(self.__n, 6, 6)
+        M = np.identity(4)
+        Alist = []
+        for i in range(self.__n):
+            M = M.dot(M_rels[i])
+            Alist.append(Adjoint(TransInv(M)).dot(Slist[i]))
+        self.__Alist = np.array(Alist)
+        self.__AdM_inv = np.array([Adjoint(TransInv(M_rel)) for M_rel in M_rels[:self.__n]])
+        self.__AdM_tip_inv = Adjoint(TransInv(M_tip))
+        # -[ad_A_i], so that [ad_V] A_i = V.dot(adA_T[i])
+        self.__adA_T = -adArray(self.__Alist).transpose(0, 2, 1)
+        self.__AdT_coefficients = None
+        if np.allclose(np.linalg.norm(self.__Alist[:, :3], axis=1), 1) \
+                and np.allclose(np.einsum('ij,ij->i', self.__Alist[:, :3], self.__Alist[:, 3:]), 0):
+            # AdT(0) = C0 + C2, AdT(pi/2) = C0 + C1, AdT(pi) = C0 - C2
+            AdT = self.__linkAdjoints(np.array([[0] * self.__n, [np.pi / 2] * self.__n, [np.pi] * self.__n]))
+            C0 = (AdT[0] + AdT[2]) / 2
+            self.__AdT_coefficients = np.array([C0, AdT[1] - C0, (AdT[0] - AdT[2]) / 2])
+
+    @property
+    def joint_count(self):
+        return self.__n
+
+    @property
+    def Alist(self):
+        '''
+        n x 6 array of the screw axes expressed in the link frames
+        '''
+        return self.__Alist
+
+    @property
+    def Glist(self):
+        return self.__Glist
+
+    def GetLinkAdjoints(self, thetas):
+        '''
+        Return value:
+        AdT (T x n x 6 x 6 array): [Ad_T_{i,i-1}] of every link for T joint vectors
+        '''
+        thetas = np.asarray(thetas, dtype=float).reshape(-1, self.__n)
+        if self.__AdT_coefficients is None:
+            return self.__linkAdjoints(thetas)
+        C0, C1, C2 = self.__AdT_coefficients
+        return C0 + np.sin(thetas)[..., np.newaxis, np.newaxis] * C1 + np.cos(thetas)[..., np.newaxis, np.newaxis] * C2
+
+    def InverseDynamics(self, thetas, thetadots, thetadotdots, g=[0, 0, -9.81], Ftip=None, AdT=None):
+        '''
+        Batched recursive Newton-Euler inverse dynamics.
+
+        Input parameters:
+        thetas, thetadots, thetadotdots (T x n arrays): Joint positions, velocities and accelerations
+        g (3 list): Gravity vector in the base frame
+        Ftip (6 list or T x 6 array): Wrench applied by the end-effector, in the end-effector frame
+        AdT (T x n x 6 x 6 array): Link adjoints of thetas from GetLinkAdjoints, computed if not given
+
+        Return value:
+        taus (T x n array): Joint torques
+        '''
+        thetas = np.asarray(thetas, dtype=float).reshape(-1, self.__n)
+        count = len(thetas)
+        thetadots = np.broadcast_to(np.asarray(thetadots, dtype=float), (count, self.__n))
+        thetadotdots = np.broadcast_to(np.asarray(thetadotdots, dtype=float), (count, self.__n))
+        if AdT is None:
+            AdT = self.GetLinkAdjoints(thetas)
+
+        V = np.zeros((count, 6))
+        Vdot = np.zeros((count, 6))
+        Vdot[:, 3:] = -np.asarray(g, dtype=float)
+        Vlist = np.empty((count, self.__n, 6))
+        Vdotlist = np.empty((count, self.__n, 6))
+        for i in range(self.__n):
+            A = self.__Alist[i]
+            V = np.einsum('tij,tj->ti', AdT[:, i], V) + thetadots[:, i, np.newaxis] * A
+            Vdot = np.einsum('tij,tj->ti', AdT[:, i], Vdot) + thetadotdots[:, i, np.newaxis] * A \
+                + V.dot(self.__adA_T[i]) * thetadots[:, i, np.newaxis]
+            Vlist[:, i] = V
+            Vdotlist[:, i] = Vdot
+
+        F = np.zeros((count, 6)) if Ftip is None \
+            else np.broadcast_to(np.asarray(Ftip, dtype=float), (count, 6)).dot(self.__AdM_tip_inv)
+        taus = np.empty((count, self.__n))
+        for i in range(self.__n - 1, -1, -1):
+            if i < self.__n - 1:
+                F = np.einsum('tji,tj->ti', AdT[:, i + 1], F)
+            GV = Vlist[:, i].dot(self.__Glist[i].T)
+            F = F + Vdotlist[:, i].dot(self.__Glist[i].T) - TruthBracketArray(Vlist[:, i], GV)
+            taus[:, i] = F.dot(self.__Alist[i])
+        return taus
+
+    def __linkAdjoints(self, thetas):
+        AdT = np.empty((len(thetas), self.__n, 6, 6))
+        for i in range(self.__n):
+            AdT[:, i] = np.matmul(AdjointArray(MatrixExp6Array(-self.__Alist[i], thetas[:, i])), self.__AdM_inv[i])
+        return AdT
+
+    def MassMatrix(self, thetas, AdT=None):
+        '''
+        Batched composite rigid body algorithm, one pass over the links instead of n inverse dynamics calls.
+
+        Input parameters:
+        thetas (T x n array): Joint positions
+        AdT (T x n x 6 x 6 array): Link adjoints of thetas from GetLinkAdjoints, computed if not given
+
+        Return value:
+        M (T x n x n array): Joint space mass matrices
+        '''
+        thetas = np.asarray(thetas, dtype=float).reshape(-1, self.__n)
+        count = len(thetas)
+        if AdT is None:
+            AdT = self.GetLinkAdjoints(thetas)
+
+        M = np.empty((count, self.__n, self.__n))
+        Ic = np.broadcast_to(self.__Glist[self.__n - 1], (count, 6, 6))
+        for i in range(self.__n - 1, -1, -1):
+            if i < self.__n - 1:
+                # composite inertia of links i..n in frame {i}
+                Ic = self.__Glist[i] + np.matmul(np.matmul(AdT[:, i + 1].transpose(0, 2, 1), Ic), AdT[:, i + 1])
+            F = Ic.dot(self.__Alist[i])
+            M[:, i, i] = F.dot(self.__Alist[i])
+            for j in range(i - 1, -1, -1):
+                F = np.einsum('tji,tj->ti', AdT[:, j + 1], F)
+                M[:, i, j] = M[:, j, i] = F.dot(self.__Alist[j])
+        return M
+
+    def ForwardDynamics(self, thetas, thetadots, taus, g=[0, 0, -9.81], Ftip=None):
+        '''
+        Batched forward dynamics M(theta) thetadotdot = tau - h(theta, thetadot), with the mass matrix of
+        MassMatrix and the bias forces h of one InverseDynamics pass sharing the link adjoints.
+
+        Input parameters:
+        thetas, thetadots, taus (T x n arrays): Joint positions, velocities and torques
+        g (3 list): Gravity vector in the base frame
+        Ftip (6 list or T x 6 array): Wrench applied by the end-effector, in the end-effector frame
+
+        Return value:
+        thetadotdots (T x n array): Joint accelerations
+        '''
+        thetas = np.asarray(thetas, dtype=float).reshape(-1, self.__n)
+        AdT = self.GetLinkAdjoints(thetas)
+        h = self.InverseDynamics(thetas, thetadots, np.zeros(self.__n), g, Ftip, AdT=AdT)
+        taus = np.broadcast_to(np.asarray(taus, dtype=float), h.shape)
+        return np.linalg.solve(self.MassMatrix(thetas, AdT=AdT), (taus - h)[..., np.newaxis])[..., 0]
+
+
+# UR5 link frames, spatial inertias and screw axes of the manipulation.InverseDynamics example
+UR5_M_RELS = [np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, .089159], [0, 0, 0, 1]]),
+              np.array([[0, 0, 1, .28], [0, 1, 0, .13585], [-1, 0, 0, 0], [0, 0, 0, 1]]),
+              np.array([[1, 0, 0, 0], [0, 1, 0, -.1197], [0, 0, 1, .395], [0, 0, 0, 1]]),
+              np.array([[0, 0, 1, 0], [0, 1, 0, 0], [-1, 0, 0, .14225], [0, 0, 0, 1]]),
+              np.array([[1, 0, 0, 0], [0, 1, 0, .093], [0, 0, 1, 0], [0, 0, 0, 1]]),
+              np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, .09465], [0, 0, 0, 1]])]
+UR5_GLIST = [np.diag([.010267, .010267, .00666, 3.7, 3.7, 3.7]),
+             np.diag([.22689, .22689, .0151074, 8.393, 8.393, 8.393]),
+             np.diag([.0494433, .0494433, .004095, 2.275, 2.275, 2.275]),
+             np.diag([.111172, .111172, .21942, 1.219, 1.219, 1.219]),
+             np.diag([.111172, .111172, .21942, 1.219, 1.219, 1.219]),
+             np.diag([.0171364, .0171364, .033822, .1879, .1879, .1879])]
+UR5_SLIST = [[0, 0, 1, 0, 0, 0],
+             [0, 1, 0, -.089, 0, 0],
+             [0, 1, 0, -.089, 0, .425],
+             [0, 1, 0, -.089, 0, .817],
+             [0, 0, -1, -.109, .817, 0],
+             [0, 1, 0, .006, 0, .817]]
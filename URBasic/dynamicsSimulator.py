@@ -0,0 +1,229 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import math
+import numpy as np
+
+
+class DynamicsSimulatorMethod:
+    RK4 = "rk4"
+    SEMI_IMPLICIT = "semi_implicit"
+
+
+def MoveJTrajectory(thetas_start, thetas_end, a=1.4, v=1.05, delt=0.008):
+    '''
+    Sample the trapezoid speed profile of a movej (linear in joint space, a and v apply to the leading axis).
+
+    Input parameters:
+    thetas_start, thetas_end (n list): Start and target joint positions [rad]
+    a (float): Joint acceleration of the leading axis [rad/s^2]
+    v (float): Joint speed of the leading axis [rad/s]
+    delt (float): Sample period [s]
+
+    Return value:
+    thetas, thetadots, thetadotdots (N x n arrays): Joint positions, velocities and accelerations,
+                                                   sampled at t = k * delt up to the end of the move
+
+    Example:
+    thetas, thetadots, thetadotdots = URBasic.dynamicsSimulator.MoveJTrajectory([0] * 6, [1, -1, 1, 0, 0, 0])
+    '''
+    thetas_start = np.asarray(thetas_start, dtype=float)
+    delta = np.asarray(thetas_end, dtype=float) - thetas_start
+    distance = np.max(np.abs(delta))
+    if distance == 0:
+        return thetas_start[np.newaxis], np.zeros((1, len(delta))), np.zeros((1, len(delta)))
+
+    v = min(v, math.sqrt(distance * a))
+    acceleration_time = v / a
+    duration = distance / v + acceleration_time
+    t = np.minimum(np.arange(int(math.ceil(duration / delt)) + 1) * delt, duration)
+    deceleration_start_time = duration - acceleration_time
+    s = np.where(t < acceleration_time, a * t ** 2 / 2,
+                 np.where(t < deceleration_start_time, v * (t - acceleration_time / 2),
+                          distance - a * (duration - t) ** 2 / 2))
+    sdot = np.where(t < acceleration_time, a * t, np.where(t < deceleration_start_time, v, a * (duration - t)))
+    sddot = np.where(t < acceleration_time, a, np.where(t < deceleration_start_time, 0., -a))
+    sddot[t == duration] = 0
+    direction = delta / distance
+    return thetas_start + np.outer(s, direction), np.outer(sdot, direction), np.outer(sddot, direction)
+
+
+class DynamicsSimulator(object):
+    '''
+    Offline forward dynamics simulation of a URBasic.dynamics.DynamicsModel.
+
+    The controller is evaluated once per control period delt and its torques are held in between,
+    as on the robot controller. Within a period the state is integrated with RK4 or semi-implicit
+    Euler, either in a fixed number of substeps or with an adaptive RK4 step (step doubling error
+    estimate). Every state may hold S independent simulations (S x n arrays), which cost about the
+    same as one because the dynamics are evaluated batched.
+
+    Input parameters:
+    dynamicsModel (DynamicsModel): Model with the precomputed link constants
+    g (3 list): Gravity vector in the base frame
+    Ftip (6 list): Wrench applied by the end-effector, in the end-effector frame
+
+    Example:
+    simulator = URBasic.dynamicsSimulator.DynamicsSimulator(URBasic.dynamics.DynamicsModel(M_rels, Glist, Slist))
+    times, thetas, thetadots, taus = simulator.SimulateMoveJ([q_start, q_target], a=1.4, v=1.05)
+    '''
+
+    def __init__(self, dynamicsModel, g=[0, 0, -9.81], Ftip=None):
+        self.__dynamicsModel = dynamicsModel
+        self.__g = np.asarray(g, dtype=float)
+        self.__Ftip = None if Ftip is None else np.asarray(Ftip, dtype=float)
+        self.__statistics = {}
+        self.ResetStatistics()
+
+    @property
+    def dynamicsModel(self):
+        return self.__dynamicsModel
+
+    def GetStatistics(self):
+        '''
+        Return value:
+        statistics (dict): evaluations (forward dynamics calls), steps and rejected_steps since the last reset
+        '''
+        return dict(self.__statistics)
+
+    def ResetStatistics(self):
+        self.__statistics = {"evaluations": 0, "steps": 0, "rejected_steps": 0}
+
+    def Acceleration(self, thetas, thetadots, taus):
+        self.__statistics["evaluations"] += 1
+        return self.__dynamicsModel.ForwardDynamics(thetas, thetadots, taus, self.__g, self.__Ftip)
+
+    def SemiImplicitEulerStep(self, thetas, thetadots, taus, dt):
+        '''
+        Symplectic Euler step, the velocity is updated first and the position uses the new velocity.
+        '''
+        thetadots_next = thetadots + dt * self.Acceleration(thetas, thetadots, taus)
+        return thetas + dt * thetadots_next, thetadots_next
+
+    def RK4Step(self, thetas, thetadots, taus, dt, thetadotdots=None):
+        '''
+        Classic fourth order Runge-Kutta step of the state (thetas, thetadots) under constant taus.
+        thetadotdots at the start of the step can be passed in when it is already known.
+        '''
+        k1_thetadots = thetadots
+        k1_thetadotdots = self.Acceleration(thetas, thetadots, taus) if thetadotdots is None else thetadotdots
+        k2_thetadots = thetadots + dt / 2 * k1_thetadotdots
+        k2_thetadotdots = self.Acceleration(thetas + dt / 2 * k1_thetadots, k2_thetadots, taus)
+        k3_thetadots = thetadots + dt / 2 * k2_thetadotdots
+        k3_thetadotdots = self.Acceleration(thetas + dt / 2 * k2_thetadots, k3_thetadots, taus)
+        k4_thetadots = thetadots + dt * k3_thetadotdots
+        k4_thetadotdots = self.Acceleration(thetas + dt * k3_thetadots, k4_thetadots, taus)
+        return (thetas + dt / 6 * (k1_thetadots + 2 * k2_thetadots + 2 * k3_thetadots + k4_thetadots),
+                thetadots + dt / 6 * (k1_thetadotdots + 2 * k2_thetadotdots + 2 * k3_thetadotdots + k4_thetadotdots))
+
+    def Simulate(self, thetas_init, thetadots_init, controller, steps, delt=0.008,
+                 method=DynamicsSimulatorMethod.RK4, substeps=1, tolerance=None, min_dt=1e-6):
+        '''
+        Input parameters:
+        thetas_init, thetadots_init (n or S x n arrays): Initial joint positions and velocities
+        controller (function): controller(k, thetas, thetadots) returns the S x n torques of control period k
+        steps (int): Number of control periods
+        delt (float): Control period [s]
+        method (str): DynamicsSimulatorMethod.RK4 or DynamicsSimulatorMethod.SEMI_IMPLICIT
+        substeps (int): Fixed integration steps per control period
+        tolerance (float): Local error per step, selects the adaptive RK4 step instead of substeps
+        min_dt (float): Smallest adaptive step, accepted regardless of its error
+
+        Return value:
+        times (steps + 1 array)
+        thetas, thetadots ((steps + 1) x n or (steps + 1) x S x n arrays)
+        taus (steps x n or steps x S x n array): Torques applied in each control period
+        '''
+        is_single = np.ndim(thetas_init) == 1
+        thetas = np.array(thetas_init, dtype=float).reshape(-1, self.__dynamicsModel.joint_count)
+        thetadots = np.broadcast_to(np.asarray(thetadots_init, dtype=float), thetas.shape).copy()
+        thetas_traj = np.empty((steps + 1,) + thetas.shape)
+        thetadots_traj = np.empty((steps + 1,) + thetas.shape)
+        taus_traj = np.empty((steps,) + thetas.shape)
+        thetas_traj[0] = thetas
+        thetadots_traj[0] = thetadots
+        dt = delt
+
+        for k in range(steps):
+            taus = np.broadcast_to(np.asarray(controller(k, thetas, thetadots), dtype=float), thetas.shape)
+            taus_traj[k] = taus
+            if tolerance is None:
+                for _ in range(substeps):
+                    if method == DynamicsSimulatorMethod.SEMI_IMPLICIT:
+                        thetas, thetadots = self.SemiImplicitEulerStep(thetas, thetadots, taus, delt / substeps)
+                    else:
+                        thetas, thetadots = self.RK4Step(thetas, thetadots, taus, delt / substeps)
+                    self.__statistics["steps"] += 1
+            else:
+                thetas, thetadots, dt = self.__adaptiveRK4(thetas, thetadots, taus, delt, dt, tolerance, min_dt)
+            thetas_traj[k + 1] = thetas
+            thetadots_traj[k + 1] = thetadots
+
+        times = np.arange(steps + 1) * delt
+        if is_single:
+            return times, thetas_traj[:, 0], thetadots_traj[:, 0], taus_traj[:, 0]
+        return times, thetas_traj, thetadots_traj, taus_traj
+
+    def SimulateMoveJ(self, waypoints, a=1.4, v=1.05, delt=0.008, Kp=100., Kd=20., settle_time=0.,
+                      method=DynamicsSimulatorMethod.RK4, substeps=1, tolerance=None):
+        '''
+        Simulate a program of movej commands through the waypoints, starting at rest on the first waypoint.
+
+        The reference of every move is the sampled trapezoid profile of MoveJTrajectory. The controller is
+        a computed torque controller, tau = ID(q_d, qd_d, qdd_d) + M(q_d) (Kp e + Kd e_dot), whose inverse
+        dynamics and mass matrices are evaluated for the whole reference in one batched call before the
+        simulation starts.
+
+        Input parameters:
+        waypoints (list of n lists): Joint positions, the first one is the start position
+        a, v (float): movej acceleration and speed of the leading axis
+        delt (float): Control period [s], 0.008 for CB-series and 0.002 for e-Series controllers
+        Kp, Kd (float or n list): Position and velocity gains [1/s^2, 1/s]
+        settle_time (float): Time simulated after the last move [s]
+
+        Return value:
+        times, thetas, thetadots, taus as Simulate, and thetas_d (reference positions, (steps + 1) x n)
+        '''
+        waypoints = np.asarray(waypoints, dtype=float)
+        reference = [MoveJTrajectory(waypoints[0], waypoints[0], a, v, delt)]
+        for thetas_start, thetas_end in zip(waypoints[:-1], waypoints[1:]):
+            reference.append([array[1:] for array in MoveJTrajectory(thetas_start, thetas_end, a, v, delt)])
+        settle_steps = int(round(settle_time / delt))
+        reference.append([np.repeat(waypoints[-1:], settle_steps, axis=0), np.zeros((settle_steps, len(waypoints[-1]))),
+                          np.zeros((settle_steps, len(waypoints[-1])))])
+        thetas_d, thetadots_d, thetadotdots_d = [np.concatenate(arrays) for arrays in zip(*reference)]
+
+        AdT = self.__dynamicsModel.GetLinkAdjoints(thetas_d)
+        taus_ff = self.__dynamicsModel.InverseDynamics(thetas_d, thetadots_d, thetadotdots_d, self.__g, self.__Ftip,
+                                                       AdT=AdT)
+        M_d = self.__dynamicsModel.MassMatrix(thetas_d, AdT=AdT)
+        Kp = np.asarray(Kp, dtype=float)
+        Kd = np.asarray(Kd, dtype=float)
+
+        def controller(k, thetas, thetadots):
+            thetadotdots = Kp * (thetas_d[k] - thetas[0]) + Kd * (thetadots_d[k] - thetadots[0])
+            return taus_ff[k] + M_d[k].dot(thetadotdots)
+
+        times, thetas, thetadots, taus = self.Simulate(thetas_d[0], thetadots_d[0], controller, len(thetas_d) - 1,
+                                                       delt, method, substeps, tolerance)
+        return times, thetas, thetadots, taus, thetas_d
+
+    def __adaptiveRK4(self, thetas, thetadots, taus, delt, dt, tolerance, min_dt):
+        remaining = delt
+        while remaining > 1e-12:
+            dt = min(dt, remaining)
+            thetadotdots = self.Acceleration(thetas, thetadots, taus)
+            thetas_full, thetadots_full = self.RK4Step(thetas, thetadots, taus, dt, thetadotdots)
+            thetas_half, thetadots_half = self.RK4Step(thetas, thetadots, taus, dt / 2, thetadotdots)
+            thetas_half, thetadots_half = self.RK4Step(thetas_half, thetadots_half, taus, dt / 2)
+            error = max(np.max(np.abs(thetas_half - thetas_full)), np.max(np.abs(thetadots_half - thetadots_full))) / 15
+            if error <= tolerance or dt <= min_dt:
+                # Richardson extrapolation of the two half steps
+                thetas = thetas_half + (thetas_half - thetas_full) / 15
+                thetadots = thetadots_half + (thetadots_half - thetadots_full) / 15
+                remaining -= dt
+                self.__statistics["steps"] += 1
+            else:
+                self.__statistics["rejected_steps"] += 1
+            dt = max(min_dt, dt * min(4., max(0.2, 0.9 * (tolerance / max(error, 1e-300)) ** 0.2)))
+        return thetas, thetadots, dt
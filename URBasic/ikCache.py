@@ -0,0 +1,196 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import collections
+import math
+import threading
+import numpy as np
+from URBasic.kinematic import Pose2Tran_Mat, Robot_parameter_screw_axes
+from URBasic.manipulation import FKinFixed, IKinFixed, MatrixLog6, TransInv
+
+
+class IkCache(object):
+    '''
+    Warm-start cache of the numeric inverse kinematics (IKinFixed, the solver behind Invkine_manip).
+
+    Solved pose -> joints pairs are kept in a grid index over the TCP position. A target that matches a stored
+    pose within exact_tolerance is answered without solving. Otherwise the solver is seeded with the joints of
+    the nearest stored pose in the neighbouring grid cells, so near-repeated targets (pallet grids, pick points)
+    converge in a few iterations instead of starting from the default seed. Only converged solutions are stored,
+    and the least recently used entry is evicted when max_size is reached.
+
+    The cache returns the branch (elbow up/down, wrist flip, ...) of the stored solution, so callers that need
+    different branches for the same poses use one cache per branch.
+
+    Input parameters:
+    rob (str): Robot of URBasic.robotRegistry
+    tcpOffset (6 list): TCP offset pose [x, y, z, rx, ry, rz]
+    max_size (int): Maximum number of stored solutions
+    cell_size (float): Edge length of the grid cells [m], seeds are searched in the 27 cells around the target
+    rotation_weight (float): Metres per unit Frobenius distance of the rotation matrices in the neighbour search
+    exact_tolerance (float): Position [m] and rotation distance under which a stored solution is returned
+    wthresh, vthresh (float): Convergence thresholds of IKinFixed
+
+    Example:
+    ikCache = URBasic.ikCache.IkCache(rob='ur10')
+    joints = ikCache.Solve([0.6, 0.2, 0.4, 0, 3.14, 0], init_joint_pos=[0, -1.57, 1.57, -1.57, -1.57, 0])
+    '''
+
+    def __init__(self, rob='ur10', tcpOffset=[0, 0, 0, 0, 0, 0], max_size=10000, cell_size=0.1,
+                 rotation_weight=0.1, exact_tolerance=1e-6, wthresh=0.001, vthresh=0.0001):
+        self.__M, self.__Slist = Robot_parameter_screw_axes(rob)
+        self.__T_tcp_inv = np.linalg.inv(Pose2Tran_Mat(pose=tcpOffset))
+        self.__maxSize = max_size
+        self.__cellSize = cell_size
+        self.__rotationWeight = rotation_weight
+        self.__exactTolerance = exact_tolerance
+        self.__wthresh = wthresh
+        self.__vthresh = vthresh
+        self.__lock = threading.Lock()
+        self.__entries = collections.OrderedDict()
+        self.__grid = {}
+        self.__nextKey = 0
+        self.__statistics = {}
+        self.ResetStatistics()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def GetStatistics(self):
+        '''
+        Return value:
+        statistics (dict): Lookups, exact hits, seeded and cold solves, failures, evictions, hit rates and the
+                           solver iterations saved, estimated from the mean iterations of the cold solves
+        '''
+        with self.__lock:
+            statistics = dict(self.__statistics)
+            statistics['size'] = len(self.__entries)
+        lookups = statistics['lookups']
+        cold_mean = statistics['cold_iterations'] / statistics['cold_solves'] if statistics['cold_solves'] else None
+        seeded_mean = statistics['seeded_iterations'] / statistics['seeded_solves'] \
+            if statistics['seeded_solves'] else None
+        statistics['hit_rate'] = statistics['exact_hits'] / lookups if lookups else None
+        statistics['seed_rate'] = statistics['seeded_solves'] / lookups if lookups else None
+        statistics['cold_iterations_mean'] = cold_mean
+        statistics['seeded_iterations_mean'] = seeded_mean
+        statistics['iterations_saved'] = None if cold_mean is None else \
+            statistics['exact_hits'] * cold_mean + statistics['seeded_solves'] * cold_mean \
+            - statistics['seeded_iterations']
+        return statistics
+
+    def ResetStatistics(self):
+        with self.__lock:
+            self.__statistics = {'lookups': 0, 'exact_hits': 0, 'seeded_solves': 0, 'cold_solves': 0,
+                                 'failures': 0, 'evictions': 0, 'seeded_iterations': 0, 'cold_iterations': 0}
+
+    def Clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__grid.clear()
+
+    def Insert(self, target_pos, joints):
+        '''
+        Store a known solution, e.g. a taught waypoint, without solving.
+        '''
+        T_sd = self.__getTsd(target_pos)
+        with self.__lock:
+            self.__insert(T_sd, np.array(joints, dtype=float))
+
+    def Lookup(self, target_pos):
+        '''
+        Return value:
+        joints (6 array): Stored solution of target_pos, None without an exact hit
+        '''
+        T_sd = self.__getTsd(target_pos)
+        with self.__lock:
+            key, _ = self.__nearest(T_sd)
+            if key is not None and self.__isExact(key, T_sd):
+                self.__entries.move_to_end(key)
+                return self.__entries[key][2].copy()
+        return None
+
+    def Solve(self, target_pos, init_joint_pos=[0, 0, 0, 0, 0, 0]):
+        '''
+        Input parameters:
+        target_pos (6 list): Target pose [x, y, z, rx, ry, rz]
+        init_joint_pos (6 list): Seed used when no stored solution is near the target
+
+        Return value:
+        joints (6 array): Solution, None when IKinFixed does not converge
+        '''
+        T_sd = self.__getTsd(target_pos)
+        with self.__lock:
+            self.__statistics['lookups'] += 1
+            key, _ = self.__nearest(T_sd)
+            if key is not None and self.__isExact(key, T_sd):
+                self.__statistics['exact_hits'] += 1
+                self.__entries.move_to_end(key)
+                return self.__entries[key][2].copy()
+            seed = None if key is None else self.__entries[key][2].copy()
+
+        thetalist_init = np.asarray(init_joint_pos if seed is None else seed, dtype=float)
+        iterates = IKinFixed(self.__Slist, self.__M, T_sd, thetalist_init, self.__wthresh, self.__vthresh)
+        joints = iterates[-1]
+        # wrap to the turn of the seed, as Invkine_manip does
+        joints = joints - np.round((joints - thetalist_init) / 2 / math.pi) * 2 * math.pi
+        iterations = len(iterates) - 1
+        converged = self.__isConverged(T_sd, joints)
+
+        with self.__lock:
+            if seed is None:
+                self.__statistics['cold_solves'] += 1
+                self.__statistics['cold_iterations'] += iterations
+            else:
+                self.__statistics['seeded_solves'] += 1
+                self.__statistics['seeded_iterations'] += iterations
+            if not converged:
+                self.__statistics['failures'] += 1
+                return None
+            self.__insert(T_sd, joints)
+        return joints.copy()
+
+    def __getTsd(self, target_pos):
+        return np.matmul(Pose2Tran_Mat(pose=target_pos), self.__T_tcp_inv)
+
+    def __getCell(self, position):
+        return tuple(np.floor(position / self.__cellSize).astype(int))
+
+    def __isConverged(self, T_sd, joints):
+        Vb = MatrixLog6(np.dot(TransInv(FKinFixed(self.__M, self.__Slist, joints)), T_sd))
+        return np.linalg.norm(Vb[:3]) <= self.__wthresh and np.linalg.norm(Vb[3:]) <= self.__vthresh
+
+    def __isExact(self, key, T_sd):
+        T_stored = self.__entries[key][0]
+        return np.linalg.norm(T_stored[:3, 3] - T_sd[:3, 3]) <= self.__exactTolerance \
+            and np.linalg.norm(T_stored[:3, :3] - T_sd[:3, :3]) <= self.__exactTolerance
+
+    def __nearest(self, T_sd):
+        cell = self.__getCell(T_sd[:3, 3])
+        key_array = []
+        for offset in np.ndindex(3, 3, 3):
+            key_array.extend(self.__grid.get(tuple(c + o - 1 for c, o in zip(cell, offset)), ()))
+        if not key_array:
+            return None, None
+        T_array = np.array([self.__entries[key][0] for key in key_array])
+        distance_array = np.linalg.norm(T_array[:, :3, 3] - T_sd[:3, 3], axis=1) + self.__rotationWeight * \
+            np.linalg.norm(T_array[:, :3, :3] - T_sd[:3, :3], axis=(1, 2))
+        index = int(np.argmin(distance_array))
+        return key_array[index], distance_array[index]
+
+    def __insert(self, T_sd, joints):
+        key, _ = self.__nearest(T_sd)
+        if key is not None and self.__isExact(key, T_sd):
+            self.__entries[key] = (self.__entries[key][0], self.__entries[key][1], joints)
+            self.__entries.move_to_end(key)
+            return
+        while len(self.__entries) >= self.__maxSize:
+            evicted_key, (_, evicted_cell, _) = self.__entries.popitem(last=False)
+            self.__grid[evicted_cell].discard(evicted_key)
+            if not self.__grid[evicted_cell]:
+                del self.__grid[evicted_cell]
+            self.__statistics['evictions'] += 1
+        key = self.__nextKey
+        self.__nextKey += 1
+        cell = self.__getCell(T_sd[:3, 3])
+        self.__entries[key] = (T_sd, cell, joints)
+        self.__grid.setdefault(cell, set()).add(key)
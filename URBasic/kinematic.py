@@ -27,17 +27,14 @@ __license__ = "MIT License"
 
 import logging
 
-import ikpy as ik
 import numpy as np
-import sympy as sp
 import math
-import scipy
-from scipy import linalg
 from URBasic.manipulation import *
+from URBasic.kinematicGenerator import GetKinematicFunctions
+from URBasic.robotRegistry import GetRobot, IsRobotRegistered
 
+# sympy, scipy and ikpy are imported by the functions using them, so importing this module stays cheap
 pi = np.pi
-# Disable the logging stream from ikpy
-ik.logs.manager.removeHandler(ik.logs.stream_handler)
 
 
 def Forwardkin_manip(joints, rob='ur10'):
@@ -151,28 +148,12 @@ def Robot_parameter_screw_axes(rob='ur10'):
     This function defines robot with fixed screw axes(used in manipulation.py)
     rob='ur5'  : ur5
     rob='ur10' : ur10
+    (or any robot of URBasic.robotRegistry)
     https://www.universal-robots.com/how-tos-and-faqs/faq/ur-faq/actual-center-of-mass-for-robot-17264/ 
     '''
-    if str(rob).lower() == 'ur5':
-        M_ur5 = [[1, 0, 0, -.81725], [0, 0, -1, -.19145], [0, 1, 0, -.0055], [0, 0, 0, 1]]
-        S1_ur5 = [0, 0, 1, 0, 0, 0]
-        S2_ur5 = [0, -1, 0, .089159, 0, 0]
-        S3_ur5 = [0, -1, 0, .089159, 0, .425]
-        S4_ur5 = [0, -1, 0, .089159, 0, .81725]
-        S5_ur5 = [0, 0, -1, .10915, -.81725, 0]
-        S6_ur5 = [0, -1, 0, -.0055, 0, .81725]
-        Slist_ur5 = [S1_ur5, S2_ur5, S3_ur5, S4_ur5, S5_ur5, S6_ur5]
-        return M_ur5, Slist_ur5
-    elif str(rob).lower() == 'ur10':
-        M_ur10 = [[1, 0, 0, -1.1843], [0, 0, -1, -0.2561], [0, 1, 0, 0.0116], [0, 0, 0, 1]]
-        S1_ur10 = [0, 0, 1, 0, 0, 0]
-        S2_ur10 = [0, -1, 0, .1273, 0, 0]
-        S3_ur10 = [0, -1, 0, .1273, 0, .612]
-        S4_ur10 = [0, -1, 0, .1273, 0, 1.1843]
-        S5_ur10 = [0, 0, -1, .16394, -1.1843, 0]
-        S6_ur10 = [0, -1, 0, 0.01165, 0, 1.1843]
-        Slist_ur10 = [S1_ur10, S2_ur10, S3_ur10, S4_ur10, S5_ur10, S6_ur10]
-        return M_ur10, Slist_ur10
+    if IsRobotRegistered(rob):
+        robot = GetRobot(rob)
+        return robot.M, robot.Slist
     else:
         print('Wrong robot selected')
         return False
@@ -185,25 +166,8 @@ def Robot_DH_Numerical(rob='ur10', joint=[0, 0, 0, 0, 0, 0]):
     rob='ur10' : ur10 
     joint: the robot joint vectors
     '''
-    j = joint
-    if str(rob).lower() == 'ur5':
-        dh_ur = np.matrix([
-            [0, pi / 2, 0.089159, j[0]],
-            [-0.425, 0, 0, j[1]],
-            [-0.39225, 0, 0, j[2]],
-            [0, pi / 2, 0.10915, j[3]],
-            [0, -pi / 2, 0.09465, j[4]],
-            [0, 0, 0.0823, j[5]]])
-        return dh_ur
-    elif str(rob).lower() == 'ur10':
-        dh_ur = np.matrix([
-            [0, pi / 2, 0.1273, j[0]],
-            [-0.612, 0, 0, j[1]],
-            [-0.5723, 0, 0, j[2]],
-            [0, pi / 2, 0.163941, j[3]],
-            [0, -pi / 2, 0.1157, j[4]],
-            [0, 0, 0.0922, j[5]]])
-        return dh_ur
+    if IsRobotRegistered(rob):
+        return np.matrix(np.column_stack((GetRobot(rob).dh, joint)))
     else:
         print('Wrong robot selected')
         return
@@ -215,26 +179,11 @@ def Robot_DH_Symbol(rob='ur10'):
     rob='ur5'  : ur5
     rob='ur10' : ur10 
     '''
+    import sympy as sp
     # set up our joint angle symbols (6th angle doesn't affect any kinematics)
     q = [sp.Symbol('q%i' % ii) for ii in range(6)]
-    if str(rob).lower() == 'ur5':
-        dh_ur = np.matrix([
-            [0, pi / 2, 0.089159, q[0]],
-            [-0.425, 0, 0, q[1]],
-            [-0.39225, 0, 0, q[2]],
-            [0, pi / 2, 0.10915, q[3]],
-            [0, -pi / 2, 0.09465, q[4]],
-            [0, 0, 0.0823, q[5]]])
-        return dh_ur
-    elif str(rob).lower() == 'ur10':
-        dh_ur = np.matrix([
-            [0, pi / 2, 0.1273, q[0]],
-            [-0.612, 0, 0, q[1]],
-            [-0.5723, 0, 0, q[2]],
-            [0, pi / 2, 0.163941, q[3]],
-            [0, -pi / 2, 0.1157, q[4]],
-            [0, 0, 0.0922, q[5]]])
-        return dh_ur
+    if IsRobotRegistered(rob):
+        return np.matrix([list(dh) + [q[ii]] for ii, dh in enumerate(GetRobot(rob).dh)], dtype=object)
     else:
         print('Wrong robot selected')
         return
@@ -247,6 +196,7 @@ def TransMatrix_DH_Symbol(rob='ur10', joint_num=6):
     rob='ur10' : ur10 
     joint_num: the transform matrix for joint_num (from 1 to 6) 
     '''
+    import sympy as sp
     T = []
     # set up our joint angle symbols (6th angle doesn't affect any kinematics)
     q = [sp.Symbol('q%i' % ii) for ii in range(joint_num)]
@@ -311,6 +261,7 @@ def Jacobian_Symbol(rob='ur10', joint_num=6):
     This function returns a 6*6 symbolic jacobian matrix 
     Tx: transfermation matrix
     '''
+    import sympy as sp
     # set up our joint angle symbols (6th angle doesn't affect any kinematics) 
     q = [sp.Symbol('q%i' % ii) for ii in range(joint_num)]
 
@@ -407,6 +358,16 @@ def Jacobian_Numerical(rob='ur10', joint=[0, 0, 0, 0, 0, 0]):
     return J
 
 
+def Jacobian_GeneratedArray(rob='ur10', joint_array=[[0, 0, 0, 0, 0, 0]]):
+    '''
+    Vectorized Jacobian from the functions generated by URBasic.kinematicGenerator for the DH table of rob.
+    joint_array: N x 6 array of joint vectors
+    Returns the N x 6 x 6 geometric Jacobian in the base frame (rows [vx, vy, vz, wx, wy, wz], one column
+    per joint). The linear part is the transpose of the first three columns of Jacobian_Numerical.
+    '''
+    return GetKinematicFunctions(rob).Jacobian(joint_array)
+
+
 def RotatMatr2AxisAng(Matrix):
     '''
     Convert the rotation matrix to axis angle
@@ -487,6 +448,7 @@ def cmpleate_rotation_matrix(start_vector):
     ''' This function make rotation matrix where the first column is the 
         input vector.
     '''
+    from scipy import linalg
 
     a = np.matrix(start_vector)
     a = a / np.linalg.norm(a)
@@ -504,8 +466,8 @@ def Inverse_kin(target_pos, init_joint_pos=[0, 0, 0, 0, 0, 0], tcpOffset=[0, 0,
     target_pos = the target pos vector
     init_joint_pos (optional) = the initial joint vector
     '''
-    # Define a robot from URDF file
-    my_chain = ik.chain.Chain.from_urdf_file('URDF/UR5.URDF')
+    # Robot defined by the URDF file, parsed once by URBasic.robotRegistry
+    my_chain = GetRobot('ur5').GetChain()
     # Convert pos to transfer matrix
     # Mar = Pose2Tran_Mat(target_pos)
 
@@ -538,8 +500,8 @@ def Forward_kin(joint):
     '''
     Find the forward kinematics 
     '''
-    # Define a robot from URDF file
-    my_chain = ik.chain.Chain.from_urdf_file('URDF/UR5.URDF')
+    # Robot defined by the URDF file, parsed once by URBasic.robotRegistry
+    my_chain = GetRobot('ur5').GetChain()
     # add a [0] in joint anlges, due to the defination of URDF
     joint_new = np.zeros([7])
     joint_new[1:] = joint[:]
@@ -568,3 +530,286 @@ def Vektor_from_Base_to_TCP(vectorBase, axisangle):
     vectorTCP = np.cos(angle) * vectorBase + np.sin(angle) * np.cross(eRot, vectorBase) + (1 - np.cos(angle)) * np.dot(
         eRot, vectorBase) * eRot
     return vectorTCP
+
+
+def TransMatrix_DH_LinkArray(a, alpha, d, theta):
+    '''
+    Transformation matrices of one DH link for an array of joint angles theta (any shape S).
+    Returns an S x 4 x 4 array.
+    '''
+    theta = np.asarray(theta, dtype=float)
+    ct = np.cos(theta)
+    st = np.sin(theta)
+    ca = np.cos(alpha)
+    sa = np.sin(alpha)
+    T_link = np.zeros(theta.shape + (4, 4))
+    T_link[..., 0, 0] = ct
+    T_link[..., 0, 1] = -st * ca
+    T_link[..., 0, 2] = st * sa
+    T_link[..., 0, 3] = ct * a
+    T_link[..., 1, 0] = st
+    T_link[..., 1, 1] = ct * ca
+    T_link[..., 1, 2] = -ct * sa
+    T_link[..., 1, 3] = st * a
+    T_link[..., 2, 1] = sa
+    T_link[..., 2, 2] = ca
+    T_link[..., 2, 3] = d
+    T_link[..., 3, 3] = 1
+    return T_link
+
+
+def TransInvArray(T):
+    '''
+    Vectorized TransInv for an S x 4 x 4 array of transformation matrices.
+    '''
+    T = np.asarray(T, dtype=float)
+    R_inv = np.swapaxes(T[..., :3, :3], -1, -2)
+    T_inv = np.zeros(T.shape)
+    T_inv[..., :3, :3] = R_inv
+    T_inv[..., :3, 3] = -np.einsum('...ij,...j->...i', R_inv, T[..., :3, 3])
+    T_inv[..., 3, 3] = 1
+    return T_inv
+
+
+def TransMatrix_DH_NumericalArray(rob='ur10', joint_array=[[0, 0, 0, 0, 0, 0]]):
+    '''
+    Vectorized TransMatrix_DH_Numerical.
+    rob: a robot of URBasic.robotRegistry ('ur5', 'ur10', ...)
+    joint_array: N x 6 array of joint vectors (one configuration per row)
+    Returns the N x 4 x 4 array of base to flange transformation matrices (not rounded).
+    Each DH link is evaluated for all N configurations at once, so the cost is 6 stacked matrix products.
+    '''
+    robot = GetRobot(rob)
+    joint_array = np.asarray(joint_array, dtype=float).reshape(-1, 6)
+    T = None
+    for ii in range(6):
+        T_link = TransMatrix_DH_LinkArray(robot.a[ii], robot.alpha[ii], robot.d[ii], joint_array[:, ii])
+        T = T_link if T is None else np.matmul(T, T_link)
+    return T
+
+
+def TransMatrix_DH_FramesArray(rob='ur10', joint_array=[[0, 0, 0, 0, 0, 0]]):
+    '''
+    Vectorized frames of every DH link.
+    rob: a robot of URBasic.robotRegistry ('ur5', 'ur10', ...)
+    joint_array: N x 6 array of joint vectors
+    Returns the N x 7 x 4 x 4 array of base to frame i transformation matrices, frame 0 is the base and
+    frame 6 the flange. Joint i + 1 turns about the z axis of frame i.
+    '''
+    robot = GetRobot(rob)
+    joint_array = np.asarray(joint_array, dtype=float).reshape(-1, 6)
+    T = np.zeros((len(joint_array), 7, 4, 4))
+    T[:, 0] = np.identity(4)
+    for ii in range(6):
+        T[:, ii + 1] = np.matmul(T[:, ii], TransMatrix_DH_LinkArray(robot.a[ii], robot.alpha[ii], robot.d[ii],
+                                                                    joint_array[:, ii]))
+    return T
+
+
+def Forward_kinArray(joint_array, rob='ur10'):
+    '''
+    Vectorized forward kinematics from the DH table of the robot.
+    joint_array: N x 6 array of joint vectors
+    Returns the N x 6 array of poses [x, y, z, rx, ry, rz] (axis angle).
+    '''
+    return Tran_Mat2PoseArray(TransMatrix_DH_NumericalArray(rob=rob, joint_array=joint_array))
+
+
+def Forwardkin_manipArray(joint_array, rob='ur10'):
+    '''
+    Vectorized Forwardkin_manip, using the fixed screw axes of Robot_parameter_screw_axes.
+    joint_array: N x 6 array of joint vectors
+    Returns the N x 6 array of poses (not rounded).
+    '''
+    M, Slist = Robot_parameter_screw_axes(rob)
+    return Tran_Mat2PoseArray(FKinFixedArray(M, Slist, joint_array))
+
+
+def AxisAng2RotaMatriArray(angle_vec_array):
+    '''
+    Vectorized AxisAng2RotaMatri.
+    angle_vec_array: N x 3 array of axis angles
+    Returns the N x 3 x 3 array of rotation matrices (Rodrigues' formula, identity for a zero angle).
+    '''
+    angle_vec_array = np.asarray(angle_vec_array, dtype=float).reshape(-1, 3)
+    theta = np.linalg.norm(angle_vec_array, axis=1)
+    e = np.divide(angle_vec_array, theta[:, np.newaxis],
+                  out=np.zeros_like(angle_vec_array), where=theta[:, np.newaxis] > 0)
+    cs = np.cos(theta)[:, np.newaxis, np.newaxis]
+    si = np.sin(theta)[:, np.newaxis, np.newaxis]
+    e_so3mat = np.zeros((len(e), 3, 3))
+    e_so3mat[:, 0, 1] = -e[:, 2]
+    e_so3mat[:, 0, 2] = e[:, 1]
+    e_so3mat[:, 1, 0] = e[:, 2]
+    e_so3mat[:, 1, 2] = -e[:, 0]
+    e_so3mat[:, 2, 0] = -e[:, 1]
+    e_so3mat[:, 2, 1] = e[:, 0]
+    return cs * np.identity(3) + si * e_so3mat + (1 - cs) * np.einsum('ni,nj->nij', e, e)
+
+
+def RotatMatr2AxisAngArray(Matrix_array):
+    '''
+    Vectorized RotatMatr2AxisAng.
+    Matrix_array: N x 3 x 3 array of rotation matrices
+    Returns the N x 3 array of axis angles. Unlike RotatMatr2AxisAng, a zero rotation gives [0, 0, 0]
+    and for angles above pi/2 the axis is taken from the symmetric part of R, which stays accurate up to pi.
+    '''
+    R = np.asarray(Matrix_array, dtype=float).reshape(-1, 3, 3)
+    cs = 0.5 * (R[:, 0, 0] + R[:, 1, 1] + R[:, 2, 2] - 1)
+    theta = np.arccos(np.clip(cs, -1, 1))
+    si = np.sin(theta)
+    skew = np.stack((R[:, 2, 1] - R[:, 1, 2], R[:, 0, 2] - R[:, 2, 0], R[:, 1, 0] - R[:, 0, 1]), axis=1)
+    is_obtuse = cs < 0
+    e = np.divide(skew, 2 * si[:, np.newaxis], out=np.zeros_like(skew),
+                  where=(si[:, np.newaxis] > 0) & ~is_obtuse[:, np.newaxis])
+    if np.any(is_obtuse):
+        R_obtuse = R[is_obtuse]
+        # (R + R^T) / 2 - cos(theta) * I = (1 - cos(theta)) * e * e^T
+        B = 0.5 * (R_obtuse + np.transpose(R_obtuse, (0, 2, 1))) \
+            - cs[is_obtuse][:, np.newaxis, np.newaxis] * np.identity(3)
+        k = np.argmax(np.diagonal(B, axis1=1, axis2=2), axis=1)
+        column = B[np.arange(len(B)), :, k]
+        column /= np.linalg.norm(column, axis=1)[:, np.newaxis]
+        sign = np.where(np.einsum('ni,ni->n', column, skew[is_obtuse]) < 0, -1., 1.)
+        e[is_obtuse] = sign[:, np.newaxis] * column
+    return theta[:, np.newaxis] * e
+
+
+def Pose2Tran_MatArray(pose_array):
+    '''
+    Vectorized Pose2Tran_Mat.
+    pose_array: N x 6 array of poses
+    Returns the N x 4 x 4 array of transformation matrices.
+    '''
+    pose_array = np.asarray(pose_array, dtype=float).reshape(-1, 6)
+    tran_mat = np.zeros((len(pose_array), 4, 4))
+    tran_mat[:, :3, :3] = AxisAng2RotaMatriArray(pose_array[:, 3:])
+    tran_mat[:, :3, 3] = pose_array[:, :3]
+    tran_mat[:, 3, 3] = 1
+    return tran_mat
+
+
+def Tran_Mat2PoseArray(Tran_Mat_array):
+    '''
+    Vectorized Tran_Mat2Pose.
+    Tran_Mat_array: N x 4 x 4 array of transformation matrices
+    Returns the N x 6 array of poses.
+    '''
+    Tran_Mat_array = np.asarray(Tran_Mat_array, dtype=float).reshape(-1, 4, 4)
+    pose = np.empty((len(Tran_Mat_array), 6))
+    pose[:, :3] = Tran_Mat_array[:, :3, 3]
+    pose[:, 3:] = RotatMatr2AxisAngArray(Tran_Mat_array[:, :3, :3])
+    return pose
+
+
+def Inverse_kin_analyticArray(pose_array, rob='ur10', tcpOffset=[0, 0, 0, 0, 0, 0], tolerance=1e-9):
+    '''
+    Closed-form inverse kinematics of a UR arm from its DH table (shoulder, wrist and elbow branches).
+    pose_array: N x 6 array of target poses [x, y, z, rx, ry, rz]
+    rob: a robot of URBasic.robotRegistry ('ur5', 'ur10', ...)
+    tcpOffset: the tcp pose relative to the flange
+    tolerance: slack on the cosine domain checks, so targets on the workspace boundary are kept
+    Returns the N x 8 x 6 array of the eight solutions, with angles in [-pi, pi] and NaN rows for branches
+    that do not reach the target. At a wrist singularity (sin(q5) = 0) q6 is set to 0.
+    '''
+    robot = GetRobot(rob)
+    a, alpha, d = robot.a, robot.alpha, robot.d
+    d1, a2, a3, d4, d6 = d[0], a[1], a[2], d[3], d[5]
+
+    T = np.matmul(Pose2Tran_MatArray(pose_array), np.linalg.inv(Pose2Tran_Mat(tcpOffset)))
+    n = len(T)
+    R = T[:, :3, :3]
+    p = T[:, :3, 3]
+
+    # shoulder: the wrist center has to lie on a plane at distance d4 of the base axis
+    p05 = p - d6 * R[:, :, 2]
+    radius = np.hypot(p05[:, 0], p05[:, 1])
+    cos_phi = d4 / np.maximum(radius, 1e-12)
+    cos_phi = np.where(np.abs(cos_phi) <= 1 + tolerance, np.clip(cos_phi, -1, 1), np.nan)
+    phi = np.arccos(cos_phi)
+    psi = np.arctan2(p05[:, 1], p05[:, 0])
+    q1 = psi[:, np.newaxis] + np.stack((phi, -phi), axis=1) + pi / 2
+    s1 = np.sin(q1)
+    c1 = np.cos(q1)
+
+    # wrist: q5 from the flange position, q6 from the flange orientation
+    cos_q5 = (p[:, 0, np.newaxis] * s1 - p[:, 1, np.newaxis] * c1 - d4) / d6
+    cos_q5 = np.where(np.abs(cos_q5) <= 1 + tolerance, np.clip(cos_q5, -1, 1), np.nan)
+    q5 = np.stack((np.arccos(cos_q5), -np.arccos(cos_q5)), axis=2)
+    s5 = np.sin(q5)
+    s1 = s1[:, :, np.newaxis]
+    c1 = c1[:, :, np.newaxis]
+    x_x, x_y = R[:, 0, 0, np.newaxis, np.newaxis], R[:, 0, 1, np.newaxis, np.newaxis]
+    y_x, y_y = R[:, 1, 0, np.newaxis, np.newaxis], R[:, 1, 1, np.newaxis, np.newaxis]
+    is_singular = np.abs(s5) < 1e-10
+    s5_safe = np.where(is_singular, 1, s5)
+    q6 = np.where(is_singular, 0, np.arctan2((-x_y * s1 + y_y * c1) / s5_safe, (x_x * s1 - y_x * c1) / s5_safe))
+
+    # elbow: planar two link problem between frame 1 and frame 4
+    q1_branch = np.broadcast_to(q1[:, :, np.newaxis], q5.shape)
+    T01 = TransMatrix_DH_LinkArray(a[0], alpha[0], d[0], q1_branch)
+    T45 = TransMatrix_DH_LinkArray(a[4], alpha[4], d[4], q5)
+    T56 = TransMatrix_DH_LinkArray(a[5], alpha[5], d[5], q6)
+    T14 = np.matmul(np.matmul(TransInvArray(T01), T[:, np.newaxis, np.newaxis]),
+                    TransInvArray(np.matmul(T45, T56)))
+    p13 = T14[..., :3, 3] - d4 * T14[..., :3, 1]
+    p13_norm = np.linalg.norm(p13, axis=-1)
+    cos_q3 = (p13_norm ** 2 - a2 ** 2 - a3 ** 2) / (2 * a2 * a3)
+    cos_q3 = np.where(np.abs(cos_q3) <= 1 + tolerance, np.clip(cos_q3, -1, 1), np.nan)
+    q3 = np.stack((np.arccos(cos_q3), -np.arccos(cos_q3)), axis=-1)
+    sin_q2_offset = np.clip(a3 * np.sin(q3) / np.maximum(p13_norm, 1e-12)[..., np.newaxis], -1, 1)
+    q2 = -np.arctan2(p13[..., 1], -p13[..., 0])[..., np.newaxis] + np.arcsin(sin_q2_offset)
+
+    T12 = TransMatrix_DH_LinkArray(a[1], alpha[1], d[1], q2)
+    T23 = TransMatrix_DH_LinkArray(a[2], alpha[2], d[2], q3)
+    T34 = np.matmul(TransInvArray(np.matmul(T12, T23)), T14[..., np.newaxis, :, :])
+    q4 = np.arctan2(T34[..., 1, 0], T34[..., 0, 0])
+
+    solution_array = np.stack(np.broadcast_arrays(q1[:, :, np.newaxis, np.newaxis], q2, q3, q4,
+                                                  q5[..., np.newaxis], q6[..., np.newaxis]), axis=-1)
+    solution_array = solution_array.reshape(n, 8, 6)
+    solution_array = np.arctan2(np.sin(solution_array), np.cos(solution_array))
+    solution_array[np.any(np.isnan(solution_array), axis=2)] = np.nan
+    return solution_array
+
+
+def Inverse_kin_analytic(target_pos, rob='ur10', tcpOffset=[0, 0, 0, 0, 0, 0]):
+    '''
+    Closed-form inverse kinematics of a UR arm, see Inverse_kin_analyticArray.
+    target_pos: the target pose vector
+    Returns the 8 x 6 array of solutions, NaN rows for branches that do not reach the target.
+    '''
+    return Inverse_kin_analyticArray([target_pos], rob=rob, tcpOffset=tcpOffset)[0]
+
+
+def Inverse_kin_nearestArray(pose_array, init_joint_array, rob='ur10', tcpOffset=[0, 0, 0, 0, 0, 0],
+                             joint_limit=2 * pi):
+    '''
+    Vectorized Inverse_kin_nearest.
+    pose_array: N x 6 array of target poses
+    init_joint_array: N x 6 array of seeds, or a single seed used for every target
+    Returns the N x 6 array of the solutions closest to the seeds, NaN rows for unreachable targets.
+    '''
+    solution_array = Inverse_kin_analyticArray(pose_array, rob=rob, tcpOffset=tcpOffset)
+    init_joint_array = np.broadcast_to(np.asarray(init_joint_array, dtype=float).reshape(-1, 6),
+                                       (len(solution_array), 6))[:, np.newaxis, :]
+    # every joint can turn +-2pi, so move each solution to the turn closest to the seed
+    delta = solution_array - init_joint_array
+    candidate_array = init_joint_array + np.arctan2(np.sin(delta), np.cos(delta))
+    distance = np.linalg.norm(candidate_array - init_joint_array, axis=2)
+    distance[np.isnan(distance) | np.any(np.abs(candidate_array) > joint_limit, axis=2)] = np.inf
+    index = np.argmin(distance, axis=1)
+    nearest_array = candidate_array[np.arange(len(candidate_array)), index]
+    nearest_array[np.isinf(distance[np.arange(len(distance)), index])] = np.nan
+    return nearest_array
+
+
+def Inverse_kin_nearest(target_pos, init_joint_pos=[0, 0, 0, 0, 0, 0], rob='ur10', tcpOffset=[0, 0, 0, 0, 0, 0]):
+    '''
+    Closed-form replacement of Invkine_manip: the solution of Inverse_kin_analytic closest to init_joint_pos.
+    Returns the joint vector, or None if the target is not reachable.
+    '''
+    nearest = Inverse_kin_nearestArray([target_pos], init_joint_pos, rob=rob, tcpOffset=tcpOffset)[0]
+    if np.any(np.isnan(nearest)):
+        return None
+    return nearest
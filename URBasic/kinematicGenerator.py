@@ -0,0 +1,207 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import logging
+import math
+import os
+import time
+import numpy as np
+from URBasic.robotRegistry import GetRobot, GetRobotNames
+
+GENERATOR_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'URBasic', 'kinematic')
+
+__kinematicFunctions = {}
+
+
+class KinematicFunctions(object):
+    '''
+    NumPy forward kinematics and Jacobian of a DH robot, generated by GetKinematicFunctions.
+
+    Every function takes an N x n array of joint vectors and evaluates all N configurations at once.
+
+    Example:
+    kinematicFunctions = URBasic.kinematicGenerator.GetKinematicFunctions('ur10')
+    J = kinematicFunctions.Jacobian(joint_array)
+    '''
+
+    def __init__(self, module, key):
+        self.__module = module
+        self.__key = key
+
+    @property
+    def key(self):
+        return self.__key
+
+    @property
+    def joint_count(self):
+        return self.__module.JOINT_COUNT
+
+    def ForwardKinematics(self, joint_array):
+        '''
+        Return value:
+        T (N x 4 x 4 array): Base to flange transformation matrices
+        '''
+        joint_array = self.__jointArray(joint_array)
+        T = np.zeros((len(joint_array), 4, 4))
+        T[:, :3, :] = self.__stack(self.__module.forward_kinematics(*joint_array.T), joint_array, (3, 4))
+        T[:, 3, 3] = 1
+        return T
+
+    def Jacobian(self, joint_array):
+        '''
+        Return value:
+        J (N x 6 x n array): Geometric Jacobian in the base frame, rows [vx, vy, vz, wx, wy, wz]
+        '''
+        joint_array = self.__jointArray(joint_array)
+        return self.__stack(self.__module.jacobian(*joint_array.T), joint_array, (6, self.joint_count))
+
+    def JacobianSingle(self, joints):
+        '''
+        Jacobian of one joint vector, evaluated on floats to skip the array overhead of Jacobian for N = 1.
+
+        Return value:
+        J (6 x n array): Geometric Jacobian in the base frame, rows [vx, vy, vz, wx, wy, wz]
+        '''
+        entries = self.__module.jacobian(*[float(joint) for joint in np.ravel(joints)])
+        return np.array(entries, dtype=float).reshape(6, self.joint_count)
+
+    def __jointArray(self, joint_array):
+        return np.asarray(joint_array, dtype=float).reshape(-1, self.joint_count)
+
+    @staticmethod
+    def __stack(entries, joint_array, shape):
+        entries = np.broadcast_arrays(*entries, joint_array[:, 0])[:-1]
+        return np.stack(entries, axis=-1).reshape((len(joint_array),) + shape)
+
+
+def GetCacheKey(a, alpha, d):
+    '''
+    Return value:
+    key (str): Hash of the DH table and the generator version, used as file name of the generated module
+    '''
+    parameter = {'a': [float(value) for value in a],
+                 'alpha': [float(value) for value in alpha],
+                 'd': [float(value) for value in d],
+                 'version': GENERATOR_VERSION}
+    return hashlib.sha1(json.dumps(parameter, sort_keys=True).encode()).hexdigest()
+
+
+def GenerateKinematicSource(a, alpha, d):
+    '''
+    Derive the forward kinematics and the Jacobian of a DH table symbolically and print them as a Python module.
+    Common subexpressions are shared with sympy.cse instead of running sympy.simplify.
+
+    Return value:
+    source (str): Module with JOINT_COUNT, forward_kinematics(q0, ...) and jacobian(q0, ...)
+    '''
+    import sympy as sp
+    from sympy.printing.numpy import NumPyPrinter
+
+    joint_count = len(a)
+    q = sp.symbols('q0:%d' % joint_count)
+    T = sp.eye(4)
+    z_axes = []
+    for ii in range(joint_count):
+        z_axes.append(T[:3, 2])
+        # round cos/sin of alpha so that the zero terms of 0 and +-pi/2 drop out of the expressions
+        ca = sp.Float(round(math.cos(alpha[ii]), 12))
+        sa = sp.Float(round(math.sin(alpha[ii]), 12))
+        T = T * sp.Matrix([[sp.cos(q[ii]), -sp.sin(q[ii]) * ca, sp.sin(q[ii]) * sa, sp.cos(q[ii]) * a[ii]],
+                           [sp.sin(q[ii]), sp.cos(q[ii]) * ca, -sp.cos(q[ii]) * sa, sp.sin(q[ii]) * a[ii]],
+                           [0, sa, ca, d[ii]],
+                           [0, 0, 0, 1]])
+    forward_kinematics = [T[row, column] for row in range(3) for column in range(4)]
+    position = T[:3, 3]
+    jacobian_columns = [list(position.diff(q[ii])) + list(z_axes[ii]) for ii in range(joint_count)]
+    jacobian = [jacobian_columns[column][row] for row in range(6) for column in range(joint_count)]
+
+    printer = NumPyPrinter()
+    arguments = ', '.join(str(symbol) for symbol in q)
+    lines = ['# Generated by URBasic.kinematicGenerator, do not edit',
+             'import numpy', '',
+             'JOINT_COUNT = {joint_count}'.format(joint_count=joint_count)]
+    for name, expressions in [('forward_kinematics', forward_kinematics), ('jacobian', jacobian)]:
+        replacements, reduced = sp.cse(expressions)
+        lines += ['', '', 'def {name}({arguments}):'.format(name=name, arguments=arguments)]
+        lines += ['    {symbol} = {expression}'.format(symbol=symbol, expression=printer.doprint(expression))
+                  for symbol, expression in replacements]
+        lines += ['    return ({expressions},)'.format(
+            expressions=', '.join(printer.doprint(expression) for expression in reduced))]
+    return '\n'.join(lines) + '\n'
+
+
+def GetKinematicFunctionsFromDH(a, alpha, d, cache_dir=DEFAULT_CACHE_DIR):
+    '''
+    Load the generated functions of a DH table from memory or from cache_dir, and generate them on a miss.
+
+    Input parameters:
+    a, alpha, d (list of float): DH parameters
+    cache_dir (str): Directory of the generated modules, None to keep them in memory only
+
+    Return value:
+    kinematicFunctions (KinematicFunctions)
+    '''
+    key = GetCacheKey(a, alpha, d)
+    if key in __kinematicFunctions:
+        return __kinematicFunctions[key]
+
+    source = None
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, key + '.py')
+        if os.path.isfile(path):
+            with open(path) as source_file:
+                source = source_file.read()
+    if source is None:
+        start_perf_counter = time.perf_counter()
+        source = GenerateKinematicSource(a, alpha, d)
+        logging.info('kinematicGenerator: Generated ' + key + ' in {elapsed_time:.2f} s'
+                     .format(elapsed_time=time.perf_counter() - start_perf_counter))
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            temporary_path = path + '.' + str(os.getpid()) + '.tmp'
+            with open(temporary_path, 'w') as source_file:
+                source_file.write(source)
+            os.replace(temporary_path, path)
+
+    module_spec = importlib.util.spec_from_loader('URBasic_kinematic_' + key, loader=None)
+    module = importlib.util.module_from_spec(module_spec)
+    exec(compile(source, path or '<URBasic_kinematic_' + key + '>', 'exec'), module.__dict__)
+    __kinematicFunctions[key] = KinematicFunctions(module, key)
+    return __kinematicFunctions[key]
+
+
+def ClearKinematicFunctions():
+    '''
+    Drop the functions kept in memory, the next call loads them from the cache directory again.
+    '''
+    __kinematicFunctions.clear()
+
+
+def GetKinematicFunctions(rob='ur10', cache_dir=DEFAULT_CACHE_DIR):
+    '''
+    GetKinematicFunctionsFromDH for a robot of URBasic.robotRegistry.
+    '''
+    robot = GetRobot(rob)
+    return GetKinematicFunctionsFromDH(robot.a, robot.alpha, robot.d, cache_dir=cache_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the kinematic functions of registered robots.")
+    parser.add_argument("--robots", type=str, nargs='*', default=GetRobotNames(), help="Robot types.")
+    parser.add_argument("--cache_dir", type=str, default=DEFAULT_CACHE_DIR, help="Directory of generated modules.")
+    args = parser.parse_args()
+    for rob in args.robots:
+        start_perf_counter = time.perf_counter()
+        kinematicFunctions = GetKinematicFunctions(rob, cache_dir=args.cache_dir)
+        print('{rob:<8}{key}  {elapsed_time:.2f} s'.format(rob=rob, key=kinematicFunctions.key,
+                                                           elapsed_time=time.perf_counter() - start_perf_counter))
+
+
+if __name__ == '__main__':
+    main()
@@ -567,6 +567,28 @@ def FKinFixed(M,Slist,thetalist):
     return T_se
 
 
+def FKinFixedArray(M, Slist, thetalist_array):
+    '''
+    Vectorized FKinFixed. Takes M and Slist as FKinFixed and an N x n array of joint coords (one configuration
+    per row) and returns the N x 4 x 4 array of end-effector configurations. Each joint exponential is evaluated
+    for all N configurations at once with MatrixExp6Array, so the cost is n stacked matrix products.
+    Example:
+
+    FKinFixedArray(M, Slist, [[math.pi/2, 3, math.pi], [0, 0, 0]])[0]
+    >> (same as FKinFixed(M, Slist, [math.pi/2, 3, math.pi]))
+    '''
+    M = asarray(M, dtype=float)
+    assert M.shape == (4,4), "M not a 4x4 matrix"
+    assert len(Slist[0]) == 6, "Incorrect Screw Axis length"
+    Slist = asarray(Slist, dtype=float)
+    thetalist_array = asarray(thetalist_array, dtype=float).reshape(-1, len(Slist))
+
+    c = MatrixExp6Array(Slist[0], thetalist_array[:, 0])
+    for i in range(1, len(Slist)):
+        c = matmul(c, MatrixExp6Array(Slist[i], thetalist_array[:, i]))
+    return matmul(c, M)
+
+
 def FKinBody(M,Blist,thetalist):
     '''
     Same as FKinFixed, except here the screw axes are expressed in the end-effector frame.
@@ -1008,6 +1030,190 @@ def CartesianTrajectory(X_start, X_end, T, N, method='cubic'):
         return trajectory
 
 
+def TimeScalingArray(T, N, method='cubic'):
+    '''
+    Vectorized CubicTimeScaling/QuinticTimeScaling. Takes a total travel time T, the number of points N >= 2
+    and the time-scaling method (cubic or quintic) and returns the arrays s, sdot and sddot (each of length N)
+    of the path parameter and its first and second time derivatives, sampled at t = i*T/(N-1).
+    Example:
+
+    s, sdot, sddot = TimeScalingArray(10, 3, 'cubic')
+    s
+    >> array([ 0. ,  0.5,  1. ])
+    sdot
+    >> array([ 0.  ,  0.15,  0.  ])
+    sddot
+    >> array([ 0.06,  0.  , -0.06])
+    '''
+    assert N >= 2, 'N must be >= 2'
+    assert isinstance(N, int), 'N must be an integer'
+    assert method == 'cubic' or method == 'quintic', 'Incorrect time-scaling method argument'
+
+    t = arange(N)*float(T)/(N-1)
+
+    if method == 'cubic':
+        s = (3./(T**2))*(t**2) - (2./(T**3))*(t**3)
+        sdot = (6./(T**2))*t - (6./(T**3))*(t**2)
+        sddot = 6./(T**2) - (12./(T**3))*t
+    else:
+        s = (10./(T**3))*(t**3) + (-15./(T**4))*(t**4) + (6./(T**5))*(t**5)
+        sdot = (30./(T**3))*(t**2) + (-60./(T**4))*(t**3) + (30./(T**5))*(t**4)
+        sddot = (60./(T**3))*t + (-180./(T**4))*(t**2) + (120./(T**5))*(t**3)
+    return s, sdot, sddot
+
+
+def MatrixExp3Array(w, s):
+    '''
+    Vectorized MatrixExp3 along a fixed rotation axis. Takes a 3-vector of exp coords w = w_unit*theta and an
+    array s of N path parameters and returns the N x 3 x 3 array of rotation matrices exp([w]*s_i).
+    Example:
+
+    MatrixExp3Array([0, 0, pi/2], [0, 1])
+    >> array([[[ 1.,  0.,  0.],
+               [ 0.,  1.,  0.],
+               [ 0.,  0.,  1.]],
+              [[ 0., -1.,  0.],
+               [ 1.,  0.,  0.],
+               [ 0.,  0.,  1.]]])
+    '''
+    w = asarray(w, dtype=float).reshape(3)
+    s = asarray(s, dtype=float).reshape(-1)
+
+    R = tile(identity(3), (len(s), 1, 1))
+    theta = linalg.norm(w)
+    if theta == 0:
+        return R
+
+    w_so3mat = VecToso3(w/theta)
+    R += sin(theta*s)[:, newaxis, newaxis]*w_so3mat
+    R += (1-cos(theta*s))[:, newaxis, newaxis]*dot(w_so3mat, w_so3mat)
+    return R
+
+
+def MatrixExp6Array(STheta, s):
+    '''
+    Vectorized MatrixExp6 along a fixed screw axis. Takes a 6-vector of exp coords STheta and an array s of
+    N path parameters and returns the N x 4 x 4 array of transformation matrices exp([S]*theta*s_i).
+    Example:
+
+    MatrixExp6Array([0,0,1,0,-3,2], [0, 1])[1]
+    >> array([[ 0.54030231, -0.84147098,  0.        ,  1.37909308],
+              [ 0.84147098,  0.54030231,  0.        , -2.52441295],
+              [ 0.        ,  0.        ,  1.        ,  2.        ],
+              [ 0.        ,  0.        ,  0.        ,  1.        ]])
+    '''
+    STheta = asarray(STheta, dtype=float).reshape(6)
+    s = asarray(s, dtype=float).reshape(-1)
+
+    T = tile(identity(4), (len(s), 1, 1))
+    wTheta = STheta[:3]
+    vTheta = STheta[3:]
+    theta = linalg.norm(wTheta)
+
+    if theta == 0:
+        T[:, :3, 3] = s[:, newaxis]*vTheta
+        return T
+
+    w_so3mat = VecToso3(wTheta/theta)
+    w_so3mat2 = dot(w_so3mat, w_so3mat)
+    v_unit = vTheta/theta
+    thetas = theta*s
+
+    T[:, :3, :3] = MatrixExp3Array(wTheta, s)
+    T[:, :3, 3] = (thetas[:, newaxis]*v_unit
+                   + (1-cos(thetas))[:, newaxis]*dot(w_so3mat, v_unit)
+                   + (thetas-sin(thetas))[:, newaxis]*dot(w_so3mat2, v_unit))
+    return T
+
+
+def JointTrajectoryArray(thetas_start, thetas_end, T, N, method='cubic'):
+    '''
+    Vectorized JointTrajectory. Takes the same arguments and returns (trajectory, velocities, accelerations),
+    each an N x n matrix where row i holds the joint positions, velocities and accelerations at t = i*T/(N-1).
+    The time scaling is computed once for all samples, so the cost is linear in N.
+    Example:
+
+    thetas_start = [0.1]*6
+    thetas_end = [pi/2]*6
+    trajectory, velocities, accelerations = JointTrajectoryArray(thetas_start, thetas_end, 2, 5, 'cubic')
+    trajectory
+    >>
+    array([[ 0.1  ,  0.1  ,  0.1  ,  0.1  ,  0.1  ,  0.1  ],
+           [ 0.33 ,  0.33 ,  0.33 ,  0.33 ,  0.33 ,  0.33 ],
+           [ 0.835,  0.835,  0.835,  0.835,  0.835,  0.835],
+           [ 1.341,  1.341,  1.341,  1.341,  1.341,  1.341],
+           [ 1.571,  1.571,  1.571,  1.571,  1.571,  1.571]])
+    '''
+    assert len(thetas_start) == len(thetas_end), 'Incompatible thetas'
+
+    s, sdot, sddot = TimeScalingArray(T, N, method)
+    thetas_start = asarray(thetas_start)
+    thetas_end = asarray(thetas_end)
+
+    trajectory = thetas_start*(1-s[:, newaxis]) + thetas_end*s[:, newaxis]
+    trajectory[0] = thetas_start
+    velocities = (thetas_end-thetas_start)*sdot[:, newaxis]
+    accelerations = (thetas_end-thetas_start)*sddot[:, newaxis]
+    return trajectory, velocities, accelerations
+
+
+def ScrewTrajectoryArray(X_start, X_end, T, N, method='cubic'):
+    '''
+    Vectorized ScrewTrajectory. Takes the same arguments and returns (trajectory, twists, twist_dots):
+    trajectory is an N x 4 x 4 array of SE(3) configurations (trajectory.reshape(-1, 4) gives the 4N x 4
+    layout of ScrewTrajectory), twists and twist_dots are N x 6 arrays of the body twist [w, v] and its time
+    derivative. The screw axis is computed once and the matrix exponential is evaluated for all samples at once.
+    Example:
+
+    trajectory, twists, twist_dots = ScrewTrajectoryArray(X_start, X_end, 2, 3, 'quintic')
+    trajectory.reshape(-1, 4)
+    >> (same as ScrewTrajectory(X_start, X_end, 2, 3, 'quintic'))
+    '''
+    R_start, p_start = TransToRp(X_start) #Just to ensure X_start is valid
+    R_end ,p_end = TransToRp(X_end)       #Just to ensure X_end is valid
+    X_start = asarray(X_start)
+
+    s, sdot, sddot = TimeScalingArray(T, N, method)
+    STheta = MatrixLog6(TransInv(X_start).dot(X_end)).reshape(6)
+
+    trajectory = matmul(X_start, MatrixExp6Array(STheta, s))
+    trajectory[0] = X_start
+    twists = sdot[:, newaxis]*STheta
+    twist_dots = sddot[:, newaxis]*STheta
+    return trajectory, twists, twist_dots
+
+
+def CartesianTrajectoryArray(X_start, X_end, T, N, method='cubic'):
+    '''
+    Vectorized CartesianTrajectory. Takes the same arguments and returns (trajectory, velocities, accelerations):
+    trajectory is an N x 4 x 4 array of SE(3) configurations (trajectory.reshape(-1, 4) gives the 4N x 4
+    layout of CartesianTrajectory), velocities and accelerations are N x 6 arrays [w_b, p_dot] holding the
+    angular velocity in the body frame and the linear velocity of the frame origin in the fixed frame, and
+    their time derivatives.
+    Example:
+
+    trajectory, velocities, accelerations = CartesianTrajectoryArray(X_start, X_end, 2, 3, 'quintic')
+    trajectory.reshape(-1, 4)
+    >> (same as CartesianTrajectory(X_start, X_end, 2, 3, 'quintic'))
+    '''
+    R_start, p_start = TransToRp(X_start)
+    R_end ,p_end = TransToRp(X_end)
+    X_start = asarray(X_start)
+
+    s, sdot, sddot = TimeScalingArray(T, N, method)
+    p_start = asarray(p_start, dtype=float).reshape(3)
+    p_end = asarray(p_end, dtype=float).reshape(3)
+    wTheta = MatrixLog3(RotInv(R_start).dot(R_end)).reshape(3)
+
+    trajectory = tile(identity(4), (N, 1, 1))
+    trajectory[:, :3, :3] = matmul(R_start, MatrixExp3Array(wTheta, s))
+    trajectory[:, :3, 3] = (1-s[:, newaxis])*p_start + s[:, newaxis]*p_end
+    trajectory[0] = X_start
+    velocities = hstack((sdot[:, newaxis]*wTheta, sdot[:, newaxis]*(p_end-p_start)))
+    accelerations = hstack((sddot[:, newaxis]*wTheta, sddot[:, newaxis]*(p_end-p_start)))
+    return trajectory, velocities, accelerations
+
+
 ### end of HW4 functions #############################
 
 ### start of HW5 functions ###########################
@@ -0,0 +1,116 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class ProgramBuilder(object):
+    '''
+    Builds status-instrumented move programs as bytes, ready to be sent with
+    RealTimeClient.SendProgram(prg, instrumented=True).
+
+    The output is the same program that UrScript._move, the move_x template and
+    RealTimeClient.__AddStatusBit2Prog produce together: output_boolean_register 0 is set
+    when the program starts and output_boolean_register 1 when it finishes.
+    Finished programs are kept in an LRU cache keyed by a hash of the motion type,
+    the motion parameters and the waypoint array, so repeated sequences are not regenerated.
+
+    Input parameters:
+    cache_size (int): Number of finished programs kept, 0 disables the cache
+
+    Example:
+    builder = URBasic.programBuilder.ProgramBuilder()
+    prg = builder.BuildMove('j', [[0, -1.57, 1.57, -1.57, -1.57, 0]], a=1.4, v=1.05, r=0.05)
+    rob.robotConnector.RealTimeClient.SendProgram(prg, instrumented=True)
+    '''
+
+    PROGRAM_NAMES = {'j': 'move_j', 'l': 'move_l', 'p': 'move_p'}
+
+    def __init__(self, cache_size=256):
+        self.__cache_size = cache_size
+        self.__cache = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def GetCacheInfo(self):
+        '''
+        Return value:
+        cache info (dict): hits, misses, current size and maximum size of the program cache
+        '''
+        with self.__lock:
+            return {'hits': self.__hits,
+                    'misses': self.__misses,
+                    'size': len(self.__cache),
+                    'max_size': self.__cache_size}
+
+    def ClearCache(self):
+        with self.__lock:
+            self.__cache.clear()
+
+    def BuildMove(self, movetype, waypoints, a=1.2, v=0.25, t=0, r=0, pose=True):
+        '''
+        Build an instrumented movej/movel/movep program.
+
+        Input parameters:
+        movetype (str): j, l or p
+        waypoints (array): One 6-vector, or an N x 6 array that becomes N consecutive blended moves
+        a (float): acceleration
+        v (float): speed
+        t (float): time [S], only used by movej and movel
+        r (float): blend radius [m], the last waypoint of an N x 6 array always has r=0
+        pose (bool): True if the waypoints are poses (p[...]), False if they are joint positions
+
+        Return value:
+        prg (bytes): The program
+        '''
+        if movetype not in self.PROGRAM_NAMES:
+            raise ValueError('ProgramBuilder: Unsupported movetype ' + str(movetype))
+        waypoints = np.ascontiguousarray(np.round(np.asarray(waypoints, dtype=float), 4))
+        key = self.__getKey(movetype, waypoints, a, v, t, r, pose)
+
+        if self.__cache_size > 0:
+            with self.__lock:
+                prg = self.__cache.get(key)
+                if prg is not None:
+                    self.__cache.move_to_end(key)
+                    self.__hits += 1
+                    return prg
+                self.__misses += 1
+
+        prg = self.__build(movetype, waypoints, a, v, t, r, pose)
+
+        if self.__cache_size > 0:
+            with self.__lock:
+                self.__cache[key] = prg
+                self.__cache.move_to_end(key)
+                while len(self.__cache) > self.__cache_size:
+                    self.__cache.popitem(last=False)
+        return prg
+
+    @staticmethod
+    def __getKey(movetype, waypoints, a, v, t, r, pose):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((movetype, a, v, t, r, pose, waypoints.shape)).encode())
+        digest.update(waypoints.tobytes())
+        return digest.digest()
+
+    def __build(self, movetype, waypoints, a, v, t, r, pose):
+        prefix = 'p' if pose else ''
+        t_val = 't={0},'.format(t) if movetype in ('j', 'l') else ''
+        move = '    move' + movetype + '( ' + prefix + '{0}, a=' + str(a) + ', v=' + str(v) + ', ' + t_val + ' r={1})\n'
+
+        lines = ['def ', self.PROGRAM_NAMES[movetype], '():\n  write_output_boolean_register(0, True)\n']
+        if waypoints.ndim == 2:
+            rows = waypoints.tolist()
+            last = len(rows) - 1
+            for idx, row in enumerate(rows):
+                lines.append(move.format(row, 0 if idx == last else r))
+            lines.append('    stopl(' + str(a) + ')\n')
+        else:
+            lines.append(move.format(waypoints.tolist(), r))
+        lines.append('\n\n  write_output_boolean_register(1, True)\nend\n')
+        return ''.join(lines).encode()
@@ -82,6 +82,16 @@ class RealTimeClient(object):
         self.__reconnectTimeout = 60
         self.__sock = None
         self.__thread = None
+        self.__programDoneEvent = threading.Event()
+        self.__programDoneEvent.set()
+        self.__programLock = threading.Lock()
+        self.__sendLock = threading.RLock()
+        self.__programStartTimeout = 0.5
+        self.__programStopTimeout = 0.5
+        self.__programPollTimeout = 0.1
+        self.__programStartDeadline = None
+        self.__programNotRunningSince = None
+        self.__robotModel.AddFrameListener(self.__onNewFrame)
         if self.__connect():
             logging.info('RT_CLient constructor done')
         else:
@@ -147,16 +157,18 @@ class RealTimeClient(object):
         '''
         return self.__robotModel.rtcConnectionState > ConnectionState.DISCONNECTED
         
-    def SendProgram(self,prg=''):
+    def SendProgram(self,prg='',instrumented=False):
         '''
         Send a new command or program (string) to the UR controller. 
         The command or program will be executed as soon as it's received by the UR controller. 
         Sending a new command or program while stop and existing running command or program and start the new one.
         The program or command will also bee modified to include some control signals to be used
         for monitoring if a program execution is successful and finished.  
+        Calls from several threads (motion worker, stopj from a command handler) are serialized.
 
         Input parameters:
-        prg (string): A string containing a single command or a whole program.
+        prg (string/bytes): A string containing a single command or a whole program.
+        instrumented (boolean): True if prg already sets the status bits (e.g. built by ProgramBuilder)
 
         Example:
         rob = URBasic.realTimeClient.RT_CLient('192.168.56.101',logger=logger)
@@ -164,32 +176,43 @@ class RealTimeClient(object):
         rob.send_srt('set_digital_out(0, True)')
         rob.disconnect()        
         '''
-        if not self.IsRtcConnected():
-            if not self.__connect():
-                logging.error('SendProgram: Not connected to robot')
+        with self.__sendLock:
+            if not self.IsRtcConnected():
+                if not self.__connect():
+                    logging.error('SendProgram: Not connected to robot')
  
-        if self.__robotModel.stopRunningFlag:
-            logging.info('SendProgram: Send program aborted due to stopRunningFlag')
-            return
+            if self.__robotModel.stopRunningFlag:
+                logging.info('SendProgram: Send program aborted due to stopRunningFlag')
+                return
  
-        #Close down previous thread 
-        if self.__thread is not None:
-            if self.__robotModel.rtcProgramRunning:
-                self.__robotModel.stopRunningFlag = True
-                while self.__robotModel.rtcProgramRunning: time.sleep(0.1)
-                self.__robotModel.stopRunningFlag = False
-            self.__thread.join()
+            #Close down previous thread 
+            if self.__thread is not None:
+                if self.__robotModel.rtcProgramRunning:
+                    self.__robotModel.stopRunningFlag = True
+                    self.__programDoneEvent.set()
+                    self.__thread.join()
+                    self.__robotModel.stopRunningFlag = False
+                self.__thread.join()
             
+            if not instrumented:
+                prg = self.__AddStatusBit2Prog(prg)
+
+            #Rest status bits
+            with self.__programLock:
+                self.__programDoneEvent.clear()
+                self.__programStartDeadline = time.perf_counter() + max(self.__programStartTimeout, len(prg)/1000.)
+                self.__programNotRunningSince = None
+                self.__robotModel.rtcProgramExecutionError = False
+                self.__robotModel.rtcProgramStartPerfCounter = None
+                self.__robotModel.rtcProgramFinishPerfCounter = None
+                self.__robotModel.rtcProgramRunning = True
         
-        #Rest status bits
-        self.__robotModel.rtcProgramRunning = True
-        self.__robotModel.rtcProgramExecutionError = False
-        
-        #Send and wait from program
-        self.__sendPrg(self.__AddStatusBit2Prog(prg))        
-        self.__thread = threading.Thread(target=self.__waitForProgram2Finish, kwargs={'prg': prg})
-        self.__thread.start()
-        #self.__waitForProgram2Finish(prg)
+            #Send and wait from program
+            self.__robotModel.rtcProgramSendPerfCounter = time.perf_counter()
+            self.__sendPrg(prg)
+            self.__thread = threading.Thread(target=self.__waitForProgram2Finish, kwargs={'prg': prg})
+            self.__thread.start()
+            #self.__waitForProgram2Finish(prg)
             
     def Send(self,prg=''):
         '''
@@ -209,20 +232,21 @@ class RealTimeClient(object):
         rob.send_srt('set_digital_out(0, True)')
         rob.disconnect()        
         '''
-        if not self.IsRtcConnected():
-            if not self.__connect():
-                logging.error('SendProgram: Not connected to robot')
-        if self.__robotModel.stopRunningFlag:
-            logging.info('SendProgram: Send command aborted due to stopRunningFlag')
-            return
+        with self.__sendLock:
+            if not self.IsRtcConnected():
+                if not self.__connect():
+                    logging.error('SendProgram: Not connected to robot')
+            if self.__robotModel.stopRunningFlag:
+                logging.info('SendProgram: Send command aborted due to stopRunningFlag')
+                return
     
-        #Rest status bits
-        self.__robotModel.rtcProgramRunning = True
-        self.__robotModel.rtcProgramExecutionError = False
+            #Rest status bits
+            self.__robotModel.rtcProgramRunning = True
+            self.__robotModel.rtcProgramExecutionError = False
         
-        #Send
-        self.__sendPrg(prg)      
-        self.__robotModel.rtcProgramRunning = False
+            #Send
+            self.__sendPrg(prg)      
+            self.__robotModel.rtcProgramRunning = False
 
     def __AddStatusBit2Prog(self,prg):
         '''
@@ -258,8 +282,10 @@ class RealTimeClient(object):
             try:
                 (_, writable, _) = select.select([], [self.__sock], [], DEFAULT_TIMEOUT)
                 if len(writable):
-                    self.__sock.send(prg.encode())
-                    logging.info('Program send to Robot:\n' + prg)
+                    if isinstance(prg, str):
+                        prg = prg.encode()
+                    self.__sock.send(prg)
+                    logging.info('Program send to Robot:\n%s', prg.decode())
                     programSend = True
             except:
                 self.__sock = None
@@ -269,44 +295,84 @@ class RealTimeClient(object):
         if not programSend:
             self.__robotModel.rtcProgramRunning = False
             logging.error('Program re-sending timed out - Could not send program!')
-        time.sleep(0.1)
 
 
-    def __waitForProgram2Finish(self,prg):
+    def __onNewFrame(self, robotModel):
         '''
-        waiting for program to finish
+        RTDE frame listener, evaluates the program state on every new data frame
         '''
-        waitForProgramStart = len(prg)/50
-        notrun = 0
-        prgRest = 'def resetRegister():\n  write_output_boolean_register(0, False)\n  write_output_boolean_register(1, False)\nend\n'
-        while not self.__robotModel.stopRunningFlag and self.__robotModel.rtcProgramRunning:            
-            if self.__robotModel.SafetyStatus().StoppedDueToSafety:
-                self.__robotModel.rtcProgramRunning = False
+        if robotModel.rtcProgramRunning and not self.__programDoneEvent.is_set():
+            self.__checkProgramState()
+
+    def __checkProgramState(self):
+        '''
+        Detect program start/finish from the status bits, robot_status_bits and safety_status_bits
+        of the latest RTDE frame. Sets the program done event when the program is no longer running.
+        '''
+        with self.__programLock:
+            if self.__programDoneEvent.is_set():
+                return
+            if not self.__robotModel.rtcProgramRunning or self.__robotModel.stopRunningFlag:
+                self.__programDoneEvent.set()
+                return
+
+            now = time.perf_counter()
+            dataDir = self.__robotModel.dataDir
+            safetyStatusBits = dataDir['safety_status_bits']
+            outputBits = dataDir['output_bit_registers0_to_31'] or 0
+            robotStatusBits = dataDir['robot_status_bits'] or 0
+
+            if safetyStatusBits is not None and safetyStatusBits & 1024 == 1024:
                 self.__robotModel.rtcProgramExecutionError = True
                 logging.error('SendProgram: Safety Stop')
-            elif self.__robotModel.OutputBitRegister()[0] == False:
+            elif outputBits & 1 == 0:
                 logging.debug('sendProgram: Program not started')
-                notrun += 1
-                if notrun > waitForProgramStart:
-                    self.__robotModel.rtcProgramRunning = False
-                    logging.error('sendProgram: Program not able to run')
-            elif self.__robotModel.OutputBitRegister()[0] == True and self.__robotModel.OutputBitRegister()[1] == True:
-                self.__robotModel.rtcProgramRunning = False
+                if now < self.__programStartDeadline:
+                    return
+                logging.error('sendProgram: Program not able to run')
+            elif outputBits & 2 == 2:
+                if self.__robotModel.rtcProgramStartPerfCounter is None:
+                    self.__robotModel.rtcProgramStartPerfCounter = now
+                self.__robotModel.rtcProgramFinishPerfCounter = now
                 logging.info('sendProgram: Finished')
-            elif self.__robotModel.OutputBitRegister()[0] == True:
-                if self.__robotModel.RobotStatus().ProgramRunning:
-                    logging.debug('sendProgram: UR running')
-                    notrun = 0
-                else:
-                    notrun += 1
-                    if notrun>10:
-                        self.__robotModel.rtcProgramRunning = False
-                        self.__robotModel.rtcProgramExecutionError = True
-                        logging.error('SendProgram: Program Stopped but not finiched!!!')
             else:
-                self.__robotModel.rtcProgramRunning = False
-                logging.error('SendProgram: Unknown error')
-            time.sleep(0.05)
+                if self.__robotModel.rtcProgramStartPerfCounter is None:
+                    self.__robotModel.rtcProgramStartPerfCounter = now
+                if robotStatusBits & 2 == 2:
+                    self.__programNotRunningSince = None
+                    return
+                if self.__programNotRunningSince is None:
+                    self.__programNotRunningSince = now
+                if now - self.__programNotRunningSince < self.__programStopTimeout:
+                    return
+                self.__robotModel.rtcProgramExecutionError = True
+                logging.error('SendProgram: Program Stopped but not finiched!!!')
+
+            self.__robotModel.rtcProgramRunning = False
+            self.__programDoneEvent.set()
+
+    def __waitForProgram2Finish(self,prg):
+        '''
+        waiting for program to finish
+        The state is evaluated by the RTDE frame listener, this thread only blocks on the done event.
+        The timeout keeps the time based deadlines working if no RTDE frames are received.
+        '''
+        prgRest = 'def resetRegister():\n  write_output_boolean_register(0, False)\n  write_output_boolean_register(1, False)\nend\n'
+        while not self.__programDoneEvent.wait(self.__programPollTimeout):
+            self.__checkProgramState()
         self.__sendPrg(prgRest)
+        self.__waitForRegisterReset()
         self.__robotModel.rtcProgramRunning = False
-        
\ No newline at end of file
+
+    def __waitForRegisterReset(self):
+        '''
+        Wait until the status bits are cleared, so the next program does not see stale start/finish bits
+        '''
+        deadline = time.perf_counter() + self.__programStopTimeout
+        while time.perf_counter() < deadline:
+            outputBits = self.__robotModel.dataDir['output_bit_registers0_to_31']
+            if outputBits is None or outputBits & 3 == 0:
+                return True
+            self.__robotModel.WaitForNewData(timeout=deadline - time.perf_counter())
+        logging.warning('SendProgram: Status bits not reset')
+        return False
@@ -34,11 +34,16 @@ class RobotConnector(object):
     Class to hold all connection to the Universal Robot and plus devises  
          
     Input parameters:
+    robotModel (RobotModel): Data model shared by all connections
+    host (string): hostname or IP of UR Robot
+    hasForceTorque (boolean): Connect to a force torque sensor
+    rtde_conf_filename (string): [Optional] Path to xml file describing what RTDE channels to activate
+    hasDataLog (boolean): Start the data log thread, can be disabled when data is consumed elsewhere
 
     '''
 
 
-    def __init__(self,robotModel, host, hasForceTorque=False):
+    def __init__(self,robotModel, host, hasForceTorque=False, rtde_conf_filename=None, hasDataLog=True):
         '''
         Constructor see class description for more info.
         '''
@@ -48,8 +53,10 @@ class RobotConnector(object):
         self.RobotModel.ipAddress = host
         self.RobotModel.hasForceTorqueSensor = hasForceTorque
         self.RealTimeClient = URBasic.realTimeClient.RealTimeClient(robotModel)
-        self.DataLog = URBasic.dataLog.DataLog(robotModel)
-        self.RTDE = URBasic.rtde.RTDE(robotModel)
+        self.DataLog = None
+        if hasDataLog:
+            self.DataLog = URBasic.dataLog.DataLog(robotModel)
+        self.RTDE = URBasic.rtde.RTDE(robotModel, conf_filename=rtde_conf_filename)
         self.DashboardClient = URBasic.dashboard.DashBoard(robotModel)
         self.ForceTourqe = None
         if hasForceTorque:
@@ -62,7 +69,8 @@ class RobotConnector(object):
 
 
     def close(self):
-        self.DataLog.close()
+        if self.DataLog is not None:
+            self.DataLog.close()
         self.RTDE.close()
         self.RealTimeClient.Disconnect()
         self.DashboardClient.close()
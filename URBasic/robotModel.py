@@ -26,6 +26,8 @@ __copyright__ = "Copyright 2017, Rope Robotics ApS, Denmark"
 __license__ = "MIT License"
 
 import logging
+import threading
+import time
 
 import URBasic
 
@@ -47,6 +49,12 @@ class RobotModel(object):
         self.__logger = logger.__dict__[name]
         logging.info('Init done')
 
+        self.__stateCondition = threading.Condition()
+        self.__lastUpdatePerfCounter = None
+        self.__frameListeners = []
+        self.__rtcProgramRunning = False
+        self.__stopRunningFlag = False
+
         # Universal Robot Model content
         self.password = None
         self.ipAddress = None
@@ -159,6 +167,9 @@ class RobotModel(object):
         self.rtcConnectionState = None
         self.rtcProgramRunning = False
         self.rtcProgramExecutionError = False
+        self.rtcProgramSendPerfCounter = None
+        self.rtcProgramStartPerfCounter = None
+        self.rtcProgramFinishPerfCounter = None
         self.stopRunningFlag = False
         self.forceRemoteActiveFlag = False
 
@@ -166,11 +177,77 @@ class RobotModel(object):
         self.hasForceTorqueSensor = False
         self.forceTourqe = None
 
+    @property
+    def rtcProgramRunning(self):
+        return self.__rtcProgramRunning
+
+    @rtcProgramRunning.setter
+    def rtcProgramRunning(self, value):
+        with self.__stateCondition:
+            self.__rtcProgramRunning = value
+            self.__stateCondition.notify_all()
+
+    @property
+    def stopRunningFlag(self):
+        return self.__stopRunningFlag
+
+    @stopRunningFlag.setter
+    def stopRunningFlag(self, value):
+        with self.__stateCondition:
+            self.__stopRunningFlag = value
+            self.__stateCondition.notify_all()
+
+    def AddFrameListener(self, listener):
+        '''
+        Register a function that is called with this model from the RTDE thread on every new data frame.
+        Listeners must return quickly, they delay the RTDE receive loop.
+        '''
+        self.__frameListeners = self.__frameListeners + [listener]
+
+    def RemoveFrameListener(self, listener):
+        self.__frameListeners = [item for item in self.__frameListeners if item != listener]
+
+    def NotifyNewData(self):
+        '''
+        Called by the RTDE thread after dataDir has been updated with a new frame.
+        Runs the frame listeners and wakes up threads blocked in WaitForNewData.
+        '''
+        self.__lastUpdatePerfCounter = time.perf_counter()
+        for listener in self.__frameListeners:
+            try:
+                listener(self)
+            except Exception:
+                logging.exception('Frame listener failed')
+        with self.__stateCondition:
+            self.__stateCondition.notify_all()
+
+    def WaitForNewData(self, timeout=None):
+        '''
+        Block until the next RTDE frame has been received.
+
+        Return value:
+        new data (bool): False if the timeout expired first
+        '''
+        lastUpdate = self.__lastUpdatePerfCounter
+        with self.__stateCondition:
+            return self.__stateCondition.wait_for(lambda: self.__lastUpdatePerfCounter != lastUpdate, timeout)
+
+    def WaitForProgramIdle(self, timeout=None):
+        '''
+        Block until no program is running on the RealTimeClient or the stopRunningFlag is set.
+
+        Return value:
+        idle (bool): False if the timeout expired first
+        '''
+        with self.__stateCondition:
+            return self.__stateCondition.wait_for(lambda: not self.__rtcProgramRunning or self.__stopRunningFlag,
+                                                  timeout)
+
     def RobotTimestamp(self):
         return self.dataDir['timestamp']
 
     def LastUpdateTimestamp(self):
-        raise NotImplementedError('Function Not yet implemented')
+        return self.__lastUpdatePerfCounter
 
     def RTDEConnectionState(self):
         raise NotImplementedError('Function Not yet implemented')
@@ -379,6 +456,12 @@ class RobotStatusBit(object):
     TeachButtonPressed = None
     PowerButtonPressed = None
 
+    def to_dict(self):
+        return {'PowerOn': self.PowerOn,
+                'ProgramRunning': self.ProgramRunning,
+                'TeachButtonPressed': self.TeachButtonPressed,
+                'PowerButtonPressed': self.PowerButtonPressed}
+
 
 class SafetyStatusBit(object):
     NormalMode = None
@@ -392,3 +475,16 @@ class SafetyStatusBit(object):
     Violation = None
     Fault = None
     StoppedDueToSafety = None
+
+    def to_dict(self):
+        return {'NormalMode': self.NormalMode,
+                'ReducedMode': self.ReducedMode,
+                'ProtectiveStopped': self.ProtectiveStopped,
+                'RecoveryMode': self.RecoveryMode,
+                'SafeguardStopped': self.SafeguardStopped,
+                'SystemEmergencyStopped': self.SystemEmergencyStopped,
+                'RobotEmergencyStopped': self.RobotEmergencyStopped,
+                'EmergencyStopped': self.EmergencyStopped,
+                'Violation': self.Violation,
+                'Fault': self.Fault,
+                'StoppedDueToSafety': self.StoppedDueToSafety}
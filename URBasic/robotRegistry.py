@@ -0,0 +1,183 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import math
+import numpy as np
+
+
+class RobotParameter(object):
+    '''
+    Kinematic constants of one robot type, computed once when the robot is registered.
+
+    The DH table uses the UR convention (a, alpha, d per joint). When M and Slist are not given they are
+    derived from the DH table at the zero configuration. The ikpy chain is only parsed on the first call
+    of GetChain and reused afterwards. All arrays are read only, so they can be shared between callers.
+
+    Input parameters:
+    name (str): Robot type, e.g. 'ur10'
+    a, alpha, d (list of float): DH parameters
+    M (4x4 list): End-effector configuration at the zero configuration (fixed screw axis model)
+    Slist (6x6 list): Fixed screw axes, one per row
+    joint_limit (6x2 list): Lower and upper limit of each joint [rad]
+    urdf_file (str): URDF file used by the ikpy chain
+
+    Example:
+    URBasic.robotRegistry.RegisterRobot(URBasic.robotRegistry.RobotParameter('ur5e', a, alpha, d))
+    robot = URBasic.robotRegistry.GetRobot('ur5e')
+    '''
+
+    def __init__(self, name, a, alpha, d, M=None, Slist=None, joint_limit=None, urdf_file=None):
+        self.__name = str(name).lower()
+        self.__a = self.__readOnly(a)
+        self.__alpha = self.__readOnly(alpha)
+        self.__d = self.__readOnly(d)
+        self.__dh = self.__readOnly(np.column_stack((self.__a, self.__alpha, self.__d)))
+        if M is None or Slist is None:
+            M, Slist = self.__screwAxesFromDH()
+        self.__M = self.__readOnly(M)
+        self.__Slist = self.__readOnly(Slist)
+        if joint_limit is None:
+            joint_limit = [[-2 * math.pi, 2 * math.pi]] * len(self.__a)
+        self.__jointLimit = self.__readOnly(joint_limit)
+        self.__urdfFile = urdf_file
+        self.__chain = None
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def a(self):
+        return self.__a
+
+    @property
+    def alpha(self):
+        return self.__alpha
+
+    @property
+    def d(self):
+        return self.__d
+
+    @property
+    def dh(self):
+        '''
+        n x 3 array with the columns a, alpha and d
+        '''
+        return self.__dh
+
+    @property
+    def M(self):
+        return self.__M
+
+    @property
+    def Slist(self):
+        return self.__Slist
+
+    @property
+    def joint_limit(self):
+        return self.__jointLimit
+
+    @property
+    def urdf_file(self):
+        return self.__urdfFile
+
+    def GetChain(self):
+        '''
+        Return value:
+        chain (ikpy.chain.Chain): Chain parsed from urdf_file, parsed on the first call only
+        '''
+        if self.__chain is None:
+            if self.__urdfFile is None:
+                raise ValueError('RobotParameter: No URDF file registered for ' + self.__name)
+            import ikpy as ik
+            # Disable the logging stream from ikpy
+            ik.logs.manager.removeHandler(ik.logs.stream_handler)
+            self.__chain = ik.chain.Chain.from_urdf_file(self.__urdfFile)
+        return self.__chain
+
+    def __screwAxesFromDH(self):
+        T = np.identity(4)
+        Slist = []
+        for a, alpha, d in self.__dh:
+            w = T[:3, 2]
+            q = T[:3, 3]
+            Slist.append(np.concatenate((w, -np.cross(w, q))))
+            T = T.dot([[1, 0, 0, a],
+                       [0, math.cos(alpha), -math.sin(alpha), 0],
+                       [0, math.sin(alpha), math.cos(alpha), d],
+                       [0, 0, 0, 1]])
+        return T, np.array(Slist)
+
+    @staticmethod
+    def __readOnly(value):
+        array = np.array(value, dtype=float)
+        array.setflags(write=False)
+        return array
+
+
+__robots = {}
+
+
+def RegisterRobot(robot):
+    '''
+    Register (or replace) the constants of a robot type.
+
+    Input parameters:
+    robot (RobotParameter)
+    '''
+    __robots[robot.name] = robot
+
+
+def GetRobot(name):
+    '''
+    Return value:
+    robot (RobotParameter): The registered robot, KeyError for an unknown robot type
+    '''
+    return __robots[str(name).lower()]
+
+
+def IsRobotRegistered(name):
+    return str(name).lower() in __robots
+
+
+def GetRobotNames():
+    return sorted(__robots)
+
+
+UR_ALPHA = [math.pi / 2, 0, 0, math.pi / 2, -math.pi / 2, 0]
+
+RegisterRobot(RobotParameter(
+    name='ur5',
+    a=[0, -0.425, -0.39225, 0, 0, 0],
+    alpha=UR_ALPHA,
+    d=[0.089159, 0, 0, 0.10915, 0.09465, 0.0823],
+    M=[[1, 0, 0, -.81725], [0, 0, -1, -.19145], [0, 1, 0, -.0055], [0, 0, 0, 1]],
+    Slist=[[0, 0, 1, 0, 0, 0],
+           [0, -1, 0, .089159, 0, 0],
+           [0, -1, 0, .089159, 0, .425],
+           [0, -1, 0, .089159, 0, .81725],
+           [0, 0, -1, .10915, -.81725, 0],
+           [0, -1, 0, -.0055, 0, .81725]],
+    urdf_file='URDF/UR5.URDF'))
+RegisterRobot(RobotParameter(
+    name='ur10',
+    a=[0, -0.612, -0.5723, 0, 0, 0],
+    alpha=UR_ALPHA,
+    d=[0.1273, 0, 0, 0.163941, 0.1157, 0.0922],
+    M=[[1, 0, 0, -1.1843], [0, 0, -1, -0.2561], [0, 1, 0, 0.0116], [0, 0, 0, 1]],
+    Slist=[[0, 0, 1, 0, 0, 0],
+           [0, -1, 0, .1273, 0, 0],
+           [0, -1, 0, .1273, 0, .612],
+           [0, -1, 0, .1273, 0, 1.1843],
+           [0, 0, -1, .16394, -1.1843, 0],
+           [0, -1, 0, 0.01165, 0, 1.1843]]))
+RegisterRobot(RobotParameter(name='ur3', a=[0, -0.24365, -0.21325, 0, 0, 0], alpha=UR_ALPHA,
+                             d=[0.1519, 0, 0, 0.11235, 0.08535, 0.0819]))
+RegisterRobot(RobotParameter(name='ur3e', a=[0, -0.24355, -0.2132, 0, 0, 0], alpha=UR_ALPHA,
+                             d=[0.15185, 0, 0, 0.13105, 0.08535, 0.0921]))
+RegisterRobot(RobotParameter(name='ur5e', a=[0, -0.425, -0.3922, 0, 0, 0], alpha=UR_ALPHA,
+                             d=[0.1625, 0, 0, 0.1333, 0.0997, 0.0996]))
+RegisterRobot(RobotParameter(name='ur10e', a=[0, -0.6127, -0.57155, 0, 0, 0], alpha=UR_ALPHA,
+                             d=[0.1807, 0, 0, 0.17415, 0.11985, 0.11655]))
+RegisterRobot(RobotParameter(name='ur16e', a=[0, -0.4784, -0.36, 0, 0, 0], alpha=UR_ALPHA,
+                             d=[0.1807, 0, 0, 0.17415, 0.11985, 0.11655]))
@@ -0,0 +1,172 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import asyncio
+import logging
+import threading
+import time
+
+
+class RobotStateCache(object):
+    '''
+    Answers DashBoard state enquiries from the latest RTDE frame.
+
+    robotmode, safetymode, running and programState are derived from robot_mode, safety_mode,
+    robot_status_bits and runtime_state when the last RTDE frame is younger than max_frame_age.
+    Enquiries RTDE has no field for (loaded program, Polyscope version, ...) and enquiries made while the
+    RTDE stream is stale are sent to the AsyncDashBoard and the reply is kept for ttl seconds.
+    The replies use the DashBoard wording, so callers can switch between both sources. The one exception is
+    programState: the DashBoard replies with the state followed by the loaded program, e.g. 'PLAYING demo.urp',
+    while RTDE has no program name and the answer is the bare state, e.g. 'PLAYING'. Compare only the first
+    word of a programState reply.
+
+    Input parameters:
+    robotModel (RobotModel): Model updated by the RTDE thread
+    dashboard (AsyncDashBoard): Connected DashBoard client used as fallback, can be None
+    max_frame_age (float): Maximum age of the RTDE frame used for an answer [s]
+    ttl (float): Time a DashBoard reply is reused [s]
+
+    Example:
+    robotStateCache = URBasic.robotStateCache.RobotStateCache(robotModel, dashboard)
+    mode = await robotStateCache.ur_robotmode()
+    '''
+
+    ROBOT_MODES = {-1: 'NO_CONTROLLER', 0: 'DISCONNECTED', 1: 'CONFIRM_SAFETY', 2: 'BOOTING', 3: 'POWER_OFF',
+                   4: 'POWER_ON', 5: 'IDLE', 6: 'BACKDRIVE', 7: 'RUNNING', 8: 'UPDATING_FIRMWARE'}
+    SAFETY_MODES = {1: 'NORMAL', 2: 'REDUCED', 3: 'PROTECTIVE_STOP', 4: 'RECOVERY', 5: 'SAFEGUARD_STOP',
+                    6: 'SYSTEM_EMERGENCY_STOP', 7: 'ROBOT_EMERGENCY_STOP', 8: 'VIOLATION', 9: 'FAULT',
+                    10: 'VALIDATE_JOINT_ID', 11: 'UNDEFINED_SAFETY_MODE', 12: 'AUTOMATIC_MODE_SAFEGUARD_STOP',
+                    13: 'SYSTEM_THREE_POSITION_ENABLING_STOP'}
+    PROGRAM_STATES = {0: 'STOPPING', 1: 'STOPPED', 2: 'PLAYING', 3: 'PAUSING', 4: 'PAUSED', 5: 'RESUMING'}
+
+    def __init__(self, robotModel, dashboard=None, max_frame_age=0.5, ttl=1.0):
+        self.__robotModel = robotModel
+        self.__dashboard = dashboard
+        self.__maxFrameAge = max_frame_age
+        self.__ttl = ttl
+        self.__cache = {}
+        self.__lock = threading.Lock()
+        self.__rtdeHits = 0
+        self.__cacheHits = 0
+        self.__dashboardQueries = 0
+        self.__rtdeAnswers = {'robotmode': self.__getRobotMode,
+                              'safetymode': self.__getSafetyMode,
+                              'running': self.__getRunning,
+                              'programState': self.__getProgramState}
+
+    def SetDashboard(self, dashboard):
+        self.__dashboard = dashboard
+
+    def GetStatistics(self):
+        '''
+        Return value:
+        statistics (dict): answers from RTDE, from the TTL cache, DashBoard round trips made and saved
+        '''
+        with self.__lock:
+            queries = self.__rtdeHits + self.__cacheHits + self.__dashboardQueries
+            return {'rtde_hits': self.__rtdeHits,
+                    'cache_hits': self.__cacheHits,
+                    'dashboard_queries': self.__dashboardQueries,
+                    'round_trips_saved': self.__rtdeHits + self.__cacheHits,
+                    'hit_rate': (self.__rtdeHits + self.__cacheHits) / queries if queries else None}
+
+    def Invalidate(self, cmd=None):
+        '''
+        Drop cached DashBoard replies, e.g. after a command that changes them (load, power on, ...).
+        '''
+        with self.__lock:
+            if cmd is None:
+                self.__cache.clear()
+            else:
+                self.__cache.pop(cmd, None)
+
+    def IsFrameFresh(self):
+        lastUpdate = self.__robotModel.LastUpdateTimestamp()
+        return lastUpdate is not None and time.perf_counter() - lastUpdate <= self.__maxFrameAge
+
+    async def Query(self, cmd):
+        '''
+        Answer a DashBoard enquiry from RTDE, from the TTL cache or with a DashBoard round trip.
+
+        Input parameters:
+        cmd (str): DashBoard enquiry without the trailing newline, e.g. 'robotmode'
+
+        Return value:
+        reply (str): Reply in DashBoard wording, None if neither source can answer
+        '''
+        rtdeAnswer = self.__rtdeAnswers.get(cmd)
+        if rtdeAnswer is not None and self.IsFrameFresh():
+            reply = rtdeAnswer()
+            if reply is not None:
+                with self.__lock:
+                    self.__rtdeHits += 1
+                return reply
+
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__cache.get(cmd)
+            if entry is not None and now - entry[0] <= self.__ttl:
+                self.__cacheHits += 1
+                return entry[1]
+
+        if self.__dashboard is None or not self.__dashboard.IsConnected():
+            logging.warning('RobotStateCache: No source for ' + cmd)
+            return None
+        reply = await self.__dashboard.SendCommand(cmd)
+        with self.__lock:
+            self.__dashboardQueries += 1
+            self.__cache[cmd] = (time.monotonic(), reply)
+        return reply
+
+    async def WaitForRobotMode(self, modes, timeout=10.0, interval=0.1):
+        '''
+        Wait until robotmode is one of modes.
+
+        Return value:
+        mode (str): The last reported mode
+        '''
+        deadline = time.monotonic() + timeout
+        while True:
+            reply = await self.ur_robotmode()
+            mode = None if reply is None else reply.split(':')[-1].strip()
+            if mode in modes or time.monotonic() >= deadline:
+                return mode
+            await asyncio.sleep(interval)
+
+    async def ur_robotmode(self):
+        return await self.Query('robotmode')
+
+    async def ur_safetymode(self):
+        return await self.Query('safetymode')
+
+    async def ur_running(self):
+        return await self.Query('running')
+
+    async def ur_programState(self):
+        return await self.Query('programState')
+
+    async def ur_get_loaded_program(self):
+        return await self.Query('get loaded program')
+
+    async def ur_isProgramSaved(self):
+        return await self.Query('isProgramSaved')
+
+    async def ur_polyscopeVersion(self):
+        return await self.Query('polyscopeVersion')
+
+    def __getRobotMode(self):
+        mode = self.ROBOT_MODES.get(self.__robotModel.dataDir['robot_mode'])
+        return None if mode is None else 'Robotmode: ' + mode
+
+    def __getSafetyMode(self):
+        mode = self.SAFETY_MODES.get(self.__robotModel.dataDir['safety_mode'])
+        return None if mode is None else 'Safetymode: ' + mode
+
+    def __getRunning(self):
+        robotStatusBits = self.__robotModel.dataDir['robot_status_bits']
+        if robotStatusBits is None:
+            return None
+        return 'Program running: ' + ('true' if robotStatusBits & 2 == 2 else 'false')
+
+    def __getProgramState(self):
+        return self.PROGRAM_STATES.get(self.__robotModel.dataDir['runtime_state'])
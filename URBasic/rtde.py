@@ -471,6 +471,7 @@ class RTDE(threading.Thread): #, metaclass=Singleton
                 self._logger.error("Lost some RTDE at " + str(rtde_data_package['timestamp']) + " - " + str(delta*1000) + " milliseconds since last package")
         for tagname in rtde_data_package.keys():
             self.__robotModel.dataDir[tagname] = rtde_data_package[tagname]
+        self.__robotModel.NotifyNewData()
 
     def __verifyControllerVersion(self, data):
         self.__controllerVersion = data
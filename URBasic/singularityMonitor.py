@@ -0,0 +1,198 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import threading
+import time
+import numpy as np
+from URBasic.kinematicGenerator import GetKinematicFunctions
+
+
+def SingularityMeasuresArray(J_array):
+    '''
+    Manipulability and condition number of N Jacobians from their singular values.
+
+    Input parameters:
+    J_array (N x 6 x 6 array): Geometric Jacobians, e.g. from URBasic.kinematic.Jacobian_GeneratedArray
+
+    Return value:
+    manipulability (N array): Yoshikawa manipulability sqrt(det(J J^T)), the product of the singular values
+    condition (N array): Ratio of the largest to the smallest singular value, inf at a singularity
+    '''
+    singular_value_array = np.linalg.svd(J_array, compute_uv=False)
+    manipulability_array = np.prod(singular_value_array, axis=-1)
+    sigma_min_array = singular_value_array[..., -1]
+    condition_array = np.divide(singular_value_array[..., 0], sigma_min_array,
+                                out=np.full_like(sigma_min_array, np.inf), where=sigma_min_array > 0)
+    return manipulability_array, condition_array
+
+
+class SingularityMonitor(object):
+    '''
+    Watches the distance of the arm to a singular configuration (wrist, elbow or shoulder singularity).
+
+    Update evaluates the Jacobian of one joint vector with the generated functions of URBasic.kinematicGenerator
+    and compares its manipulability and condition number with the thresholds. A configuration is near singular
+    when the manipulability drops below manipulability_threshold or the condition number exceeds
+    condition_threshold. It is left again only when both measures are back past the thresholds by the hysteresis
+    factor, so a robot hovering at a threshold does not emit an event per frame. Event listeners are called with
+    an event dict on every enter and leave.
+
+    Attach registers the monitor as frame listener of a RobotModel, so actual_q is checked on every RTDE frame
+    from the RTDE thread. CheckArray runs the same check on planned waypoints in one batch.
+
+    Input parameters:
+    rob (str): Robot of URBasic.robotRegistry
+    manipulability_threshold (float): Manipulability under which a configuration is near singular
+    condition_threshold (float): Condition number over which a configuration is near singular
+    hysteresis (float): Relative margin past the thresholds needed to leave the near singular state
+
+    Example:
+    singularityMonitor = URBasic.singularityMonitor.SingularityMonitor(rob='ur10')
+    singularityMonitor.AddEventListener(lambda event: print(event))
+    singularityMonitor.Attach(robotModel)
+    '''
+
+    def __init__(self, rob='ur10', manipulability_threshold=0.01, condition_threshold=200.0, hysteresis=0.2):
+        self.__kinematicFunctions = GetKinematicFunctions(rob)
+        self.__manipulabilityThreshold = manipulability_threshold
+        self.__conditionThreshold = condition_threshold
+        self.__hysteresis = hysteresis
+        self.__lock = threading.Lock()
+        self.__eventListeners = []
+        self.__robotModel = None
+        self.__isNearSingular = False
+        self.__lastMeasures = None
+        self.__statistics = {}
+        self.ResetStatistics()
+
+    def AddEventListener(self, listener):
+        '''
+        Register a function that is called with the event dict when the near singular state changes.
+        Listeners run on the thread calling Update, the RTDE thread when attached to a RobotModel.
+        '''
+        self.__eventListeners = self.__eventListeners + [listener]
+
+    def RemoveEventListener(self, listener):
+        self.__eventListeners = [item for item in self.__eventListeners if item != listener]
+
+    def Attach(self, robotModel):
+        '''
+        Check actual_q of every new RTDE frame of robotModel.
+        '''
+        self.Detach()
+        self.__robotModel = robotModel
+        robotModel.AddFrameListener(self.__onFrame)
+
+    def Detach(self):
+        if self.__robotModel is not None:
+            self.__robotModel.RemoveFrameListener(self.__onFrame)
+            self.__robotModel = None
+
+    def IsNearSingular(self):
+        return self.__isNearSingular
+
+    def GetLastMeasures(self):
+        '''
+        Return value:
+        measures (dict): Manipulability and condition number of the last update, None before the first one
+        '''
+        return self.__lastMeasures
+
+    def GetStatistics(self):
+        '''
+        Return value:
+        statistics (dict): Frames checked, events emitted, frames spent near singular, the lowest manipulability,
+                           the highest condition number and the mean and maximum evaluation time [s]
+        '''
+        with self.__lock:
+            statistics = dict(self.__statistics)
+        statistics['mean_evaluation_time'] = statistics['evaluation_time'] / statistics['frames'] \
+            if statistics['frames'] else None
+        return statistics
+
+    def ResetStatistics(self):
+        with self.__lock:
+            self.__statistics = {'frames': 0, 'events': 0, 'near_singular_frames': 0, 'min_manipulability': None,
+                                 'max_condition': None, 'evaluation_time': 0.0, 'max_evaluation_time': 0.0}
+
+    def EvaluateArray(self, joint_array):
+        '''
+        Input parameters:
+        joint_array (N x 6 array): Joint vectors
+
+        Return value:
+        manipulability (N array), condition (N array): See SingularityMeasuresArray
+        '''
+        return SingularityMeasuresArray(self.__kinematicFunctions.Jacobian(joint_array))
+
+    def CheckArray(self, joint_array):
+        '''
+        Batch check of planned waypoints, without hysteresis and without events.
+
+        Input parameters:
+        joint_array (N x 6 array): Joint vectors
+
+        Return value:
+        near singular (N bool array): True for waypoints past one of the thresholds
+        '''
+        manipulability_array, condition_array = self.EvaluateArray(joint_array)
+        return (manipulability_array < self.__manipulabilityThreshold) \
+            | (condition_array > self.__conditionThreshold)
+
+    def Update(self, joints, timestamp=None):
+        '''
+        Check one joint vector, e.g. actual_q of an RTDE frame, and emit an event when the state changes.
+
+        Input parameters:
+        joints (6 list): Joint vector
+        timestamp (float): Timestamp of the frame, passed on in the event
+
+        Return value:
+        near singular (bool): State after this update
+        '''
+        startTime = time.perf_counter()
+        manipulability, condition = SingularityMeasuresArray(self.__kinematicFunctions.JacobianSingle(joints))
+        manipulability = float(manipulability)
+        condition = float(condition)
+        if self.__isNearSingular:
+            isNearSingular = manipulability < self.__manipulabilityThreshold * (1 + self.__hysteresis) \
+                or condition > self.__conditionThreshold / (1 + self.__hysteresis)
+        else:
+            isNearSingular = manipulability < self.__manipulabilityThreshold \
+                or condition > self.__conditionThreshold
+        event = None
+        if isNearSingular != self.__isNearSingular:
+            event = {'type': 'enter' if isNearSingular else 'leave',
+                     'timestamp': timestamp,
+                     'manipulability': manipulability,
+                     'condition': condition,
+                     'joints': [float(joint) for joint in np.ravel(joints)]}
+        self.__isNearSingular = isNearSingular
+        self.__lastMeasures = {'manipulability': manipulability, 'condition': condition}
+        evaluationTime = time.perf_counter() - startTime
+
+        with self.__lock:
+            statistics = self.__statistics
+            statistics['frames'] += 1
+            statistics['near_singular_frames'] += isNearSingular
+            statistics['events'] += event is not None
+            if statistics['min_manipulability'] is None or manipulability < statistics['min_manipulability']:
+                statistics['min_manipulability'] = manipulability
+            if statistics['max_condition'] is None or condition > statistics['max_condition']:
+                statistics['max_condition'] = condition
+            statistics['evaluation_time'] += evaluationTime
+            statistics['max_evaluation_time'] = max(statistics['max_evaluation_time'], evaluationTime)
+
+        if event is not None:
+            for listener in self.__eventListeners:
+                try:
+                    listener(event)
+                except Exception:
+                    logging.exception('Singularity event listener failed')
+        return isNearSingular
+
+    def __onFrame(self, robotModel):
+        joints = robotModel.ActualQ()
+        if joints is not None:
+            self.Update(joints, timestamp=robotModel.RobotTimestamp())
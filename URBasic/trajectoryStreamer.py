@@ -0,0 +1,255 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import threading
+import time
+import numpy as np
+
+
+class TrajectoryStreamerState:
+    IDLE = "IDLE"
+    STREAMING = "STREAMING"
+    COMPLETED = "COMPLETED"
+    STOPPED = "STOPPED"
+    WATCHDOG_STOPPED = "WATCHDOG_STOPPED"
+
+
+class TrajectoryStreamer(object):
+    '''
+    Streams a precomputed joint trajectory to the robot through RTDE input registers.
+
+    One resident URScript program is uploaded with the RealTimeClient. The program reads the joint
+    setpoint from input_double_register_0..5 every control cycle and follows it with servoj.
+    A dedicated timing thread writes one row of the N x 6 trajectory to the registers per period,
+    so no program is uploaded per segment.
+
+    Registers used:
+    input_double_register_0..5: joint setpoint [rad]
+    input_int_register_0:       setpoint sequence number, also watched by rtde_set_watchdog
+    input_int_register_1:       1 while streaming, 0 to leave the servo loop and stop the robot
+    output_int_register_0:      last sequence number consumed by the robot
+
+    The RTDE configuration must include these registers (rtdeConfigurationDefault.xml and
+    rtdeConfigurationShared.xml do).
+    '''
+
+    SEQUENCE_REGISTER = 'input_int_register_0'
+    COMMAND_REGISTER = 'input_int_register_1'
+    ACKNOWLEDGE_REGISTER = 'output_int_register_0'
+    SETPOINT_REGISTERS = ['input_double_register_0', 'input_double_register_1', 'input_double_register_2',
+                          'input_double_register_3', 'input_double_register_4', 'input_double_register_5']
+
+    def __init__(self, robotConnector, frequency=125, lookahead_time=0.1, gain=300, deceleration=2.0,
+                 watchdog_frequency=None, max_underruns=None, program_start_timeout=2.0):
+        '''
+        Input parameters:
+        robotConnector (RobotConnector): Connector with a running RTDE interface
+        frequency (int): Setpoint rate [Hz], 125 for CB-series and 500 for e-Series controllers
+        lookahead_time (float): servoj lookahead time [s], range 0.03-0.2
+        gain (int): servoj proportional gain, range 100-2000
+        deceleration (float): Joint deceleration used when the stream stops [rad/s^2]
+        watchdog_frequency (float): Minimum register update rate enforced on the controller [Hz],
+                                    defaults to half of frequency
+        max_underruns (int): Consecutive missed periods before the stream is stopped,
+                             defaults to 10 % of frequency
+        program_start_timeout (float): Time to wait for the resident program to start [s]
+
+        Example:
+        streamer = URBasic.trajectoryStreamer.TrajectoryStreamer(robot.robotConnector, frequency=500)
+        streamer.start(joint_trajectory)
+        streamer.wait()
+        '''
+        self.__robotConnector = robotConnector
+        self.__frequency = frequency
+        self.__period = 1.0 / frequency
+        self.__lookahead_time = lookahead_time
+        self.__gain = gain
+        self.__deceleration = deceleration
+        self.__watchdog_frequency = frequency / 2.0 if watchdog_frequency is None else watchdog_frequency
+        self.__max_underruns = max(1, int(frequency * 0.1)) if max_underruns is None else max_underruns
+        self.__program_start_timeout = program_start_timeout
+        self.__trajectory = None
+        self.__thread = None
+        self.__stop_event = threading.Event()
+        self.__state = TrajectoryStreamerState.IDLE
+        self.__sent_setpoints = 0
+        self.__underruns = 0
+        self.__max_lateness = 0.0
+
+    def GetState(self):
+        return self.__state
+
+    def GetStatistics(self):
+        '''
+        Return value:
+        statistics (dict): sent setpoints, total underruns, worst lateness [s] and robot acknowledge lag
+        '''
+        return {'state': self.__state,
+                'frequency': self.__frequency,
+                'setpoints': 0 if self.__trajectory is None else len(self.__trajectory),
+                'sent_setpoints': self.__sent_setpoints,
+                'underruns': self.__underruns,
+                'max_lateness': self.__max_lateness,
+                'acknowledge_lag': self.__getAcknowledgeLag()}
+
+    def IsStreaming(self):
+        return self.__state == TrajectoryStreamerState.STREAMING
+
+    def start(self, joint_trajectory):
+        '''
+        Upload the resident servo program and start streaming the trajectory.
+
+        Input parameters:
+        joint_trajectory (N x 6 array): Joint setpoints [rad], one row per period
+
+        Return value:
+        status (boolean): True if streaming started
+        '''
+        if self.IsStreaming():
+            logging.error('TrajectoryStreamer: Already streaming')
+            return False
+        if not self.__robotConnector.RTDE.isRunning():
+            logging.error('TrajectoryStreamer: RTDE need to be running to stream a trajectory')
+            return False
+
+        joint_trajectory = np.asarray(joint_trajectory, dtype=float)
+        if joint_trajectory.ndim != 2 or joint_trajectory.shape[1] != 6 or joint_trajectory.shape[0] == 0:
+            logging.error('TrajectoryStreamer: Trajectory must be a non empty N x 6 array')
+            return False
+
+        self.__trajectory = joint_trajectory
+        self.__sent_setpoints = 0
+        self.__underruns = 0
+        self.__max_lateness = 0.0
+        self.__stop_event.clear()
+
+        self.__setSetpoint(self.__trajectory[0], sequence=0, command=1)
+        self.__robotConnector.RealTimeClient.SendProgram(self.__getProgram())
+        if not self.__waitForProgramStart():
+            logging.error('TrajectoryStreamer: Servo program did not start')
+            self.__setSetpoint(self.__trajectory[0], sequence=0, command=0)
+            return False
+
+        self.__state = TrajectoryStreamerState.STREAMING
+        self.__thread = threading.Thread(target=self.__stream, name='TrajectoryStreamer', daemon=True)
+        self.__thread.start()
+        logging.info('TrajectoryStreamer: Started setpoints={0} frequency={1}'
+                     .format(len(self.__trajectory), self.__frequency))
+        return True
+
+    def stop(self):
+        '''
+        Stop streaming; the resident program leaves the servo loop and decelerates the robot.
+        '''
+        self.__stop_event.set()
+        self.wait()
+        if self.__state == TrajectoryStreamerState.STREAMING:
+            self.__state = TrajectoryStreamerState.STOPPED
+
+    def wait(self, timeout=None):
+        '''
+        Block until the streaming thread has finished.
+
+        Return value:
+        finished (boolean): False if the timeout expired first
+        '''
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            return not self.__thread.is_alive()
+        return True
+
+    def __getProgram(self):
+        prg = '''def trajectory_streamer():
+    rtde_set_watchdog("{sequence_register}", {watchdog_frequency}, "stop")
+    while read_input_integer_register(1) == 1:
+        q = [read_input_float_register(0),
+             read_input_float_register(1),
+             read_input_float_register(2),
+             read_input_float_register(3),
+             read_input_float_register(4),
+             read_input_float_register(5)]
+        servoj(q, 0, 0, {period}, {lookahead_time}, {gain})
+        write_output_integer_register(0, read_input_integer_register(0))
+    end
+    stopj({deceleration})
+end
+'''
+        return prg.format(sequence_register=self.SEQUENCE_REGISTER,
+                          watchdog_frequency=self.__watchdog_frequency,
+                          period=self.__period,
+                          lookahead_time=self.__lookahead_time,
+                          gain=self.__gain,
+                          deceleration=self.__deceleration)
+
+    def __setSetpoint(self, q, sequence, command):
+        rtde = self.__robotConnector.RTDE
+        for register, value in zip(self.SETPOINT_REGISTERS, q):
+            rtde.setData(register, float(value))
+        rtde.setData(self.SEQUENCE_REGISTER, sequence)
+        rtde.setData(self.COMMAND_REGISTER, command)
+        rtde.sendData()
+
+    def __waitForProgramStart(self):
+        robotModel = self.__robotConnector.RobotModel
+        t0 = time.time()
+        while time.time() - t0 < self.__program_start_timeout:
+            if robotModel.OutputBitRegister()[0]:
+                return True
+            if not robotModel.rtcProgramRunning:
+                return False
+            time.sleep(self.__period)
+        return False
+
+    def __getAcknowledgeLag(self):
+        acknowledge = self.__robotConnector.RobotModel.dataDir.get(self.ACKNOWLEDGE_REGISTER)
+        if acknowledge is None:
+            return None
+        return self.__sent_setpoints - acknowledge
+
+    def __stream(self):
+        robotModel = self.__robotConnector.RobotModel
+        consecutive_underruns = 0
+        next_deadline = time.perf_counter()
+        state = TrajectoryStreamerState.COMPLETED
+        for index in range(len(self.__trajectory)):
+            if self.__stop_event.is_set():
+                state = TrajectoryStreamerState.STOPPED
+                break
+            if robotModel.stopRunningFlag or robotModel.rtcProgramExecutionError or \
+                    robotModel.SafetyStatus().StoppedDueToSafety:
+                logging.error('TrajectoryStreamer: Robot stopped while streaming')
+                state = TrajectoryStreamerState.WATCHDOG_STOPPED
+                break
+
+            now = time.perf_counter()
+            lateness = now - next_deadline
+            if lateness > self.__period:
+                missed_periods = int(lateness / self.__period)
+                self.__underruns += missed_periods
+                consecutive_underruns += missed_periods
+                self.__max_lateness = max(self.__max_lateness, lateness)
+                next_deadline += missed_periods * self.__period
+                if consecutive_underruns >= self.__max_underruns:
+                    logging.error('TrajectoryStreamer: Watchdog stop after {0} consecutive underruns'
+                                  .format(consecutive_underruns))
+                    state = TrajectoryStreamerState.WATCHDOG_STOPPED
+                    break
+            else:
+                consecutive_underruns = 0
+
+            self.__setSetpoint(self.__trajectory[index], sequence=index + 1, command=1)
+            self.__sent_setpoints = index + 1
+
+            next_deadline += self.__period
+            remaining = next_deadline - time.perf_counter()
+            if remaining > 0.002:
+                time.sleep(remaining - 0.001)
+            while time.perf_counter() < next_deadline:
+                pass
+
+        self.__setSetpoint(self.__trajectory[self.__sent_setpoints - 1 if self.__sent_setpoints else 0],
+                           sequence=self.__sent_setpoints, command=0)
+        self.__state = state
+        logging.info('TrajectoryStreamer: Finished state={0} sent_setpoints={1} underruns={2}'
+                     .format(state, self.__sent_setpoints, self.__underruns))
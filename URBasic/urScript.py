@@ -58,14 +58,17 @@ class UrScript(object):
     self.close_rtc()
     '''
 
-    def __init__(self, host, robotModel, hasForceTorque=False):
+    def __init__(self, host, robotModel, hasForceTorque=False, rtde_conf_filename=None, hasDataLog=True):
         '''
         Constructor see class description for more info.
         '''
         logger = URBasic.dataLogging.DataLogging()
         name = logger.AddEventLogging(__name__)
         self.__logger = logger.__dict__[name]
-        self.robotConnector = URBasic.robotConnector.RobotConnector(robotModel, host, hasForceTorque)
+        self.robotConnector = URBasic.robotConnector.RobotConnector(robotModel, host, hasForceTorque,
+                                                                    rtde_conf_filename=rtde_conf_filename,
+                                                                    hasDataLog=hasDataLog)
+        self.programBuilder = URBasic.programBuilder.ProgramBuilder()
         # time.sleep(200)
         while (self.robotConnector.RobotModel.ActualTCPPose() is None):  ## check paa om vi er startet
             logging.info("waiting for everything to be ready")
@@ -76,8 +79,7 @@ class UrScript(object):
 
     def waitRobotIdleOrStopFlag(self):
 
-        while (self.robotConnector.RobotModel.RuntimeState() and not self.robotConnector.RobotModel.StopRunningFlag()):
-            time.sleep(0.002)
+        self.robotConnector.RobotModel.WaitForProgramIdle()
 
         if self.robotConnector.RobotModel.rtcProgramExecutionError:
             raise RuntimeError('Robot program execution error!!!')
@@ -103,15 +105,10 @@ class UrScript(object):
         wait: function return when movement is finished
         pose: target pose
         '''
-        prg = '''def move_j():
-{movestr}
-end
-'''
-        movestr = self._move(movetype='j', pose=pose, a=a, v=v, t=t, r=r, wait=wait, q=q)
-
-        programString = prg.format(**locals())
+        programString = self.programBuilder.BuildMove('j', q if pose is None else pose, a=a, v=v, t=t, r=r,
+                                                      pose=pose is not None)
 
-        self.robotConnector.RealTimeClient.SendProgram(programString)
+        self.robotConnector.RealTimeClient.SendProgram(programString, instrumented=True)
         if (wait):
             self.waitRobotIdleOrStopFlag()
 
@@ -129,15 +126,10 @@ end
         q:    joint position
         '''
 
-        prg = '''def move_l():
-{movestr}
-end
-'''
-        movestr = self._move(movetype='l', pose=pose, a=a, v=v, t=t, r=r, wait=wait, q=q)
-
-        programString = prg.format(**locals())
+        programString = self.programBuilder.BuildMove('l', q if pose is None else pose, a=a, v=v, t=t, r=r,
+                                                      pose=pose is not None)
 
-        self.robotConnector.RealTimeClient.SendProgram(programString)
+        self.robotConnector.RealTimeClient.SendProgram(programString, instrumented=True)
         # time.sleep(0.5)
         if (wait):
             self.waitRobotIdleOrStopFlag()
@@ -159,14 +151,10 @@ end
         q:    list of target joint positions  
         '''
 
-        prg = '''def move_p():
-{movestr}
-end
-'''
-        movestr = self._move(movetype='p', pose=pose, a=a, v=v, t=0, r=r, wait=wait, q=q)
-        programString = prg.format(**locals())
+        programString = self.programBuilder.BuildMove('p', q if pose is None else pose, a=a, v=v, t=0, r=r,
+                                                      pose=pose is not None)
 
-        self.robotConnector.RealTimeClient.SendProgram(programString)
+        self.robotConnector.RealTimeClient.SendProgram(programString, instrumented=True)
         if (wait):
             self.waitRobotIdleOrStopFlag()
 
@@ -228,7 +216,7 @@ end
             pose = q
         pose = np.array(pose)
         if movetype == 'j' or movetype == 'l':
-            tval = 't={t},'.format(**locals())
+            t_val = 't={t},'.format(**locals())
 
         if movetype == 'c':
             if pose_via is None:
@@ -251,7 +239,7 @@ end
                 if movetype == 'c':
                     pose_via_x = np.round(pose_via[idx], 4)
                     pose_via_x = pose_via_x.tolist()
-                    pose_via_val = '{prefix_via}{pose_via_x},'
+                    pose_via_val = '{prefix_via}{pose_via_x},'.format(**locals())
 
                 if (np.size(pose, 0) - 1) == idx:
                     r = 0
@@ -265,7 +253,7 @@ end
             if movetype == 'c':
                 pose_via_x = np.round(pose_via, 4)
                 pose_via_x = pose_via_x.tolist()
-                pose_via_val = '{prefix_via}{pose_via_x},'
+                pose_via_val = '{prefix_via}{pose_via_x},'.format(**locals())
             movestr += '    move{movetype}({pose_via_val} {prefix}{posex}, a={a}, v={v}, {t_val} r={r})\n'.format(
                 **locals())
 
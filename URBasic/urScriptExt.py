@@ -59,10 +59,11 @@ class UrScriptExt(URBasic.urScript.UrScript):
     '''
 
 
-    def __init__(self, host, robotModel, hasForceTorque=False):
+    def __init__(self, host, robotModel, hasForceTorque=False, rtde_conf_filename=None, hasDataLog=True):
         if host is None: #Only for enable code completion
             return
-        super(UrScriptExt, self).__init__(host, robotModel, hasForceTorque)        
+        super(UrScriptExt, self).__init__(host, robotModel, hasForceTorque, rtde_conf_filename=rtde_conf_filename,
+                                          hasDataLog=hasDataLog)        
         logger = URBasic.dataLogging.DataLogging()
         name = logger.AddEventLogging(__name__)
         self.__logger = logger.__dict__[name]
@@ -363,6 +364,32 @@ end
             return False
 
 
+    def stream_trajectory(self, joint_trajectory, frequency=125, lookahead_time=0.1, gain=300, wait=True):
+        '''
+        Execute a dense joint trajectory with servoj by streaming setpoints over RTDE,
+        instead of uploading a program per segment. See "TrajectoryStreamer" for more details.
+
+        Parameters:
+        joint_trajectory (N x 6 array): Joint setpoints [rad], one row per period
+        frequency (int): Setpoint rate [Hz], 125 for CB-series and 500 for e-Series controllers
+        lookahead_time (float): servoj lookahead time [s], range 0.03-0.2
+        gain (int): servoj proportional gain, range 100-2000
+        wait (bool): function return when the trajectory is finished
+
+        Return Value:
+        streamer (TrajectoryStreamer): The streamer, None if streaming could not start
+        '''
+        streamer = URBasic.trajectoryStreamer.TrajectoryStreamer(self.robotConnector,
+                                                                 frequency=frequency,
+                                                                 lookahead_time=lookahead_time,
+                                                                 gain=gain)
+        if not streamer.start(joint_trajectory):
+            return None
+        if wait:
+            streamer.wait()
+            self.waitRobotIdleOrStopFlag()
+        return streamer
+
     def move_force_2stop(self,  start_tolerance=0.01,
                                 stop_tolerance=0.01,
                                 wrench_gain=[1.0, 1.0, 1.0,  1.0, 1.0, 1.0],
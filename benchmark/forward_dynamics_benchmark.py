@@ -0,0 +1,91 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import time
+import numpy as np
+from URBasic.dynamics import DynamicsModel, UR5_GLIST, UR5_M_RELS, UR5_SLIST
+from URBasic.dynamicsSimulator import DynamicsSimulator, DynamicsSimulatorMethod
+from URBasic.manipulation import ForwardDynamics, ForwardDynamicsTrajectory
+
+# python -m benchmark.forward_dynamics_benchmark --count 1000 --delt 0.008 --legacy_steps 20
+
+WAYPOINT_ARRAY = [[0, -1.57, 1.57, -1.57, -1.57, 0],
+                  [1.0, -1.0, 1.0, -1.0, -1.2, 0.5],
+                  [-0.5, -2.0, 2.0, -1.8, -1.57, -1.0],
+                  [0, -1.57, 1.57, -1.57, -1.57, 0]]
+
+
+def measure(function):
+    start_perf_counter = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start_perf_counter, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure forward dynamics and an offline MoveJ simulation.")
+    parser.add_argument("--count", type=int, default=1000, help="Joint states of the batched forward dynamics.")
+    parser.add_argument("--delt", type=float, default=0.008, help="Control period of the simulation [s].")
+    parser.add_argument("--legacy_steps", type=int, default=20, help="Steps run with ForwardDynamicsTrajectory.")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="Local error of the adaptive RK4 step.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random joint states.")
+    args = parser.parse_args()
+
+    random_generator = np.random.default_rng(args.seed)
+    g = [0, 0, -9.81]
+    thetas = random_generator.uniform(-np.pi, np.pi, (args.count, 6))
+    thetadots = random_generator.uniform(-1, 1, (args.count, 6))
+    taus = random_generator.uniform(-10, 10, (args.count, 6))
+    dynamicsModel = DynamicsModel(UR5_M_RELS, UR5_GLIST, UR5_SLIST)
+
+    # composite rigid body mass matrix against n inverse dynamics passes with unit accelerations
+    M = dynamicsModel.MassMatrix(thetas)
+    M_rnea = np.stack([dynamicsModel.InverseDynamics(thetas, 0, unit_thetadotdots, [0, 0, 0])
+                       for unit_thetadotdots in np.identity(6)], axis=-1)
+    print("mass matrix max deviation from RNEA columns: {deviation:.2e}".format(deviation=np.max(np.abs(M - M_rnea))))
+    print()
+
+    print("{name:<24}{n:>8}{per_state:>16}".format(name="forward_dynamics", n="N", per_state="per_state[us]"))
+    legacy_count = min(args.count, 50)
+    elapsed_time, _ = measure(lambda: [ForwardDynamics(theta, thetadot, tau, g, [0] * 6, UR5_M_RELS, UR5_GLIST,
+                                                       UR5_SLIST)
+                                       for theta, thetadot, tau in zip(thetas[:legacy_count], thetadots, taus)])
+    print("{name:<24}{n:>8}{per_state:>16.1f}".format(name="legacy", n=legacy_count,
+                                                      per_state=elapsed_time / legacy_count * 1e6))
+    elapsed_time, _ = measure(lambda: [dynamicsModel.ForwardDynamics(theta, thetadot, tau, g)
+                                       for theta, thetadot, tau in zip(thetas, thetadots, taus)])
+    print("{name:<24}{n:>8}{per_state:>16.1f}".format(name="single", n=args.count,
+                                                      per_state=elapsed_time / args.count * 1e6))
+    elapsed_time, _ = measure(lambda: dynamicsModel.ForwardDynamics(thetas, thetadots, taus, g))
+    print("{name:<24}{n:>8}{per_state:>16.1f}".format(name="batched", n=args.count,
+                                                      per_state=elapsed_time / args.count * 1e6))
+    print()
+
+    simulator = DynamicsSimulator(dynamicsModel, g)
+    print("{name:<24}{simulated:>14}{wall:>10}{real_time:>12}{evaluations:>13}{tracking:>16}"
+          .format(name="movej_simulation", simulated="simulated[s]", wall="wall[s]", real_time="real_time",
+                  evaluations="evaluations", tracking="max_error[rad]"))
+    for name, method, substeps, tolerance in [("semi_implicit", DynamicsSimulatorMethod.SEMI_IMPLICIT, 1, None),
+                                              ("semi_implicit x4", DynamicsSimulatorMethod.SEMI_IMPLICIT, 4, None),
+                                              ("rk4", DynamicsSimulatorMethod.RK4, 1, None),
+                                              ("rk4 adaptive", DynamicsSimulatorMethod.RK4, 1, args.tolerance)]:
+        simulator.ResetStatistics()
+        elapsed_time, (times, thetas_sim, _, _, thetas_d) = measure(lambda: simulator.SimulateMoveJ(
+            WAYPOINT_ARRAY, delt=args.delt, method=method, substeps=substeps, tolerance=tolerance))
+        print("{name:<24}{simulated:>14.3f}{wall:>10.3f}{real_time:>11.1f}x{evaluations:>13}{tracking:>16.2e}"
+              .format(name=name, simulated=times[-1], wall=elapsed_time, real_time=times[-1] / elapsed_time,
+                      evaluations=simulator.GetStatistics()["evaluations"],
+                      tracking=np.max(np.abs(thetas_sim - thetas_d))))
+
+    # open loop Euler integration of manipulation.ForwardDynamicsTrajectory, too slow for the whole program
+    steps = args.legacy_steps
+    tau_hist = dynamicsModel.InverseDynamics(np.repeat([WAYPOINT_ARRAY[0]], steps, axis=0), 0, 0, g)
+    elapsed_time, _ = measure(lambda: ForwardDynamicsTrajectory(WAYPOINT_ARRAY[0], [0] * 6, tau_hist, args.delt, g,
+                                                                [[0] * 6] * steps, UR5_M_RELS, UR5_GLIST, UR5_SLIST))
+    print("{name:<24}{simulated:>14.3f}{wall:>10.3f}{real_time:>11.1f}x{evaluations:>13}{tracking:>16}"
+          .format(name="legacy euler", simulated=steps * args.delt, wall=elapsed_time,
+                  real_time=steps * args.delt / elapsed_time, evaluations=steps, tracking="-"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import time
+import numpy as np
+from URBasic.kinematic import Forwardkin_manip, Forwardkin_manipArray, Pose2Tran_Mat, Pose2Tran_MatArray, \
+    Tran_Mat2Pose, Tran_Mat2PoseArray, TransMatrix_DH_Numerical, TransMatrix_DH_NumericalArray
+
+# python -m benchmark.forward_kinematics_benchmark --robot ur10 --legacy_max 10000
+
+
+def measure(function, *args):
+    start_perf_counter = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_perf_counter
+
+
+def loop(function, array, **kwargs):
+    return np.array([np.asarray(function(row, **kwargs), dtype=float) for row in array])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare scalar and batched forward kinematics.")
+    parser.add_argument("--robot", type=str, default="ur10", help="ur5 or ur10.")
+    parser.add_argument("--legacy_max", type=int, default=10000, help="Largest N run with the scalar version.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random joint configurations.")
+    args = parser.parse_args()
+
+    random_generator = np.random.default_rng(args.seed)
+    print("{name:<16}{n:>10}{scalar:>14}{batched:>14}{speedup:>10}{max_error:>12}"
+          .format(name="function", n="N", scalar="scalar[s]", batched="batched[s]",
+                  speedup="speedup", max_error="max_error"))
+    for n in [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]:
+        joint_array = random_generator.uniform(-np.pi, np.pi, (n, 6))
+        transformation_array, _ = measure(TransMatrix_DH_NumericalArray, args.robot, joint_array)
+        pose_array = Tran_Mat2PoseArray(transformation_array)
+        functions = [
+            ("dh_transform", lambda array: loop(lambda row: TransMatrix_DH_Numerical(args.robot, list(row)), array),
+             lambda array: TransMatrix_DH_NumericalArray(args.robot, array), joint_array),
+            ("screw_pose", lambda array: loop(Forwardkin_manip, array, rob=args.robot),
+             lambda array: Forwardkin_manipArray(array, args.robot), joint_array),
+            ("pose2tran_mat", lambda array: loop(Pose2Tran_Mat, array), Pose2Tran_MatArray, pose_array),
+            ("tran_mat2pose", lambda array: loop(Tran_Mat2Pose, array), Tran_Mat2PoseArray, transformation_array)]
+        for name, scalar_function, batched_function, array in functions:
+            batched_result, batched_time = measure(batched_function, array)
+            if n <= args.legacy_max:
+                scalar_result, scalar_time = measure(scalar_function, array)
+                max_error = np.nanmax(np.abs(scalar_result - batched_result.reshape(scalar_result.shape)))
+                print("{name:<16}{n:>10}{scalar:>14.4f}{batched:>14.4f}{speedup:>10.1f}{max_error:>12.2e}"
+                      .format(name=name, n=n, scalar=scalar_time, batched=batched_time,
+                              speedup=scalar_time / batched_time, max_error=max_error))
+            else:
+                print("{name:<16}{n:>10}{scalar:>14}{batched:>14.4f}{speedup:>10}{max_error:>12}"
+                      .format(name=name, n=n, scalar="skipped", batched=batched_time, speedup="-", max_error="-"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import logging
+import time
+import numpy as np
+from URBasic.ikCache import IkCache
+from URBasic.kinematic import Forwardkin_manipArray, Pose2Tran_Mat, Robot_parameter_screw_axes
+from URBasic.manipulation import IKinFixed
+
+# python -m benchmark.ik_cache_benchmark --robot ur10 --requests 2000 --grid 6 6 3 --pitch 0.05 --noise 0.002
+
+HOME_JOINT_ARRAY = [0, -1.57, 1.57, -1.57, -1.57, 0]
+
+
+def get_request_array(robot, grid, pitch, noise, count, random_generator):
+    # pallet grid around the TCP position of a pick configuration, same orientation for every pick point
+    pick_pose = Forwardkin_manipArray([[0.3, -1.2, 1.6, -1.97, -1.57, 0.3]], robot)[0]
+    index_array = np.stack(np.meshgrid(*[np.arange(size) for size in grid], indexing='ij'), axis=-1).reshape(-1, 3)
+    grid_pose_array = np.tile(pick_pose, (len(index_array), 1))
+    grid_pose_array[:, :3] += (index_array - (np.array(grid) - 1) / 2) * pitch
+    request_array = grid_pose_array[random_generator.integers(len(grid_pose_array), size=count)]
+    # half of the requests are near-repeats, e.g. a vision offset on the pick point
+    is_noisy = random_generator.random(count) < 0.5
+    request_array[is_noisy, :3] += random_generator.normal(0, noise, (np.sum(is_noisy), 3))
+    return request_array
+
+
+def measure(function):
+    start_perf_counter = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start_perf_counter, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold IKinFixed solves with the IK warm-start cache.")
+    parser.add_argument("--robot", type=str, default="ur10", help="Robot type.")
+    parser.add_argument("--requests", type=int, default=2000, help="Number of IK requests.")
+    parser.add_argument("--grid", type=int, nargs=3, default=[6, 6, 3], help="Pallet grid size in x, y and z.")
+    parser.add_argument("--pitch", type=float, default=0.05, help="Pallet grid pitch [m].")
+    parser.add_argument("--noise", type=float, default=0.002, help="Position noise of near-repeated requests [m].")
+    parser.add_argument("--max_size", type=int, default=10000, help="Maximum number of cached solutions.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the request sequence.")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    random_generator = np.random.default_rng(args.seed)
+    request_array = get_request_array(args.robot, args.grid, args.pitch, args.noise, args.requests, random_generator)
+    M, Slist = Robot_parameter_screw_axes(args.robot)
+
+    def solve_cold():
+        iteration_array = []
+        for request in request_array:
+            iteration_array.append(len(IKinFixed(Slist, M, Pose2Tran_Mat(pose=request), HOME_JOINT_ARRAY,
+                                                 0.001, 0.0001)) - 1)
+        return iteration_array
+
+    ik_cache = IkCache(rob=args.robot, max_size=args.max_size)
+
+    def solve_cached():
+        return [ik_cache.Solve(request, init_joint_pos=HOME_JOINT_ARRAY) for request in request_array]
+
+    cold_time, iteration_array = measure(solve_cold)
+    cached_time, solution_array = measure(solve_cached)
+    statistics = ik_cache.GetStatistics()
+
+    print("{name:<10}{n:>8}{per_request:>18}{iterations:>14}{solved:>10}"
+          .format(name="solver", n="N", per_request="per_request[ms]", iterations="iterations", solved="solved"))
+    print("{name:<10}{n:>8}{per_request:>18.3f}{iterations:>14.2f}{solved:>10}"
+          .format(name="cold", n=args.requests, per_request=cold_time / args.requests * 1e3,
+                  iterations=np.mean(iteration_array), solved="-"))
+    iterations = statistics["seeded_iterations"] + statistics["cold_iterations"]
+    print("{name:<10}{n:>8}{per_request:>18.3f}{iterations:>14.2f}{solved:>10.3f}"
+          .format(name="ik_cache", n=args.requests, per_request=cached_time / args.requests * 1e3,
+                  iterations=iterations / args.requests,
+                  solved=np.mean([solution is not None for solution in solution_array])))
+    print()
+    print("speedup={speedup:.1f}x hit_rate={hit_rate:.3f} seed_rate={seed_rate:.3f} size={size} "
+          "iterations_saved={iterations_saved:.0f} measured_saved={measured_saved}"
+          .format(speedup=cold_time / cached_time, hit_rate=statistics["hit_rate"],
+                  seed_rate=statistics["seed_rate"], size=statistics["size"],
+                  iterations_saved=statistics["iterations_saved"] or 0,
+                  measured_saved=int(np.sum(iteration_array)) - iterations))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import json
+import subprocess
+import sys
+
+# python -m benchmark.import_startup_benchmark --repeat 5
+
+HEAVY_MODULE_ARRAY = ["sympy", "scipy", "ikpy"]
+
+# kinematic.py imported these at module load before they were moved into the functions using them
+EAGER_IMPORT_ARRAY = ["sympy", "scipy.linalg", "ikpy"]
+
+MEASURE_SCRIPT = """
+import importlib, json, sys, time
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def get_rss():
+    try:
+        with open('/proc/self/status') as status_file:
+            for line in status_file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return None
+
+module_array = json.loads(sys.argv[1])
+start_rss = get_rss()
+start_perf_counter = time.perf_counter()
+for module in module_array:
+    importlib.import_module(module)
+elapsed_time = time.perf_counter() - start_perf_counter
+end_rss = get_rss()
+print(json.dumps({
+    "import_time": elapsed_time,
+    "rss": end_rss,
+    "rss_delta": None if start_rss is None or end_rss is None else end_rss - start_rss,
+    "heavy_modules": [module for module in json.loads(sys.argv[2]) if module in sys.modules]
+}))
+"""
+
+
+def measure(module_array, repeat):
+    result_array = []
+    for _ in range(repeat):
+        completed_process = subprocess.run([sys.executable, "-c", MEASURE_SCRIPT, json.dumps(module_array),
+                                            json.dumps(HEAVY_MODULE_ARRAY)],
+                                           capture_output=True, text=True)
+        if completed_process.returncode != 0:
+            return None, completed_process.stderr.strip().splitlines()[-1]
+        result_array.append(json.loads(completed_process.stdout))
+    result_array.sort(key=lambda result: result["import_time"])
+    return result_array[len(result_array) // 2], None
+
+
+def format_size(size):
+    return "-" if size is None else "{size:.1f}".format(size=size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and RSS of the URBasic entry points.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per entry point (median).")
+    args = parser.parse_args()
+
+    entry_point_array = [
+        ("URBasic", ["URBasic"]),
+        ("URBasic.kinematic", ["URBasic.kinematic"]),
+        ("cobot_motion_validator", ["cloud.control_task.cobot_motion_validator"])]
+
+    print("{name:<28}{mode:>8}{import_time:>14}{rss:>10}{rss_delta:>12}  {heavy_modules}"
+          .format(name="entry_point", mode="mode", import_time="import[ms]", rss="rss[MB]",
+                  rss_delta="delta[MB]", heavy_modules="heavy_modules"))
+    for name, module_array in entry_point_array:
+        for mode, measured_module_array in [("lazy", module_array), ("eager", module_array + EAGER_IMPORT_ARRAY)]:
+            result, error = measure(measured_module_array, args.repeat)
+            if result is None:
+                print("{name:<28}{mode:>8}  failed: {error}".format(name=name, mode=mode, error=error))
+                continue
+            print("{name:<28}{mode:>8}{import_time:>14.1f}{rss:>10}{rss_delta:>12}  {heavy_modules}"
+                  .format(name=name, mode=mode, import_time=result["import_time"] * 1000,
+                          rss=format_size(result["rss"]), rss_delta=format_size(result["rss_delta"]),
+                          heavy_modules=",".join(result["heavy_modules"]) or "-"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import time
+import numpy as np
+from URBasic.dynamics import DynamicsModel, UR5_GLIST, UR5_M_RELS, UR5_SLIST
+from URBasic.manipulation import InverseDynamicsTrajectory
+
+# python -m benchmark.inverse_dynamics_benchmark --steps 10 100 1000 10000 --legacy_steps 1000
+
+
+def measure(function, repeat):
+    elapsed_time_array = []
+    for _ in range(repeat):
+        start_perf_counter = time.perf_counter()
+        result = function()
+        elapsed_time_array.append(time.perf_counter() - start_perf_counter)
+    return min(elapsed_time_array), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the looped and the batched inverse dynamics of a trajectory.")
+    parser.add_argument("--steps", type=int, nargs='*', default=[10, 100, 1000, 10000], help="Trajectory lengths T.")
+    parser.add_argument("--legacy_steps", type=int, default=1000, help="Longest T run with the per-step loops.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement (minimum).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random trajectories.")
+    args = parser.parse_args()
+
+    random_generator = np.random.default_rng(args.seed)
+    g = [0, 0, -9.81]
+    Ftip = [0.5, -0.2, 0.1, 5.0, -2.0, 10.0]
+    dynamicsModel = DynamicsModel(UR5_M_RELS, UR5_GLIST, UR5_SLIST)
+
+    print("{steps:>8}{legacy:>14}{looped:>14}{batched:>14}{speedup:>10}{max_deviation:>16}"
+          .format(steps="T", legacy="legacy[ms]", looped="looped[ms]", batched="batched[ms]", speedup="speedup",
+                  max_deviation="max_dev[Nm]"))
+    for steps in args.steps:
+        thetas = random_generator.uniform(-np.pi, np.pi, (steps, 6))
+        thetadots = random_generator.uniform(-1, 1, (steps, 6))
+        thetadotdots = random_generator.uniform(-2, 2, (steps, 6))
+
+        batched_time, taus = measure(
+            lambda: dynamicsModel.InverseDynamics(thetas, thetadots, thetadotdots, g, Ftip), args.repeat)
+        legacy_time = looped_time = None
+        max_deviation = None
+        if steps <= args.legacy_steps:
+            # manipulation.InverseDynamics does not propagate wrenches between links, so only its time is comparable
+            legacy_time, _ = measure(lambda: InverseDynamicsTrajectory(
+                thetas, thetadots, thetadotdots, [Ftip] * steps, g, UR5_M_RELS, UR5_GLIST, UR5_SLIST), args.repeat)
+            looped_time, looped_taus = measure(lambda: np.array([
+                dynamicsModel.InverseDynamics(theta, thetadot, thetadotdot, g, Ftip)[0]
+                for theta, thetadot, thetadotdot in zip(thetas, thetadots, thetadotdots)]), args.repeat)
+            max_deviation = np.max(np.abs(looped_taus - taus))
+        print("{steps:>8}{legacy:>14}{looped:>14}{batched:>14.3f}{speedup:>10}{max_deviation:>16}"
+              .format(steps=steps,
+                      legacy="-" if legacy_time is None else "{0:.3f}".format(legacy_time * 1000),
+                      looped="-" if looped_time is None else "{0:.3f}".format(looped_time * 1000),
+                      batched=batched_time * 1000,
+                      speedup="-" if legacy_time is None else "{0:.1f}x".format(legacy_time / batched_time),
+                      max_deviation="-" if max_deviation is None else "{0:.2e}".format(max_deviation)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import logging
+import time
+import numpy as np
+from URBasic.kinematic import Forward_kinArray, Forwardkin_manipArray, Inverse_kin_analyticArray, \
+    Inverse_kin_nearestArray, Invkine_manip, Pose2Tran_MatArray, Robot_parameter_screw_axes, \
+    TransMatrix_DH_NumericalArray
+from URBasic.manipulation import FKinFixedArray, IKinFixed
+
+# python -m benchmark.inverse_kinematics_benchmark --robot ur10 --count 100000 --numeric_count 200
+
+
+def get_residual_array(transformation_array, target_array):
+    position_error_array = np.linalg.norm(transformation_array[:, :3, 3] - target_array[:, :3, 3], axis=1)
+    rotation_error_array = np.linalg.norm(transformation_array[:, :3, :3] - target_array[:, :3, :3], axis=(1, 2))
+    return position_error_array, rotation_error_array
+
+
+def print_row(name, count, elapsed_time, position_error_array, rotation_error_array, solution_array, joint_array,
+              tolerance):
+    # Invkine_manip rounds its joints to 1e-3 rad, so the tolerances are in the millimetre range
+    is_solved = (position_error_array < tolerance) & (rotation_error_array < tolerance)
+    delta_array = solution_array - joint_array
+    is_same_branch = np.all(np.abs(np.arctan2(np.sin(delta_array), np.cos(delta_array))) < tolerance, axis=1)
+    print("{name:<10}{n:>10}{per_target:>16.2f}{solved:>10.3f}{branch:>10.3f}{max_error:>14.2e}"
+          .format(name=name, n=count, per_target=elapsed_time / count * 1e6, solved=np.mean(is_solved),
+                  branch=np.mean(is_same_branch), max_error=np.nanmax(np.where(is_solved, position_error_array, 0))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the closed-form and the numeric inverse kinematics.")
+    parser.add_argument("--robot", type=str, default="ur10", help="ur5 or ur10.")
+    parser.add_argument("--count", type=int, default=100000, help="Targets solved with the closed-form solver.")
+    parser.add_argument("--numeric_count", type=int, default=200, help="Targets solved with Invkine_manip.")
+    parser.add_argument("--seed_noise", type=float, default=0.3, help="Seed distance from the true joints [rad].")
+    parser.add_argument("--tolerance", type=float, default=5e-3, help="Solved and same-branch tolerance.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random joint configurations.")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    random_generator = np.random.default_rng(args.seed)
+    joint_array = random_generator.uniform(-np.pi, np.pi, (args.count, 6))
+    init_joint_array = joint_array + random_generator.uniform(-args.seed_noise, args.seed_noise, joint_array.shape)
+
+    print("{name:<10}{n:>10}{per_target:>16}{solved:>10}{branch:>10}{max_error:>14}"
+          .format(name="solver", n="N", per_target="per_target[us]", solved="solved",
+                  branch="branch", max_error="max_error[m]"))
+
+    pose_array = Forward_kinArray(joint_array, args.robot)
+    target_array = Pose2Tran_MatArray(pose_array)
+    start_perf_counter = time.perf_counter()
+    Inverse_kin_analyticArray(pose_array, args.robot)
+    elapsed_time = time.perf_counter() - start_perf_counter
+    print("{name:<10}{n:>10}{per_target:>16.2f}{solved:>10}{branch:>10}{max_error:>14}"
+          .format(name="all_eight", n=args.count, per_target=elapsed_time / args.count * 1e6,
+                  solved="-", branch="-", max_error="-"))
+
+    start_perf_counter = time.perf_counter()
+    solution_array = Inverse_kin_nearestArray(pose_array, init_joint_array, args.robot)
+    elapsed_time = time.perf_counter() - start_perf_counter
+    position_error_array, rotation_error_array = get_residual_array(
+        TransMatrix_DH_NumericalArray(args.robot, np.nan_to_num(solution_array)), target_array)
+    print_row("analytic", args.count, elapsed_time, position_error_array, rotation_error_array,
+              solution_array, joint_array, args.tolerance)
+
+    # the numeric solver works on the screw axis model, so its targets and residuals use that model
+    count = min(args.numeric_count, args.count)
+    M, Slist = Robot_parameter_screw_axes(args.robot)
+    pose_array = Forwardkin_manipArray(joint_array[:count], args.robot)
+    start_perf_counter = time.perf_counter()
+    solution_array = np.array([Invkine_manip(list(pose), init_joint_pos=init_joint, rob=args.robot)
+                               for pose, init_joint in zip(pose_array, init_joint_array[:count])])
+    elapsed_time = time.perf_counter() - start_perf_counter
+    position_error_array, rotation_error_array = get_residual_array(
+        FKinFixedArray(M, Slist, solution_array), Pose2Tran_MatArray(pose_array))
+    print_row("numeric", count, elapsed_time, position_error_array, rotation_error_array,
+              solution_array, joint_array[:count], args.tolerance)
+
+    # last Newton-Raphson iterate, without the iterate selection of Invkine_manip
+    start_perf_counter = time.perf_counter()
+    solution_array = np.array([IKinFixed(Slist, M, transformation, init_joint, 0.001, 0.0001)[-1]
+                               for transformation, init_joint in zip(Pose2Tran_MatArray(pose_array),
+                                                                     init_joint_array[:count])])
+    elapsed_time = time.perf_counter() - start_perf_counter
+    position_error_array, rotation_error_array = get_residual_array(
+        FKinFixedArray(M, Slist, solution_array), Pose2Tran_MatArray(pose_array))
+    print_row("newton", count, elapsed_time, position_error_array, rotation_error_array,
+              solution_array, joint_array[:count], args.tolerance)
+
+
+if __name__ == '__main__':
+    main()
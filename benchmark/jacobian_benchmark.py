@@ -0,0 +1,62 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from URBasic.kinematic import Jacobian_Numerical
+from URBasic.kinematicGenerator import ClearKinematicFunctions, GetKinematicFunctionsFromDH
+from URBasic.robotRegistry import GetRobot, GetRobotNames
+
+# python -m benchmark.jacobian_benchmark --robot ur10 --legacy_max 10000
+
+
+def measure(function, *args, **kwargs):
+    start_perf_counter = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start_perf_counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the hand-coded and the generated Jacobians.")
+    parser.add_argument("--robot", type=str, default="ur10", help="ur5 or ur10 (hand-coded Jacobians).")
+    parser.add_argument("--legacy_max", type=int, default=10000, help="Largest N run with Jacobian_Numerical.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random joint configurations.")
+    args = parser.parse_args()
+
+    print("{name:<8}{generate:>14}{cached:>14}".format(name="robot", generate="generate[s]", cached="disk[ms]"))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for rob in GetRobotNames():
+            robot = GetRobot(rob)
+            _, generate_time = measure(GetKinematicFunctionsFromDH, robot.a, robot.alpha, robot.d, cache_dir=cache_dir)
+            ClearKinematicFunctions()
+            _, cached_time = measure(GetKinematicFunctionsFromDH, robot.a, robot.alpha, robot.d, cache_dir=cache_dir)
+            print("{name:<8}{generate:>14.3f}{cached:>14.3f}".format(name=rob, generate=generate_time,
+                                                                     cached=cached_time * 1000))
+
+        robot = GetRobot(args.robot)
+        kinematic_functions = GetKinematicFunctionsFromDH(robot.a, robot.alpha, robot.d, cache_dir=cache_dir)
+
+    random_generator = np.random.default_rng(args.seed)
+    print("{n:>10}{scalar:>14}{generated:>14}{speedup:>10}{max_error:>12}"
+          .format(n="N", scalar="scalar[s]", generated="generated[s]", speedup="speedup", max_error="max_error"))
+    for n in [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]:
+        joint_array = random_generator.uniform(-np.pi, np.pi, (n, 6))
+        jacobian_array, generated_time = measure(kinematic_functions.Jacobian, joint_array)
+        if n <= args.legacy_max:
+            scalar_jacobian_array, scalar_time = measure(
+                lambda: np.array([np.asarray(Jacobian_Numerical(args.robot, list(joint))) for joint in joint_array]))
+            # Jacobian_Numerical holds one joint per row and only its linear part is derived from the DH table
+            max_error = np.max(np.abs(scalar_jacobian_array[:, :, :3] - np.transpose(jacobian_array[:, :3, :],
+                                                                                     (0, 2, 1))))
+            print("{n:>10}{scalar:>14.4f}{generated:>14.4f}{speedup:>10.1f}{max_error:>12.2e}"
+                  .format(n=n, scalar=scalar_time, generated=generated_time, speedup=scalar_time / generated_time,
+                          max_error=max_error))
+        else:
+            print("{n:>10}{scalar:>14}{generated:>14.4f}{speedup:>10}{max_error:>12}"
+                  .format(n=n, scalar="skipped", generated=generated_time, speedup="-", max_error="-"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import time
+import numpy as np
+from cloud.kinematic_twin import KinematicTwin
+from model.rtdl.rtdl_dt_model import RtdlDtModel
+from model.rtdl.rtdl_model import RtdlModel
+
+# python -m benchmark.kinematic_twin_benchmark --robot ur10 --frames 2000 --batch 100000 --rate 500
+
+HEADER_ROW = (["timestamp", "actual_main_voltage", "payload"] + ["payload_cog_" + str(i) for i in range(3)]
+              + ["actual_q_" + str(i) for i in range(6)] + ["actual_current_" + str(i) for i in range(6)]
+              + ["joint_temperatures_" + str(i) for i in range(6)] + ["tool_temperature", "tool_output_voltage"])
+
+
+def measure(function, count):
+    start_perf_counter = time.perf_counter()
+    function()
+    return (time.perf_counter() - start_perf_counter) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the kinematic twin against the RTDE ingest rate.")
+    parser.add_argument("--robot", type=str, default="ur10", help="Robot type of the kinematic twin.")
+    parser.add_argument("--frames", type=int, default=2000, help="RTDE frames converted one at a time.")
+    parser.add_argument("--batch", type=int, default=100000, help="Joint vectors of the batched call.")
+    parser.add_argument("--rate", type=float, default=500, help="RTDE frequency to compare with [Hz].")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random joint vectors.")
+    args = parser.parse_args()
+
+    random_generator = np.random.default_rng(args.seed)
+    kinematic_twin = KinematicTwin(robot_type=args.robot)
+    data_row_array = [[0.0, 48.0, 1.0, 0.0, 0.0, 0.0] + list(actual_q) + [0.0] * 12 + [30.0, 0]
+                      for actual_q in random_generator.uniform(-np.pi, np.pi, (args.frames, 6))]
+
+    def parse_frames():
+        for data_row in data_row_array:
+            RtdlDtModel.get_from_rtdl_model(RtdlModel.get_from_rows(HEADER_ROW, data_row))
+
+    def parse_and_update_frames():
+        for data_row in data_row_array:
+            kinematic_twin.update_rtdl_dt_model(
+                RtdlDtModel.get_from_rtdl_model(RtdlModel.get_from_rows(HEADER_ROW, data_row)))
+
+    actual_q_array = random_generator.uniform(-np.pi, np.pi, (args.batch, 6))
+    print("{stage:<22}{n:>10}{per_frame:>16}{max_rate:>16}{load:>10}"
+          .format(stage="stage", n="N", per_frame="per_frame[us]", max_rate="max_rate[Hz]", load="load"))
+    for stage, count, function in [("parse", args.frames, parse_frames),
+                                   ("parse+kinematic_twin", args.frames, parse_and_update_frames),
+                                   ("batched_fk", args.batch, lambda: kinematic_twin.get_position_array(actual_q_array))]:
+        per_frame = measure(function, count)
+        print("{stage:<22}{n:>10}{per_frame:>16.1f}{max_rate:>16.0f}{load:>9.1f}%"
+              .format(stage=stage, n=count, per_frame=per_frame * 1e6, max_rate=1 / per_frame,
+                      load=per_frame * args.rate * 100))
+
+
+if __name__ == '__main__':
+    main()
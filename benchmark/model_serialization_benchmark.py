@@ -0,0 +1,89 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import gc
+import time
+import tracemalloc
+from cloud.kinematic_twin import KinematicTwin
+from model.response.control.move_j_control_response_model import MoveJControlResponseModel
+from model.response.response_model import Status
+from model.rtdl.rtdl_dt_model import RtdlDtModel
+from model.rtdl.rtdl_model import RtdlModel
+
+# python -m benchmark.model_serialization_benchmark --frames 20000
+
+HEADER_ROW = ["timestamp", "actual_main_voltage", "payload", "payload_cog_0", "payload_cog_1", "payload_cog_2"] \
+    + ["{name}_{index}".format(name=name, index=index)
+       for name in ["actual_q", "actual_current", "joint_temperatures"] for index in range(6)] \
+    + ["tool_temperature", "tool_output_voltage"]
+
+
+def get_data_row(frame):
+    return [frame * 0.002 + index * 0.1 for index in range(len(HEADER_ROW))]
+
+
+def get_rtdl_dt_model(data_row):
+    return RtdlDtModel.get_from_rtdl_model(RtdlModel.get_from_rows(HEADER_ROW, data_row))
+
+
+def get_move_j_control_response_model():
+    move_j_control_response_model = MoveJControlResponseModel()
+    move_j_control_response_model.set_response(status=Status.COBOT_CLIENT_EXECUTED, log_text="move_j")
+    move_j_control_response_model.motion_id = 1
+    move_j_control_response_model.queue_length = 0
+    move_j_control_response_model.expected_duration = 1.5
+    return move_j_control_response_model
+
+
+def measure(function, count):
+    start_perf_counter = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - start_perf_counter) / count
+
+
+# bytes held by count live objects of function and the transient peak of one call
+def measure_memory(function, count):
+    gc.collect()
+    tracemalloc.start()
+    object_array = [function() for _ in range(count)]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del object_array
+    return retained / count, peak - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame cost of building and serializing the data models.")
+    parser.add_argument("--frames", type=int, default=20000, help="Number of frames per measurement.")
+    parser.add_argument("--robot", type=str, default="ur10", help="Robot of the kinematic twin.")
+    args = parser.parse_args()
+
+    data_row = get_data_row(0)
+    rtdl_dt_model = get_rtdl_dt_model(data_row)
+    kinematic_twin = KinematicTwin(robot_type=args.robot)
+    kinematic_twin.update_rtdl_dt_model(rtdl_dt_model)
+    move_j_control_response_model = get_move_j_control_response_model()
+
+    row_array = [
+        ("frame build", lambda: get_rtdl_dt_model(data_row)),
+        ("frame to_dict", rtdl_dt_model.to_dict),
+        ("frame to_bytes", rtdl_dt_model.to_bytes),
+        ("response build", get_move_j_control_response_model),
+        ("response to_json", move_j_control_response_model.to_json),
+    ]
+    print("{name:<18}{time:>10}{retained:>14}{peak:>10}".format(name="stage", time="time[us]",
+                                                                 retained="retained[B]", peak="peak[B]"))
+    for name, function in row_array:
+        retained, peak = measure_memory(function, 1000)
+        print("{name:<18}{time:>10.2f}{retained:>14.0f}{peak:>10}"
+              .format(name=name, time=measure(function, args.frames) * 1e6, retained=retained, peak=peak))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from cloud.control_task.cobot_motion_queue import CobotMotionQueue, MotionPriority, MotionState, MotionType
+from model.request.joint_position_model import JointPositionModel
+
+# python -m benchmark.motion_queue_check
+
+TIMEOUT = 5.0
+TERMINAL_STATES = [MotionState.COMPLETED, MotionState.CANCELLED, MotionState.ERROR]
+
+
+class StandInRobot:
+    # every move is tagged with its acceleration, a tag in raise_tags raises, a tag in block_tags waits for stopj
+    def __init__(self):
+        self.robotConnector = SimpleNamespace(RobotModel=None)
+        self.move_tags = []
+        self.raise_tags = {}
+        self.block_tags = set()
+        self.stop_count = 0
+        self.__stop_event = threading.Event()
+
+    def movej(self, q, a, v, t, r):
+        self.move_tags.append(a)
+        if a in self.raise_tags:
+            raise self.raise_tags[a]
+        if a in self.block_tags:
+            self.__stop_event.wait(TIMEOUT)
+
+    def stopj(self, a, wait=True):
+        self.stop_count += 1
+        self.__stop_event.set()
+
+    def get_position(self, motion_type):
+        # the pose is the number of moves sent so far
+        return [float(len(self.move_tags))] * 6
+
+
+def get_move_j_control_model(tag):
+    joint_position_model = JointPositionModel()
+    for joint in ["base", "shoulder", "elbow", "wrist1", "wrist2", "wrist3"]:
+        setattr(joint_position_model, joint, 0.0)
+    return SimpleNamespace(joint_position_model_array=[joint_position_model], acceleration=tag, velocity=1.0,
+                           time_s=0, blend_radius=0)
+
+
+def wait_for(motion_array):
+    deadline = time.monotonic() + TIMEOUT
+    while time.monotonic() < deadline:
+        if all(motion.state in TERMINAL_STATES for motion in motion_array):
+            return
+        time.sleep(0.005)
+    raise AssertionError("Timeout states={states}".format(states=[motion.state for motion in motion_array]))
+
+
+def wait_for_running(cobot_motion_queue, motion):
+    deadline = time.monotonic() + TIMEOUT
+    while cobot_motion_queue.get_running_motion() is not motion:
+        if time.monotonic() > deadline:
+            raise AssertionError("Timeout motion_id={motion_id} not running".format(motion_id=motion.motion_id))
+        time.sleep(0.005)
+
+
+def enqueue(cobot_motion_queue, tag, priority=MotionPriority.NORMAL):
+    return cobot_motion_queue.enqueue(motion_type=MotionType.MOVE_J, request_model=get_move_j_control_model(tag),
+                                      priority=priority)
+
+
+def check_priority_order(cobot_motion_queue, robot):
+    cobot_motion_queue.hold()
+    motion_array = [enqueue(cobot_motion_queue, 1, MotionPriority.LOW),
+                    enqueue(cobot_motion_queue, 2, MotionPriority.NORMAL),
+                    enqueue(cobot_motion_queue, 3, MotionPriority.HIGH),
+                    enqueue(cobot_motion_queue, 4, MotionPriority.NORMAL)]
+    cobot_motion_queue.resume()
+    wait_for(motion_array)
+    assert robot.move_tags == [3, 2, 4, 1], robot.move_tags
+    assert all(motion.state == MotionState.COMPLETED for motion in motion_array)
+
+
+def check_hold_resume(cobot_motion_queue, robot):
+    cobot_motion_queue.hold()
+    motion = enqueue(cobot_motion_queue, 1)
+    time.sleep(0.1)
+    assert motion.state == MotionState.QUEUED and robot.move_tags == [], motion.state
+    cobot_motion_queue.resume()
+    wait_for([motion])
+    assert motion.state == MotionState.COMPLETED and robot.move_tags == [1]
+
+
+def check_cancel(cobot_motion_queue, robot):
+    cobot_motion_queue.hold()
+    cancelled_motion = enqueue(cobot_motion_queue, 1)
+    motion = enqueue(cobot_motion_queue, 2)
+    assert cobot_motion_queue.cancel(cancelled_motion.motion_id) is cancelled_motion
+    assert cobot_motion_queue.cancel(cancelled_motion.motion_id) is None
+    cobot_motion_queue.resume()
+    wait_for([motion])
+    assert cancelled_motion.state == MotionState.CANCELLED and motion.state == MotionState.COMPLETED
+    assert robot.move_tags == [2], robot.move_tags
+
+
+def check_preempt(cobot_motion_queue, robot):
+    robot.block_tags.add(1)
+    running_motion = enqueue(cobot_motion_queue, 1)
+    wait_for_running(cobot_motion_queue, running_motion)
+    queued_motion_array = [enqueue(cobot_motion_queue, 2), enqueue(cobot_motion_queue, 3, MotionPriority.HIGH)]
+    cancelled_motion_array = cobot_motion_queue.preempt()
+    wait_for([running_motion] + queued_motion_array)
+    assert cancelled_motion_array[0] is running_motion and len(cancelled_motion_array) == 3
+    assert all(motion.state == MotionState.CANCELLED for motion in cancelled_motion_array)
+    assert robot.stop_count == 1 and robot.move_tags == [1], robot.move_tags
+    assert cobot_motion_queue.get_running_motion() is None and cobot_motion_queue.get_queue_length() == 0
+
+
+def check_worker_survives_exception(cobot_motion_queue, robot):
+    cobot_motion_queue.hold()
+    robot.raise_tags = {1: OSError("Connection reset"), 2: ValueError("Bad program"), 3: AttributeError("None")}
+    motion_array = [enqueue(cobot_motion_queue, tag) for tag in [1, 2, 3, 4]]
+    cobot_motion_queue.resume()
+    wait_for(motion_array)
+    assert [motion.state for motion in motion_array] == [MotionState.ERROR] * 3 + [MotionState.COMPLETED]
+    assert all(motion.end_time is not None for motion in motion_array)
+    assert cobot_motion_queue.get_running_motion() is None
+    assert robot.move_tags == [1, 2, 3, 4], robot.move_tags
+
+
+def check_start_position(cobot_motion_queue, robot):
+    cobot_motion_queue.hold()
+    motion_array = [enqueue(cobot_motion_queue, tag) for tag in [1, 2, 3]]
+    assert all(motion.start_position is None for motion in motion_array)
+    cobot_motion_queue.resume()
+    wait_for(motion_array)
+    assert [motion.start_position[0] for motion in motion_array] == [0.0, 1.0, 2.0], \
+        [motion.start_position for motion in motion_array]
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    check_array = [check_priority_order, check_hold_resume, check_cancel, check_preempt,
+                   check_worker_survives_exception, check_start_position]
+    failures = 0
+    for check in check_array:
+        robot = StandInRobot()
+        cobot_motion_queue = CobotMotionQueue()
+        cobot_motion_queue.start(robot, position_provider=robot.get_position)
+        try:
+            check(cobot_motion_queue, robot)
+            print("{name:<34}ok".format(name=check.__name__))
+        except AssertionError as assertion_error:
+            failures += 1
+            print("{name:<34}FAILED {error}".format(name=check.__name__, error=assertion_error))
+        finally:
+            cobot_motion_queue.terminate()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
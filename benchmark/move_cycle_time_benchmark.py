@@ -0,0 +1,124 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import asyncio
+import ast
+import math
+import random
+import re
+import time
+from types import SimpleNamespace
+import URBasic
+from cloud.control_task.cobot_control_task import CobotControlTask
+from model.request.joint_position_model import JointPositionModel
+
+# python -m benchmark.move_cycle_time_benchmark --waypoints 50 --blend_radius 0.05
+
+
+class StandInRealTimeClient:
+    UPLOAD_TIME = 0.1
+    PROGRAM_START_TIME = 0.05
+    MOVE_PATTERN = re.compile(r"move(?P<movetype>[jlp])\(\s*p?(?P<target>\[[^\]]*\]), a=(?P<a>[\d.]+), "
+                              r"v=(?P<v>[\d.]+), (?:t=(?P<t>[\d.]+),)? r=(?P<r>[\d.]+)\)")
+
+    def __init__(self, start_position, time_scale):
+        self.__position = list(start_position)
+        self.__time_scale = time_scale
+        self.program_count = 0
+        self.simulated_time = 0.0
+
+    def SendProgram(self, prg='', instrumented=False):
+        if isinstance(prg, bytes):
+            prg = prg.decode()
+        program_time = self.UPLOAD_TIME + self.PROGRAM_START_TIME
+        is_stopped = True
+        for match in self.MOVE_PATTERN.finditer(prg):
+            target = ast.literal_eval(match.group("target"))
+            acceleration = float(match.group("a"))
+            velocity = float(match.group("v"))
+            move_time = float(match.group("t") or 0)
+            blend_radius = float(match.group("r"))
+            if match.group("movetype") == "j":
+                distance = max(abs(target[index] - self.__position[index]) for index in range(6))
+            else:
+                distance = math.sqrt(sum((target[index] - self.__position[index]) ** 2 for index in range(3)))
+
+            if move_time > 0:
+                program_time += move_time
+            else:
+                program_time += distance / velocity
+                if is_stopped:
+                    program_time += velocity / (2 * acceleration)
+                if blend_radius == 0:
+                    program_time += velocity / (2 * acceleration)
+            is_stopped = blend_radius == 0
+            self.__position = target
+
+        self.program_count += 1
+        self.simulated_time += program_time
+        time.sleep(program_time * self.__time_scale)
+
+
+class StandInRobot(URBasic.urScript.UrScript):
+
+    def __init__(self, start_position, time_scale):
+        self.robotConnector = SimpleNamespace(
+            RealTimeClient=StandInRealTimeClient(start_position=start_position, time_scale=time_scale),
+            RobotModel=None)
+        self.programBuilder = URBasic.programBuilder.ProgramBuilder()
+
+    def waitRobotIdleOrStopFlag(self):
+        pass
+
+
+def get_move_j_control_model(waypoints, blend_radius):
+    random.seed(0)
+    joint_position_model_array = []
+    for _ in range(waypoints):
+        joint_position_model = JointPositionModel()
+        joint_position_model.base = random.uniform(-90, 90)
+        joint_position_model.shoulder = random.uniform(-120, -60)
+        joint_position_model.elbow = random.uniform(30, 120)
+        joint_position_model.wrist1 = random.uniform(-120, -60)
+        joint_position_model.wrist2 = random.uniform(-120, -60)
+        joint_position_model.wrist3 = random.uniform(-90, 90)
+        joint_position_model_array.append(joint_position_model)
+    return SimpleNamespace(joint_position_model_array=joint_position_model_array,
+                           acceleration=1.4,
+                           velocity=1.05,
+                           time_s=0,
+                           blend_radius=blend_radius)
+
+
+def run(move_j_control_model, chunk_size, time_scale):
+    robot = StandInRobot(start_position=[0.0] * 6, time_scale=time_scale)
+    cobot_control_task = CobotControlTask(robot=robot, chunk_size=chunk_size)
+    start_perf_counter = time.perf_counter()
+    asyncio.run(cobot_control_task.move_j(move_j_control_model=move_j_control_model))
+    wall_time = time.perf_counter() - start_perf_counter
+    real_time_client = robot.robotConnector.RealTimeClient
+    return real_time_client.program_count, real_time_client.simulated_time, wall_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-waypoint and blended move cycle time.")
+    parser.add_argument("--waypoints", type=int, default=50, help="Number of joint waypoints.")
+    parser.add_argument("--blend_radius", type=float, default=0.05, help="Blend radius [m].")
+    parser.add_argument("--chunk_size", type=int, default=20, help="Chunk size of the chunked run.")
+    parser.add_argument("--time_scale", type=float, default=0.01, help="Wall time per simulated second.")
+    args = parser.parse_args()
+
+    move_j_control_model = get_move_j_control_model(waypoints=args.waypoints, blend_radius=args.blend_radius)
+    print("{name:<16}{programs:>10}{cycle_time:>16}{wall_time:>12}"
+          .format(name="mode", programs="programs", cycle_time="cycle_time[s]", wall_time="wall[s]"))
+    for name, chunk_size in [("per_waypoint", 1), ("chunked", args.chunk_size), ("single_program", None)]:
+        program_count, simulated_time, wall_time = run(move_j_control_model=move_j_control_model,
+                                                       chunk_size=chunk_size,
+                                                       time_scale=args.time_scale)
+        print("{name:<16}{programs:>10}{cycle_time:>16.3f}{wall_time:>12.3f}"
+              .format(name=name, programs=program_count, cycle_time=simulated_time, wall_time=wall_time))
+
+
+if __name__ == '__main__':
+    main()
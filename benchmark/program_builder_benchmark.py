@@ -0,0 +1,58 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import time
+import numpy as np
+import URBasic
+
+# python -m benchmark.program_builder_benchmark --waypoints 20 --repeats 2000
+
+
+def build_legacy(ur_script, real_time_client, waypoints):
+    prg = '''def move_j():
+{movestr}
+end
+'''
+    movestr = ur_script._move(movetype='j', pose=None, a=1.4, v=1.05, t=0, r=0.05, wait=True, q=waypoints)
+    return real_time_client._RealTimeClient__AddStatusBit2Prog(prg.format(movestr=movestr)).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy move program generation with ProgramBuilder.")
+    parser.add_argument("--waypoints", type=int, default=20, help="Waypoints per program.")
+    parser.add_argument("--programs", type=int, default=10, help="Distinct programs in the repeated sequence.")
+    parser.add_argument("--repeats", type=int, default=2000, help="Programs generated per run.")
+    args = parser.parse_args()
+
+    ur_script = URBasic.urScript.UrScript.__new__(URBasic.urScript.UrScript)
+    real_time_client = URBasic.realTimeClient.RealTimeClient.__new__(URBasic.realTimeClient.RealTimeClient)
+    random_generator = np.random.default_rng(0)
+    sequence = [random_generator.uniform(-3, 3, (args.waypoints, 6)) for _ in range(args.programs)]
+
+    for waypoints in sequence:
+        assert build_legacy(ur_script, real_time_client, waypoints) == \
+            URBasic.programBuilder.ProgramBuilder(cache_size=0).BuildMove('j', waypoints, a=1.4, v=1.05, t=0,
+                                                                          r=0.05, pose=False)
+
+    start_perf_counter = time.perf_counter()
+    for index in range(args.repeats):
+        build_legacy(ur_script, real_time_client, sequence[index % args.programs])
+    legacy_time = time.perf_counter() - start_perf_counter
+
+    results = [("legacy", legacy_time)]
+    for name, cache_size in [("builder", 0), ("builder_cached", 256)]:
+        program_builder = URBasic.programBuilder.ProgramBuilder(cache_size=cache_size)
+        start_perf_counter = time.perf_counter()
+        for index in range(args.repeats):
+            program_builder.BuildMove('j', sequence[index % args.programs], a=1.4, v=1.05, t=0, r=0.05, pose=False)
+        results.append((name, time.perf_counter() - start_perf_counter))
+
+    print("{name:<16}{total:>12}{per_program:>18}".format(name="mode", total="total[s]", per_program="per_program[us]"))
+    for name, total_time in results:
+        print("{name:<16}{total:>12.4f}{per_program:>18.1f}"
+              .format(name=name, total=total_time, per_program=total_time / args.repeats * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import time
+import numpy as np
+from URBasic.kinematic import Jacobian_Numerical
+from URBasic.singularityMonitor import SingularityMeasuresArray, SingularityMonitor
+
+# python -m benchmark.singularity_monitor_benchmark --robot ur10 --frequency 500 --duration 10
+
+
+def get_frame_array(frequency, duration):
+    # joint trajectory that passes the wrist singularity (q5 = 0) twice, sampled at the RTDE frequency
+    time_array = np.arange(int(frequency * duration)) / frequency
+    frame_array = np.tile([0.3, -1.2, 1.6, -1.97, -1.57, 0.3], (len(time_array), 1))
+    frame_array[:, 4] = -1.57 * np.cos(2 * np.pi * time_array / duration)
+    frame_array[:, 0] += 0.2 * np.sin(2 * np.pi * time_array / duration)
+    return frame_array
+
+
+def measure(function, frame_array):
+    frame_time_array = np.empty(len(frame_array))
+    for index, frame in enumerate(frame_array):
+        start_perf_counter = time.perf_counter()
+        function(frame)
+        frame_time_array[index] = time.perf_counter() - start_perf_counter
+    return frame_time_array
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame cost of the streaming singularity monitor.")
+    parser.add_argument("--robot", type=str, default="ur10", help="ur5 or ur10 (hand-coded Jacobians).")
+    parser.add_argument("--frequency", type=float, default=500, help="RTDE frequency [Hz].")
+    parser.add_argument("--duration", type=float, default=10, help="Length of the streamed trajectory [s].")
+    parser.add_argument("--waypoints", type=int, default=10000, help="Number of waypoints of the batch check.")
+    args = parser.parse_args()
+
+    frame_array = get_frame_array(args.frequency, args.duration)
+    budget = 1 / args.frequency
+    event_array = []
+    singularity_monitor = SingularityMonitor(rob=args.robot)
+    singularity_monitor.AddEventListener(event_array.append)
+
+    def update_legacy(frame):
+        return SingularityMeasuresArray(np.asarray(Jacobian_Numerical(args.robot, list(frame)))[np.newaxis])
+
+    print("{name:<12}{frames:>8}{mean:>12}{p99:>12}{max:>12}{budget:>10}"
+          .format(name="stream", frames="frames", mean="mean[us]", p99="p99[us]", max="max[us]", budget="budget"))
+    for name, function in [("numerical", update_legacy), ("monitor", singularity_monitor.Update)]:
+        frame_time_array = measure(function, frame_array)
+        print("{name:<12}{frames:>8}{mean:>12.1f}{p99:>12.1f}{max:>12.1f}{budget:>10.1%}"
+              .format(name=name, frames=len(frame_array), mean=np.mean(frame_time_array) * 1e6,
+                      p99=np.percentile(frame_time_array, 99) * 1e6, max=np.max(frame_time_array) * 1e6,
+                      budget=np.mean(frame_time_array) / budget))
+
+    statistics = singularity_monitor.GetStatistics()
+    print()
+    print("events={events} near_singular_frames={near_singular_frames} min_manipulability={min_manipulability:.5f} "
+          "max_condition={max_condition:.1f}".format(**statistics))
+    for event in event_array:
+        print("  {type:<6} manipulability={manipulability:.5f} condition={condition:.1f} q5={q5:.4f}"
+              .format(q5=event["joints"][4], **event))
+
+    waypoint_array = np.random.default_rng(0).uniform(-np.pi, np.pi, (args.waypoints, 6))
+    start_perf_counter = time.perf_counter()
+    near_singular_mask = singularity_monitor.CheckArray(waypoint_array)
+    batch_time = time.perf_counter() - start_perf_counter
+    print()
+    print("batch waypoints={waypoints} time={time:.2f}ms per_waypoint={per_waypoint:.2f}us near_singular={ratio:.3f}"
+          .format(waypoints=args.waypoints, time=batch_time * 1e3, per_waypoint=batch_time / args.waypoints * 1e6,
+                  ratio=np.mean(near_singular_mask)))
+
+
+if __name__ == '__main__':
+    main()
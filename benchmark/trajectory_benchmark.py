@@ -0,0 +1,62 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import argparse
+import math
+import time
+import numpy as np
+from URBasic.manipulation import FKinFixed, JointTrajectory, ScrewTrajectory, CartesianTrajectory, \
+    JointTrajectoryArray, ScrewTrajectoryArray, CartesianTrajectoryArray
+
+# python -m benchmark.trajectory_benchmark --legacy_max 10000
+
+M_UR5 = [[1, 0, 0, -.817], [0, 0, -1, -.191], [0, 1, 0, -.006], [0, 0, 0, 1]]
+SLIST_UR5 = [[0, 0, 1, 0, 0, 0],
+             [0, -1, 0, .089, 0, 0],
+             [0, -1, 0, .089, 0, .425],
+             [0, -1, 0, .089, 0, .817],
+             [0, 0, -1, .109, -.817, 0],
+             [0, -1, 0, -.006, 0, .817]]
+
+
+def measure(function, *args):
+    start_perf_counter = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_perf_counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare looped and vectorized trajectory generation.")
+    parser.add_argument("--method", type=str, default="quintic", help="cubic or quintic time scaling.")
+    parser.add_argument("--legacy_max", type=int, default=10000, help="Largest N run with the looped version.")
+    args = parser.parse_args()
+
+    thetas_start = [0.1] * 6
+    thetas_end = [math.pi / 2] * 6
+    X_start = FKinFixed(M_UR5, SLIST_UR5, thetas_start)
+    X_end = FKinFixed(M_UR5, SLIST_UR5, thetas_end)
+    trajectory_functions = [
+        ("joint", JointTrajectory, JointTrajectoryArray, thetas_start, thetas_end),
+        ("screw", ScrewTrajectory, ScrewTrajectoryArray, X_start, X_end),
+        ("cartesian", CartesianTrajectory, CartesianTrajectoryArray, X_start, X_end)]
+
+    print("{name:<10}{n:>10}{looped:>14}{vectorized:>14}{speedup:>10}{max_error:>12}"
+          .format(name="trajectory", n="N", looped="looped[s]", vectorized="vector[s]",
+                  speedup="speedup", max_error="max_error"))
+    for name, looped_function, vectorized_function, start, end in trajectory_functions:
+        for n in [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]:
+            (trajectory, _, _), vectorized_time = measure(vectorized_function, start, end, 2, n, args.method)
+            if n <= args.legacy_max:
+                looped_trajectory, looped_time = measure(looped_function, start, end, 2, n, args.method)
+                max_error = np.max(np.abs(looped_trajectory - trajectory.reshape(looped_trajectory.shape)))
+                print("{name:<10}{n:>10}{looped:>14.4f}{vectorized:>14.4f}{speedup:>10.1f}{max_error:>12.2e}"
+                      .format(name=name, n=n, looped=looped_time, vectorized=vectorized_time,
+                              speedup=looped_time / vectorized_time, max_error=max_error))
+            else:
+                print("{name:<10}{n:>10}{looped:>14}{vectorized:>14.4f}{speedup:>10}{max_error:>12}"
+                      .format(name=name, n=n, looped="skipped", vectorized=vectorized_time,
+                              speedup="-", max_error="-"))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,38 +2,70 @@ __author__ = "100638182"
 __copyright__ = "University of Derby"
 
 import logging
+from helper.latency_helper import LatencyStage
 from model.request.joint_position_model import JointPositionModel
 from model.request.tcp_position_model import TcpPositionModel
 
 
 class CobotControlTask:
 
-    def __init__(self, robot):
+    def __init__(self, robot, cancel_event=None, latency_trace=None, chunk_size=None):
         self.__robot = robot
+        self.__cancel_event = cancel_event
+        self.__latency_trace = latency_trace
+        self.__chunk_size = chunk_size
+
+    def is_cancelled(self):
+        return self.__cancel_event is not None and self.__cancel_event.is_set()
+
+    def get_chunk_array(self, position_model_array):
+        if not self.__chunk_size or self.__chunk_size >= len(position_model_array):
+            return [position_model_array]
+        return [position_model_array[index:index + self.__chunk_size]
+                for index in range(0, len(position_model_array), self.__chunk_size)]
+
+    def mark_program_latency(self, model_index, array_length):
+        if self.__latency_trace is None:
+            return
+        robot_model = self.__robot.robotConnector.RobotModel
+        if model_index == 1:
+            if robot_model.rtcProgramSendPerfCounter is not None:
+                self.__latency_trace.mark(LatencyStage.URSCRIPT_SEND, robot_model.rtcProgramSendPerfCounter)
+            if robot_model.rtcProgramStartPerfCounter is not None:
+                self.__latency_trace.mark(LatencyStage.PROGRAM_START, robot_model.rtcProgramStartPerfCounter)
+        if model_index == array_length and robot_model.rtcProgramFinishPerfCounter is not None:
+            self.__latency_trace.mark(LatencyStage.PROGRAM_FINISH, robot_model.rtcProgramFinishPerfCounter)
 
     async def move_j(self, move_j_control_model):
         logging.info("cobot_control_task.move_j:Starting")
         logging.info("cobot_control_task.move_j:Length joint_position_array_length={joint_position_array_length}"
                      .format(joint_position_array_length=str(len(move_j_control_model.joint_position_model_array))))
-        for index, joint_position_model in enumerate(move_j_control_model.joint_position_model_array):
-            joint_position_array = JointPositionModel.get_position_array_from_joint_position_model(
-                joint_position_model=joint_position_model)
-            model_index = index + 1
-            array_length = len(move_j_control_model.joint_position_model_array)
+        chunk_array = self.get_chunk_array(move_j_control_model.joint_position_model_array)
+        for index, joint_position_model_chunk in enumerate(chunk_array):
+            if self.is_cancelled():
+                logging.info("cobot_control_task.move_j:Cancelled")
+                break
+            joint_position_array = [JointPositionModel.get_position_array_from_joint_position_model(
+                joint_position_model=joint_position_model) for joint_position_model in joint_position_model_chunk]
+            chunk_index = index + 1
+            chunk_length = len(chunk_array)
 
-            logging.info('cobot_control_task.move_j:Execute joint_position_model {model_index}/{array_length}'
-                         .format(model_index=model_index,
-                                 array_length=array_length))
+            logging.info('cobot_control_task.move_j:Execute chunk {chunk_index}/{chunk_length} '
+                         'waypoints={waypoints}'
+                         .format(chunk_index=chunk_index,
+                                 chunk_length=chunk_length,
+                                 waypoints=len(joint_position_array)))
             self.__robot.movej(q=joint_position_array,
                                a=move_j_control_model.acceleration,
                                v=move_j_control_model.velocity,
                                t=move_j_control_model.time_s,
                                r=move_j_control_model.blend_radius)
-            logging.info('cobot_control_task.move_j:Success joint_position_model_index={joint_position_model_index}, '
+            self.mark_program_latency(model_index=chunk_index, array_length=chunk_length)
+            logging.info('cobot_control_task.move_j:Success chunk_index={chunk_index}, '
                          'joint_position_array={joint_position_array}, '
                          'acceleration={acceleration}, velocity={velocity}, time_s={time_s}, '
                          'blend_radius={blend_radius}'
-                         .format(joint_position_model_index=model_index,
+                         .format(chunk_index=chunk_index,
                                  joint_position_array=joint_position_array,
                                  acceleration=move_j_control_model.acceleration,
                                  velocity=move_j_control_model.velocity,
@@ -46,24 +78,31 @@ class CobotControlTask:
         logging.info("cobot_control_task.move_p:Starting")
         logging.info("cobot_control_task.move_p:Length tcp_position_array_length={tcp_position_array_length}"
                      .format(tcp_position_array_length=str(len(move_p_control_model.tcp_position_model_array))))
-        for index, tcp_position_model in enumerate(move_p_control_model.tcp_position_model_array):
-            tcp_position_array = TcpPositionModel.get_position_array_from_tcp_position_model(
-                tcp_position_model=tcp_position_model)
-            model_index = index + 1
-            array_length = len(move_p_control_model.tcp_position_model_array)
+        chunk_array = self.get_chunk_array(move_p_control_model.tcp_position_model_array)
+        for index, tcp_position_model_chunk in enumerate(chunk_array):
+            if self.is_cancelled():
+                logging.info("cobot_control_task.move_p:Cancelled")
+                break
+            tcp_position_array = [TcpPositionModel.get_position_array_from_tcp_position_model(
+                tcp_position_model=tcp_position_model) for tcp_position_model in tcp_position_model_chunk]
+            chunk_index = index + 1
+            chunk_length = len(chunk_array)
 
-            logging.info('cobot_control_task.move_p:Execute joint_position_model {model_index}/{array_length}'
-                         .format(model_index=model_index,
-                                 array_length=array_length))
+            logging.info('cobot_control_task.move_p:Execute chunk {chunk_index}/{chunk_length} '
+                         'waypoints={waypoints}'
+                         .format(chunk_index=chunk_index,
+                                 chunk_length=chunk_length,
+                                 waypoints=len(tcp_position_array)))
             self.__robot.movep(pose=tcp_position_array,
                                a=move_p_control_model.acceleration,
                                v=move_p_control_model.velocity,
                                r=move_p_control_model.blend_radius)
-            logging.info('cobot_control_task.move_p:Success joint_position_model_index={joint_position_model_index}, '
+            self.mark_program_latency(model_index=chunk_index, array_length=chunk_length)
+            logging.info('cobot_control_task.move_p:Success chunk_index={chunk_index}, '
                          'tcp_position_array={tcp_position_array}, '
                          'acceleration={acceleration}, velocity={velocity}, '
                          'blend_radius={blend_radius}'
-                         .format(joint_position_model_index=model_index,
+                         .format(chunk_index=chunk_index,
                                  tcp_position_array=tcp_position_array,
                                  acceleration=move_p_control_model.acceleration,
                                  velocity=move_p_control_model.velocity,
@@ -75,25 +114,32 @@ class CobotControlTask:
         logging.info("cobot_control_task.move_l:Starting")
         logging.info("cobot_control_task.move_l:Length joint_position_array_length={joint_position_array_length}"
                      .format(joint_position_array_length=str(len(move_l_control_model.tcp_position_model_array))))
-        for index, tcp_position_model in enumerate(move_l_control_model.tcp_position_model_array):
-            tcp_position_array = TcpPositionModel.get_position_array_from_tcp_position_model(
-                tcp_position_model=tcp_position_model)
-            model_index = index + 1
-            array_length = len(move_l_control_model.tcp_position_model_array)
+        chunk_array = self.get_chunk_array(move_l_control_model.tcp_position_model_array)
+        for index, tcp_position_model_chunk in enumerate(chunk_array):
+            if self.is_cancelled():
+                logging.info("cobot_control_task.move_l:Cancelled")
+                break
+            tcp_position_array = [TcpPositionModel.get_position_array_from_tcp_position_model(
+                tcp_position_model=tcp_position_model) for tcp_position_model in tcp_position_model_chunk]
+            chunk_index = index + 1
+            chunk_length = len(chunk_array)
 
-            logging.info('cobot_control_task.move_l:Execute joint_position_model {model_index}/{array_length}'
-                         .format(model_index=model_index,
-                                 array_length=array_length))
+            logging.info('cobot_control_task.move_l:Execute chunk {chunk_index}/{chunk_length} '
+                         'waypoints={waypoints}'
+                         .format(chunk_index=chunk_index,
+                                 chunk_length=chunk_length,
+                                 waypoints=len(tcp_position_array)))
             self.__robot.movel(pose=tcp_position_array,
                                a=move_l_control_model.acceleration,
                                v=move_l_control_model.velocity,
                                t=move_l_control_model.time_s,
                                r=move_l_control_model.blend_radius)
-            logging.info('cobot_control_task.move_p:Success joint_position_model_index={joint_position_model_index}, '
+            self.mark_program_latency(model_index=chunk_index, array_length=chunk_length)
+            logging.info('cobot_control_task.move_l:Success chunk_index={chunk_index}, '
                          'tcp_position_array={tcp_position_array}, '
                          'acceleration={acceleration}, velocity={velocity}, '
                          'blend_radius={blend_radius}'
-                         .format(joint_position_model_index=model_index,
+                         .format(chunk_index=chunk_index,
                                  tcp_position_array=tcp_position_array,
                                  acceleration=move_l_control_model.acceleration,
                                  velocity=move_l_control_model.velocity,
@@ -0,0 +1,135 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import numpy as np
+from cloud.control_task.cobot_motion_queue import MotionType
+from model.request.joint_position_model import JointPositionModel
+from model.request.tcp_position_model import TcpPositionModel
+
+
+class CobotMotionPlan:
+    def __init__(self, motion_type, position_array, segment_duration_array, program_count, program_overhead):
+        self._motion_type = motion_type
+        self._position_array = position_array
+        self._segment_duration_array = segment_duration_array
+        self._program_count = program_count
+        self._program_overhead = program_overhead
+        self._total_duration = float(np.sum(segment_duration_array)) + program_count * program_overhead
+
+    @property
+    def motion_type(self):
+        return self._motion_type
+
+    @property
+    def position_array(self):
+        return self._position_array
+
+    @property
+    def segment_duration_array(self):
+        return self._segment_duration_array
+
+    @property
+    def program_count(self):
+        return self._program_count
+
+    @property
+    def total_duration(self):
+        return self._total_duration
+
+    def get(self):
+        return {
+            "motion_type": self.motion_type,
+            "segment_duration_array": [round(float(duration), 4) for duration in self.segment_duration_array],
+            "program_count": self.program_count,
+            "program_overhead": self._program_overhead,
+            "total_duration": round(self.total_duration, 4)
+        }
+
+
+class CobotMotionPlanner:
+
+    def __init__(self, chunk_size=None, program_overhead=0.05):
+        self.__chunk_size = chunk_size
+        self.__program_overhead = program_overhead
+
+    @staticmethod
+    def get_position_array(motion_type, request_model):
+        if motion_type == MotionType.MOVE_J:
+            return np.array([JointPositionModel.get_position_array_from_joint_position_model(
+                joint_position_model=joint_position_model)
+                for joint_position_model in request_model.joint_position_model_array], dtype=float).reshape(-1, 6)
+        return np.array([TcpPositionModel.get_position_array_from_tcp_position_model(
+            tcp_position_model=tcp_position_model)
+            for tcp_position_model in request_model.tcp_position_model_array], dtype=float).reshape(-1, 6)
+
+    @staticmethod
+    def get_distance_array(motion_type, position_array, start_position=None):
+        if start_position is None:
+            start_position = position_array[:1]
+        delta_array = np.diff(np.vstack((np.asarray(start_position, dtype=float).reshape(1, 6), position_array)),
+                              axis=0)
+        if motion_type == MotionType.MOVE_J:
+            return np.max(np.abs(delta_array), axis=1)
+        return np.linalg.norm(delta_array[:, :3], axis=1)
+
+    @staticmethod
+    def get_segment_duration_array(distance_array, acceleration, velocity, stop_count_array):
+        ramp_distance = velocity * velocity / (2 * acceleration)
+        is_reaching_velocity = distance_array >= stop_count_array * ramp_distance
+        cruise_duration_array = distance_array / velocity + stop_count_array * velocity / (2 * acceleration)
+        peak_velocity_array = np.sqrt(2 * acceleration * distance_array / np.maximum(stop_count_array, 1))
+        ramp_duration_array = stop_count_array * peak_velocity_array / acceleration
+        return np.where(is_reaching_velocity, cruise_duration_array, ramp_duration_array)
+
+    def get_stop_count_array(self, segment_count, blend_radius):
+        end_stop_array = np.zeros(segment_count, dtype=bool)
+        end_stop_array[-1] = True
+        if not blend_radius:
+            end_stop_array[:] = True
+        elif self.__chunk_size:
+            end_stop_array[self.__chunk_size - 1::self.__chunk_size] = True
+        start_stop_array = np.empty(segment_count, dtype=bool)
+        start_stop_array[0] = True
+        start_stop_array[1:] = end_stop_array[:-1]
+        return start_stop_array.astype(float) + end_stop_array.astype(float)
+
+    def plan(self, motion_type, request_model, start_position=None):
+        position_array = self.get_position_array(motion_type=motion_type, request_model=request_model)
+        segment_count = len(position_array)
+        if segment_count == 0:
+            return CobotMotionPlan(motion_type=motion_type,
+                                   position_array=position_array,
+                                   segment_duration_array=np.zeros(0),
+                                   program_count=0,
+                                   program_overhead=self.__program_overhead)
+
+        program_count = 1 if not self.__chunk_size else -(-segment_count // self.__chunk_size)
+        time_s = getattr(request_model, "time_s", 0)
+        if time_s and motion_type != MotionType.MOVE_P:
+            segment_duration_array = np.full(segment_count, float(time_s))
+        else:
+            distance_array = self.get_distance_array(motion_type=motion_type,
+                                                     position_array=position_array,
+                                                     start_position=start_position)
+            acceleration = float(request_model.acceleration)
+            velocity = float(request_model.velocity)
+            if not (acceleration > 0 and velocity > 0):
+                raise ValueError("Invalid acceleration={acceleration} velocity={velocity} must be greater than 0"
+                                 .format(acceleration=acceleration, velocity=velocity))
+            stop_count_array = self.get_stop_count_array(segment_count=segment_count,
+                                                         blend_radius=request_model.blend_radius)
+            segment_duration_array = self.get_segment_duration_array(distance_array=distance_array,
+                                                                     acceleration=acceleration,
+                                                                     velocity=velocity,
+                                                                     stop_count_array=stop_count_array)
+        cobot_motion_plan = CobotMotionPlan(motion_type=motion_type,
+                                            position_array=position_array,
+                                            segment_duration_array=segment_duration_array,
+                                            program_count=program_count,
+                                            program_overhead=self.__program_overhead)
+        logging.info("cobot_motion_planner.plan:Planned motion_type={motion_type} segments={segments} "
+                     "total_duration={total_duration}".format(motion_type=motion_type,
+                                                              segments=segment_count,
+                                                              total_duration=cobot_motion_plan.total_duration))
+        return cobot_motion_plan
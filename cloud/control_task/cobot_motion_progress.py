@@ -0,0 +1,80 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import time
+import numpy as np
+from cloud.control_task.cobot_motion_queue import MotionState, MotionType
+
+
+class CobotMotionProgress:
+    def __init__(self, motion, start_position, lookahead=10):
+        motion_plan = motion.motion_plan
+        self._motion_id = motion.motion_id
+        self._motion_type = motion.motion_type
+        self._start_time = motion.start_time if motion.start_time is not None else time.time()
+        self._dimension = 6 if motion.motion_type == MotionType.MOVE_J else 3
+        position_array = np.asarray(motion_plan.position_array, dtype=float)[:, :self._dimension]
+        start_position = np.asarray(start_position, dtype=float).reshape(-1)[:self._dimension]
+        self._segment_start_array = np.vstack((start_position, position_array[:-1]))
+        self._segment_vector_array = position_array - self._segment_start_array
+        self._segment_length_array = np.einsum('ij,ij->i', self._segment_vector_array, self._segment_vector_array)
+        segment_duration_array = np.asarray(motion_plan.segment_duration_array, dtype=float)
+        self._segment_duration_array = segment_duration_array
+        self._elapsed_duration_array = np.concatenate(([0.], np.cumsum(segment_duration_array)[:-1]))
+        self._planned_duration = float(np.sum(segment_duration_array))
+        self._lookahead = lookahead
+        self._segment_index = 0
+        self._fraction_complete = 0.0
+
+    @property
+    def motion_id(self):
+        return self._motion_id
+
+    @property
+    def fraction_complete(self):
+        return self._fraction_complete
+
+    def update(self, actual_position):
+        if actual_position is not None and len(self._segment_length_array) > 0:
+            actual_position = np.asarray(actual_position, dtype=float).reshape(-1)[:self._dimension]
+            window = slice(self._segment_index, self._segment_index + self._lookahead)
+            segment_start_array = self._segment_start_array[window]
+            segment_vector_array = self._segment_vector_array[window]
+            segment_length_array = self._segment_length_array[window]
+            offset_array = actual_position - segment_start_array
+            parameter_array = np.divide(np.einsum('ij,ij->i', offset_array, segment_vector_array),
+                                        segment_length_array,
+                                        out=np.ones_like(segment_length_array),
+                                        where=segment_length_array > 0)
+            parameter_array = np.clip(parameter_array, 0, 1)
+            distance_array = np.linalg.norm(offset_array - parameter_array[:, np.newaxis] * segment_vector_array,
+                                            axis=1)
+            closest_index = int(np.argmin(distance_array))
+            self._segment_index += closest_index
+            if self._planned_duration > 0:
+                fraction_complete = (self._elapsed_duration_array[self._segment_index]
+                                     + parameter_array[closest_index]
+                                     * self._segment_duration_array[self._segment_index]) / self._planned_duration
+            else:
+                fraction_complete = (self._segment_index + parameter_array[closest_index]) \
+                                    / len(self._segment_length_array)
+            self._fraction_complete = max(self._fraction_complete, float(fraction_complete))
+        return self.get()
+
+    def complete(self, state):
+        # a cancelled or failed motion keeps the last measured fraction
+        if state == MotionState.COMPLETED:
+            self._segment_index = max(len(self._segment_length_array) - 1, 0)
+            self._fraction_complete = 1.0
+        return self.get()
+
+    def get(self):
+        return {
+            "motion_id": self._motion_id,
+            "motion_type": self._motion_type,
+            "waypoint_index": self._segment_index,
+            "waypoint_count": len(self._segment_length_array),
+            "fraction_complete": round(self._fraction_complete, 4),
+            "elapsed_time": round(time.time() - self._start_time, 3),
+            "estimated_time_remaining": round(self._planned_duration * (1 - self._fraction_complete), 3)
+        }
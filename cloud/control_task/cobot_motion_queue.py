@@ -0,0 +1,319 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from cloud.control_task.cobot_control_task import CobotControlTask
+from helper.latency_helper import LatencyStage, current_latency_trace
+
+
+class MotionType:
+    MOVE_J = "MOVE_J"
+    MOVE_L = "MOVE_L"
+    MOVE_P = "MOVE_P"
+
+
+class MotionPriority:
+    HIGH = "HIGH"
+    NORMAL = "NORMAL"
+    LOW = "LOW"
+
+    RANKS = {HIGH: 0, NORMAL: 1, LOW: 2}
+
+    @staticmethod
+    def get_rank(priority):
+        return MotionPriority.RANKS[priority]
+
+
+class MotionState:
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    CANCELLED = "CANCELLED"
+    ERROR = "ERROR"
+
+
+class CobotMotion:
+    def __init__(self, motion_type, request_model, priority, motion_plan=None):
+        self._motion_id = str(uuid.uuid4())
+        self._motion_type = motion_type
+        self._request_model = request_model
+        self._priority = priority
+        self._state = MotionState.QUEUED
+        self._enqueue_time = time.time()
+        self._start_time = None
+        self._end_time = None
+        self._start_position = None
+        self._cancel_event = threading.Event()
+        self._latency_trace = current_latency_trace.get()
+        self._motion_plan = motion_plan
+
+    @property
+    def motion_id(self):
+        return self._motion_id
+
+    @property
+    def motion_type(self):
+        return self._motion_type
+
+    @property
+    def request_model(self):
+        return self._request_model
+
+    @property
+    def priority(self):
+        return self._priority
+
+    @property
+    def state(self):
+        return self._state
+
+    @property
+    def enqueue_time(self):
+        return self._enqueue_time
+
+    @property
+    def start_time(self):
+        return self._start_time
+
+    @property
+    def end_time(self):
+        return self._end_time
+
+    @property
+    def start_position(self):
+        return self._start_position
+
+    @property
+    def cancel_event(self):
+        return self._cancel_event
+
+    @property
+    def latency_trace(self):
+        return self._latency_trace
+
+    @property
+    def motion_plan(self):
+        return self._motion_plan
+
+    @property
+    def expected_duration(self):
+        if self._motion_plan is None:
+            return None
+        return self._motion_plan.total_duration
+
+    @state.setter
+    def state(self, value):
+        self._state = value
+
+    @start_time.setter
+    def start_time(self, value):
+        self._start_time = value
+
+    @end_time.setter
+    def end_time(self, value):
+        self._end_time = value
+
+    @start_position.setter
+    def start_position(self, value):
+        self._start_position = value
+
+    def get(self):
+        return {
+            "motion_id": self.motion_id,
+            "motion_type": self.motion_type,
+            "priority": self.priority,
+            "state": self.state,
+            "enqueue_time": self.enqueue_time,
+            "start_time": self.start_time,
+            "expected_duration": self.expected_duration
+        }
+
+
+class CobotMotionQueue:
+
+    def __init__(self, chunk_size=None):
+        self.__robot = None
+        self.__position_provider = None
+        self.__chunk_size = chunk_size
+        self.__condition = threading.Condition()
+        self.__queue = []
+        self.__sequence = itertools.count()
+        self.__running_motion = None
+        self.__is_held = True
+        self.__running = False
+        self.__worker_thread = None
+
+    def start(self, robot, position_provider=None):
+        with self.__condition:
+            self.__robot = robot
+            self.__position_provider = position_provider
+            self.__running = True
+            self.__is_held = False
+        self.__worker_thread = threading.Thread(target=self.__worker, daemon=True)
+        self.__worker_thread.start()
+        logging.info("cobot_motion_queue.start:Started")
+
+    def terminate(self, deceleration=2.0):
+        cancelled_motions = self.preempt(deceleration=deceleration)
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify_all()
+        if self.__worker_thread is not None:
+            self.__worker_thread.join()
+            self.__worker_thread = None
+        logging.info("cobot_motion_queue.terminate:Terminated cancelled_motions={cancelled_motions}"
+                     .format(cancelled_motions=len(cancelled_motions)))
+        return cancelled_motions
+
+    def is_held(self):
+        return self.__is_held
+
+    def hold(self):
+        with self.__condition:
+            self.__is_held = True
+        logging.info("cobot_motion_queue.hold:Held")
+
+    def resume(self):
+        with self.__condition:
+            self.__is_held = False
+            self.__condition.notify_all()
+        logging.info("cobot_motion_queue.resume:Resumed")
+
+    def enqueue(self, motion_type, request_model, priority=MotionPriority.NORMAL, motion_plan=None):
+        rank = MotionPriority.get_rank(priority)
+        motion = CobotMotion(motion_type=motion_type, request_model=request_model, priority=priority,
+                             motion_plan=motion_plan)
+        with self.__condition:
+            if motion.latency_trace is not None:
+                motion.latency_trace.mark(LatencyStage.ENQUEUE)
+            heapq.heappush(self.__queue, (rank, next(self.__sequence), motion))
+            self.__condition.notify_all()
+        logging.info("cobot_motion_queue.enqueue:Queued motion_id={motion_id} motion_type={motion_type} "
+                     "priority={priority}".format(motion_id=motion.motion_id,
+                                                  motion_type=motion_type,
+                                                  priority=priority))
+        return motion
+
+    def get_running_motion(self):
+        return self.__running_motion
+
+    def get_queued_motions(self):
+        with self.__condition:
+            return [entry[2] for entry in sorted(self.__queue)]
+
+    def get_queue_length(self):
+        with self.__condition:
+            return len(self.__queue)
+
+    def get_expected_start_time(self, priority=MotionPriority.NORMAL, motion_id=None):
+        rank = MotionPriority.get_rank(priority)
+        now = time.time()
+        with self.__condition:
+            expected_start_time = now
+            running_motion = self.__running_motion
+            if running_motion is not None and running_motion.expected_duration is not None:
+                expected_start_time = max(now, running_motion.start_time + running_motion.expected_duration)
+            for entry in sorted(self.__queue):
+                if entry[2].motion_id == motion_id or (motion_id is None and entry[0] > rank):
+                    break
+                expected_start_time += entry[2].expected_duration or 0
+        return expected_start_time
+
+    def get_expected_completion_time(self, motion):
+        return self.get_expected_start_time(priority=motion.priority, motion_id=motion.motion_id) + \
+            (motion.expected_duration or 0)
+
+    def cancel(self, motion_id):
+        with self.__condition:
+            for index, entry in enumerate(self.__queue):
+                if entry[2].motion_id == motion_id:
+                    motion = entry[2]
+                    self.__queue.pop(index)
+                    heapq.heapify(self.__queue)
+                    motion.state = MotionState.CANCELLED
+                    logging.info("cobot_motion_queue.cancel:Cancelled motion_id={motion_id}"
+                                 .format(motion_id=motion_id))
+                    return motion
+        logging.info("cobot_motion_queue.cancel:Not queued motion_id={motion_id}".format(motion_id=motion_id))
+        return None
+
+    def cancel_all(self):
+        with self.__condition:
+            cancelled_motions = [entry[2] for entry in sorted(self.__queue)]
+            self.__queue = []
+        for motion in cancelled_motions:
+            motion.state = MotionState.CANCELLED
+        logging.info("cobot_motion_queue.cancel_all:Cancelled cancelled_motions={cancelled_motions}"
+                     .format(cancelled_motions=len(cancelled_motions)))
+        return cancelled_motions
+
+    def preempt(self, deceleration=2.0):
+        cancelled_motions = self.cancel_all()
+        with self.__condition:
+            running_motion = self.__running_motion
+            if running_motion is not None:
+                running_motion.cancel_event.set()
+        if running_motion is not None:
+            cancelled_motions.insert(0, running_motion)
+            self.__robot.stopj(a=deceleration, wait=False)
+        logging.info("cobot_motion_queue.preempt:Preempted running_motion={running_motion}"
+                     .format(running_motion=None if running_motion is None else running_motion.motion_id))
+        return cancelled_motions
+
+    def __next_motion(self):
+        with self.__condition:
+            while self.__running and (self.__is_held or not self.__queue):
+                self.__condition.wait()
+            if not self.__running:
+                return None
+            motion = heapq.heappop(self.__queue)[2]
+            motion.state = MotionState.RUNNING
+            motion.start_time = time.time()
+            # the pose the robot leaves from, before the first program of this motion is sent
+            if self.__position_provider is not None:
+                motion.start_position = self.__position_provider(motion.motion_type)
+            self.__running_motion = motion
+            return motion
+
+    def __worker(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        while True:
+            motion = self.__next_motion()
+            if motion is None:
+                break
+            logging.info("cobot_motion_queue.worker:Running motion_id={motion_id} motion_type={motion_type}"
+                         .format(motion_id=motion.motion_id, motion_type=motion.motion_type))
+            try:
+                cobot_control_task = CobotControlTask(robot=self.__robot,
+                                                      cancel_event=motion.cancel_event,
+                                                      latency_trace=motion.latency_trace,
+                                                      chunk_size=self.__chunk_size)
+                if motion.motion_type == MotionType.MOVE_J:
+                    loop.run_until_complete(cobot_control_task.move_j(move_j_control_model=motion.request_model))
+                elif motion.motion_type == MotionType.MOVE_L:
+                    loop.run_until_complete(cobot_control_task.move_l(move_l_control_model=motion.request_model))
+                elif motion.motion_type == MotionType.MOVE_P:
+                    loop.run_until_complete(cobot_control_task.move_p(move_p_control_model=motion.request_model))
+                if motion.cancel_event.is_set():
+                    motion.state = MotionState.CANCELLED
+                else:
+                    motion.state = MotionState.COMPLETED
+            except Exception as exception:
+                # any failure of the robot connection ends this motion only, the worker keeps serving the queue
+                motion.state = MotionState.ERROR
+                logging.exception("cobot_motion_queue.worker:Failed motion_id={motion_id} exception={exception}"
+                                  .format(motion_id=motion.motion_id, exception=repr(exception)))
+            finally:
+                motion.end_time = time.time()
+                with self.__condition:
+                    self.__running_motion = None
+            logging.info("cobot_motion_queue.worker:Finished motion_id={motion_id} state={state}"
+                         .format(motion_id=motion.motion_id, state=motion.state))
+        loop.close()
@@ -0,0 +1,173 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import math
+import numpy as np
+from cloud.control_task.cobot_motion_planner import CobotMotionPlanner
+from cloud.control_task.cobot_motion_queue import MotionType
+from URBasic.kinematic import Inverse_kin_analyticArray
+from URBasic.manipulation import FKinFixedArray
+from URBasic.robotRegistry import GetRobot
+from URBasic.singularityMonitor import SingularityMonitor
+
+
+class CobotMotionValidationError(Exception):
+    def __init__(self, cobot_motion_validation_result):
+        super().__init__("Invalid waypoints {validation}".format(validation=cobot_motion_validation_result.get()))
+        self.cobot_motion_validation_result = cobot_motion_validation_result
+
+
+class CobotMotionValidationResult:
+    def __init__(self, motion_type, waypoint_count, joint_limit_index_array, unreachable_index_array,
+                 floor_index_array, singular_index_array=None):
+        self._motion_type = motion_type
+        self._waypoint_count = waypoint_count
+        self._joint_limit_index_array = joint_limit_index_array
+        self._unreachable_index_array = unreachable_index_array
+        self._floor_index_array = floor_index_array
+        self._singular_index_array = [] if singular_index_array is None else singular_index_array
+
+    @property
+    def motion_type(self):
+        return self._motion_type
+
+    @property
+    def joint_limit_index_array(self):
+        return self._joint_limit_index_array
+
+    @property
+    def unreachable_index_array(self):
+        return self._unreachable_index_array
+
+    @property
+    def floor_index_array(self):
+        return self._floor_index_array
+
+    @property
+    def singular_index_array(self):
+        return self._singular_index_array
+
+    @property
+    def is_valid(self):
+        return not (self._joint_limit_index_array or self._unreachable_index_array or self._floor_index_array
+                    or self._singular_index_array)
+
+    def get(self):
+        return {
+            "motion_type": self.motion_type,
+            "waypoint_count": self._waypoint_count,
+            "is_valid": self.is_valid,
+            "joint_limit_index_array": self.joint_limit_index_array,
+            "unreachable_index_array": self.unreachable_index_array,
+            "floor_index_array": self.floor_index_array,
+            "singular_index_array": self.singular_index_array
+        }
+
+
+class CobotMotionValidator:
+    def __init__(self, robot_type="ur10", joint_limit_array=None, floor_z=None, tolerance=1e-4,
+                 singularity_monitor=None):
+        robot = GetRobot(robot_type)
+        self.__robot_type = robot_type
+        self.__m = robot.M
+        self.__screw_axis_array = robot.Slist
+        if joint_limit_array is None:
+            joint_limit_array = robot.joint_limit
+        self.__joint_limit_array = np.array(joint_limit_array, dtype=float)
+        self.__floor_z = floor_z
+        self.__tolerance = tolerance
+        if singularity_monitor is None:
+            singularity_monitor = SingularityMonitor(rob=robot_type)
+        self.__singularity_monitor = singularity_monitor
+
+    def get_tcp_position_array(self, joint_position_array):
+        return FKinFixedArray(self.__m, self.__screw_axis_array, joint_position_array)[:, :3, 3]
+
+    def get_joint_limit_mask(self, joint_position_array):
+        return np.any((joint_position_array < self.__joint_limit_array[:, 0] - self.__tolerance)
+                      | (joint_position_array > self.__joint_limit_array[:, 1] + self.__tolerance), axis=1)
+
+    def get_floor_mask(self, tcp_position_array):
+        if self.__floor_z is None:
+            return np.zeros(len(tcp_position_array), dtype=bool)
+        return tcp_position_array[:, 2] < self.__floor_z - self.__tolerance
+
+    def get_solution_array(self, tcp_pose_array):
+        return Inverse_kin_analyticArray(tcp_pose_array, rob=self.__robot_type, tolerance=self.__tolerance)
+
+    def get_unreachable_mask(self, tcp_pose_array, solution_array=None):
+        if solution_array is None:
+            solution_array = self.get_solution_array(tcp_pose_array)
+        # a solution counts if every joint fits its limits on one of its turns
+        turn_array = solution_array[..., np.newaxis] + np.array([-2 * math.pi, 0, 2 * math.pi])
+        is_turn_in_limit = (turn_array >= self.__joint_limit_array[:, 0, np.newaxis] - self.__tolerance) \
+            & (turn_array <= self.__joint_limit_array[:, 1, np.newaxis] + self.__tolerance)
+        is_solution_in_limit = np.all(np.any(is_turn_in_limit, axis=3), axis=2)
+        return ~np.any(is_solution_in_limit, axis=1)
+
+    # a linear move stops at a near singular pose. The controller keeps the branch of the start joints, so with
+    # start_joint_position every waypoint is checked on the solution nearest to the previous one. Without it a
+    # pose only counts as near singular when none of its solutions is clear of the thresholds.
+    def get_singular_mask(self, tcp_pose_array, solution_array=None, start_joint_position=None):
+        if solution_array is None:
+            solution_array = self.get_solution_array(tcp_pose_array)
+        is_solution_found = ~np.any(np.isnan(solution_array), axis=2)
+        if start_joint_position is None:
+            is_solution_singular = np.ones(is_solution_found.shape, dtype=bool)
+            if np.any(is_solution_found):
+                is_solution_singular[is_solution_found] = \
+                    self.__singularity_monitor.CheckArray(solution_array[is_solution_found])
+            return np.any(is_solution_found, axis=1) & np.all(is_solution_singular | ~is_solution_found, axis=1)
+
+        joint_position = np.asarray(start_joint_position, dtype=float).reshape(6)
+        nearest_array = np.full((len(solution_array), 6), np.nan)
+        for index in np.flatnonzero(np.any(is_solution_found, axis=1)):
+            delta = solution_array[index][is_solution_found[index]] - joint_position
+            delta = np.arctan2(np.sin(delta), np.cos(delta))
+            joint_position = joint_position + delta[np.argmin(np.linalg.norm(delta, axis=1))]
+            nearest_array[index] = joint_position
+        singular_mask = np.zeros(len(solution_array), dtype=bool)
+        is_nearest_found = ~np.isnan(nearest_array[:, 0])
+        if np.any(is_nearest_found):
+            singular_mask[is_nearest_found] = self.__singularity_monitor.CheckArray(nearest_array[is_nearest_found])
+        return singular_mask
+
+    def validate(self, motion_type, request_model, start_joint_position=None):
+        position_array = CobotMotionPlanner.get_position_array(motion_type=motion_type, request_model=request_model)
+        waypoint_count = len(position_array)
+        joint_limit_mask = np.zeros(waypoint_count, dtype=bool)
+        unreachable_mask = np.zeros(waypoint_count, dtype=bool)
+        singular_mask = np.zeros(waypoint_count, dtype=bool)
+        if motion_type == MotionType.MOVE_J:
+            joint_limit_mask = self.get_joint_limit_mask(position_array)
+            floor_mask = self.get_floor_mask(self.get_tcp_position_array(position_array)) \
+                if self.__floor_z is not None else np.zeros(waypoint_count, dtype=bool)
+        else:
+            solution_array = self.get_solution_array(position_array)
+            unreachable_mask = self.get_unreachable_mask(position_array, solution_array=solution_array)
+            singular_mask = self.get_singular_mask(position_array, solution_array=solution_array,
+                                                   start_joint_position=start_joint_position)
+            floor_mask = self.get_floor_mask(position_array[:, :3])
+
+        cobot_motion_validation_result = CobotMotionValidationResult(
+            motion_type=motion_type,
+            waypoint_count=waypoint_count,
+            joint_limit_index_array=np.flatnonzero(joint_limit_mask).tolist(),
+            unreachable_index_array=np.flatnonzero(unreachable_mask).tolist(),
+            floor_index_array=np.flatnonzero(floor_mask).tolist(),
+            singular_index_array=np.flatnonzero(singular_mask).tolist())
+        logging.info("cobot_motion_validator.validate:Validated motion_type={motion_type} robot_type={robot_type} "
+                     "waypoints={waypoints} is_valid={is_valid}"
+                     .format(motion_type=motion_type,
+                             robot_type=self.__robot_type,
+                             waypoints=waypoint_count,
+                             is_valid=cobot_motion_validation_result.is_valid))
+        return cobot_motion_validation_result
+
+    def check(self, motion_type, request_model, start_joint_position=None):
+        cobot_motion_validation_result = self.validate(motion_type=motion_type, request_model=request_model,
+                                                       start_joint_position=start_joint_position)
+        if not cobot_motion_validation_result.is_valid:
+            raise CobotMotionValidationError(cobot_motion_validation_result)
+        return cobot_motion_validation_result
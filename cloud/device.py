@@ -1,16 +1,19 @@
 __author__ = "100638182"
 __copyright__ = "University of Derby"
 
+import asyncio
 import json
 from azure.iot.device import Message, MethodResponse
 from azure.iot.device.aio import IoTHubDeviceClient
 from azure.iot.device.aio import ProvisioningDeviceClient
 import logging
+from helper.latency_helper import LatencyStage, LatencyTrace, current_latency_trace
 
 
 class Device:
 
-    def __init__(self, model_id, provisioning_host, id_scope, registration_id, symmetric_key):
+    def __init__(self, model_id, provisioning_host, id_scope, registration_id, symmetric_key,
+                 reported_properties_coalescing_window=0.5, reported_properties_retry_delay_max=30.0):
         self.model_id = model_id
         self.provisioning_host = provisioning_host
         self.id_scope = id_scope
@@ -18,6 +21,15 @@ class Device:
         self.symmetric_key = symmetric_key
         self.iot_hub_device_client = None
         self.registration_result = None
+        self.reported_properties_coalescing_window = reported_properties_coalescing_window
+        self.pending_reported_properties = {}
+        self.pending_reported_properties_patch_count = 0
+        self.reported_properties_flush_task = None
+        self.reported_properties_retry_delay_max = reported_properties_retry_delay_max
+        self.reported_properties_failure_count = 0
+        self.reported_properties_patch_count = 0
+        self.reported_properties_write_count = 0
+        self.reported_properties_last_coalesced_count = 0
 
     async def create_iot_hub_device_client(self):
         self.registration_result = await self.register_provisioning_device_client()
@@ -62,6 +74,9 @@ class Device:
                 command_name = None
 
             command_request = await self.iot_hub_device_client.receive_method_request(command_name)
+            latency_trace = LatencyTrace(command_name=command_request.name)
+            latency_trace.mark(LatencyStage.HUB_RECEIVE)
+            current_latency_trace.set(latency_trace)
             logging.info("device.create_iot_hub_device_client:model_id={model_id} payload={payload}"
                          .format(model_id=self.model_id, payload=command_request.payload))
 
@@ -83,6 +98,7 @@ class Device:
 
             try:
                 await self.iot_hub_device_client.send_method_response(command_response)
+                latency_trace.mark(LatencyStage.RESPONSE_SENT)
             except Exception as ex:
                 logging.error("device.create_iot_hub_device_client:model_id={model_id} "
                               "Responding to the {command} command failed "
@@ -112,7 +128,97 @@ class Device:
                         "value": prop_value,
                     }
 
+            self.queue_reported_properties(prop_dict)
+
+    def queue_reported_properties(self, prop_dict):
+        self.merge_pending_reported_properties(prop_dict)
+        self.pending_reported_properties_patch_count += 1
+        self.reported_properties_patch_count += 1
+        self.schedule_reported_properties_flush()
+
+    def merge_pending_reported_properties(self, prop_dict):
+        # keep whichever acknowledgement has the newer desired version av
+        for prop_name, prop_value in prop_dict.items():
+            pending_value = self.pending_reported_properties.get(prop_name)
+            if pending_value is not None and isinstance(pending_value, dict) and isinstance(prop_value, dict) \
+                    and pending_value.get("av", 0) > prop_value.get("av", 0):
+                continue
+            self.pending_reported_properties[prop_name] = prop_value
+
+    def schedule_reported_properties_flush(self, delay=None):
+        if self.reported_properties_flush_task is None or self.reported_properties_flush_task.done():
+            self.reported_properties_flush_task = asyncio.ensure_future(self.flush_reported_properties(delay))
+
+    async def flush_reported_properties(self, delay=None):
+        if delay is None:
+            delay = self.reported_properties_coalescing_window
+        await asyncio.sleep(delay)
+        if not await self.write_pending_reported_properties():
+            # back off exponentially while the hub is unreachable
+            retry_delay = min(self.reported_properties_coalescing_window * 2 ** self.reported_properties_failure_count,
+                              self.reported_properties_retry_delay_max)
+            logging.info("device.flush_reported_properties:model_id={model_id} Retrying retry_delay={retry_delay}"
+                         .format(model_id=self.model_id, retry_delay=retry_delay))
+            self.reported_properties_flush_task = asyncio.ensure_future(self.flush_reported_properties(retry_delay))
+
+    async def write_pending_reported_properties(self):
+        prop_dict = self.pending_reported_properties
+        coalesced_count = self.pending_reported_properties_patch_count
+        self.pending_reported_properties = {}
+        self.pending_reported_properties_patch_count = 0
+        if not prop_dict:
+            return True
+
+        try:
             await self.iot_hub_device_client.patch_twin_reported_properties(prop_dict)
+            self.reported_properties_write_count += 1
+            self.reported_properties_last_coalesced_count = coalesced_count
+            self.reported_properties_failure_count = 0
+            logging.info("device.flush_reported_properties:model_id={model_id} "
+                         "coalesced_count={coalesced_count} property_count={property_count}"
+                         .format(model_id=self.model_id, coalesced_count=coalesced_count,
+                                 property_count=len(prop_dict)))
+            return True
+        except asyncio.CancelledError:
+            self.restore_pending_reported_properties(prop_dict, coalesced_count)
+            raise
+        except Exception as ex:
+            self.restore_pending_reported_properties(prop_dict, coalesced_count)
+            self.reported_properties_failure_count += 1
+            logging.error("device.flush_reported_properties:model_id={model_id} "
+                          "Patching reported properties failed error={error}"
+                          .format(model_id=self.model_id, error=ex))
+            return False
+
+    def restore_pending_reported_properties(self, prop_dict, coalesced_count):
+        # patches queued while the write was in flight are newer unless their av says otherwise
+        pending_reported_properties = self.pending_reported_properties
+        self.pending_reported_properties = dict(prop_dict)
+        self.merge_pending_reported_properties(pending_reported_properties)
+        self.pending_reported_properties_patch_count += coalesced_count
+
+    async def shutdown(self):
+        # write the acknowledgements of the last coalescing window before the client goes away
+        if self.reported_properties_flush_task is not None and not self.reported_properties_flush_task.done():
+            self.reported_properties_flush_task.cancel()
+            try:
+                await self.reported_properties_flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.write_pending_reported_properties()
+        await self.iot_hub_device_client.shutdown()
+
+    def get_reported_properties_metrics(self):
+        if self.reported_properties_write_count > 0:
+            coalesced_per_write = self.reported_properties_patch_count / self.reported_properties_write_count
+        else:
+            coalesced_per_write = 0.0
+        return {
+            "reported_properties_patch_count": self.reported_properties_patch_count,
+            "reported_properties_write_count": self.reported_properties_write_count,
+            "reported_properties_last_coalesced_count": self.reported_properties_last_coalesced_count,
+            "reported_properties_coalesced_per_write": coalesced_per_write
+        }
 
     async def send_telemetry(self, telemetry):
         message = Message(json.dumps(telemetry))
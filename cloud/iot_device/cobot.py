@@ -6,18 +6,24 @@ import asyncio
 import inspect
 import logging
 import json
-import URBasic
 import xml.etree.ElementTree as ET
 import time
 from azure.iot.device.common.pipeline.pipeline_exceptions import PipelineNotRunning
 from json import JSONDecodeError
 from threading import Thread
-from cloud.control_task.cobot_control_task import CobotControlTask
+from cloud.control_task.cobot_motion_planner import CobotMotionPlanner
+from cloud.control_task.cobot_motion_queue import CobotMotionQueue, MotionType
+from cloud.control_task.cobot_motion_validator import CobotMotionValidator, CobotMotionValidationError
 from cloud.device import Device
 from cloud.iot_task.cobot_iot_task import CobotIotTask
+from cloud.iot_task.cobot_metrics_iot_task import CobotMetricsIotTask
+from cloud.iot_task.cobot_progress_iot_task import CobotProgressIotTask
+from helper.latency_helper import LatencyStage, LatencyTrace, latency_registry
 from helper.log_text_helper import LogTextHelper, LogTextStatus
+from model.response.control.cancel_motion_control_response_model import CancelMotionControlResponseModel
 from model.response.control.close_popup_control_response_model import ClosePopupControlResponseModel
 from model.response.control.close_safety_popup_control_response_model import CloseSafetyPopupControlResponseModel
+from model.response.control.get_motion_queue_control_response_model import GetMotionQueueControlResponseModel
 from model.response.control.open_popup_control_response_model import OpenPopupControlResponseModel
 from model.response.control.pause_control_response_model import PauseControlResponseModel
 from model.response.control.play_control_response_model import PlayControlResponseModel
@@ -30,16 +36,21 @@ from model.response.control.unlock_protective_stop_control_response_model import
 from model.response.control.move_j_control_response_model import MoveJControlResponseModel
 from model.response.control.move_l_control_response_model import MoveLControlResponseModel
 from model.response.control.move_p_control_response_model import MovePControlResponseModel
+from model.response.control.plan_motion_control_response_model import PlanMotionControlResponseModel
 from model.response.response_model import Status
 from model.response.iot.start_iot_command_response_model import StartIotCommandRespondModel
 from model.response.iot.stop_iot_command_response_model import StopIotCommandRespondModel
 from model.response.control.enable_control_response_model import EnableControlResponseModel
 from model.response.control.disable_control_response_model import DisableControlResponseModel
+from model.request.cancel_motion_control_request_model import CancelMotionControlRequestModel
 from model.request.move_j_control_request_model import MoveJControlRequestModel
 from model.request.move_l_control_request_model import MoveLControlRequestModel
 from model.request.move_p_control_request_model import MovePControlRequestModel
 from model.request.open_popup_control_request_model import OpenPopupControlRequestModel
+from model.request.plan_motion_control_request_model import PlanMotionControlRequestModel
 from model.rtdl.rtdl_dt_model import RtdlDtModel
+from URBasic.asyncDashboard import AsyncDashBoard, DashBoardNotConnectedError
+from URBasic.robotStateCache import RobotStateCache
 
 
 class Cobot(object):
@@ -53,7 +64,9 @@ class Cobot(object):
                  id_scope,
                  registration_id,
                  symmetric_key,
-                 cache_json_path):
+                 cache_json_path,
+                 robot_connection_manager,
+                 robot_type="ur10"):
         self.__rtde_host = rtde_host
         self.__rtde_port = rtde_port
         self.__control_configuration_path = control_configuration_path
@@ -64,20 +77,32 @@ class Cobot(object):
         self.__registration_id = registration_id
         self.__symmetric_key = symmetric_key
         self.__cache_json_path = cache_json_path
+        self.__robot_connection_manager = robot_connection_manager
+        self.__robot_type = robot_type
         self.__cobot_device = None
         self.__ur_script_ext = None
-        self.__cobot_control_task = None
+        self.__dashboard_client = None
+        self.__robot_state_cache = None
         self.__cobot_iot_task = None
-        self.__cobot_control_thread = None
         self.__cobot_iot_thread = None
+        self.__cobot_metrics_iot_task = None
+        self.__cobot_progress_iot_task = None
         self.__is_ur_basic_running = False
-        self.__cobot_control_lock = True
+        chunk_size = self.get_chunk_size(control_configuration_path=control_configuration_path)
+        self.__cobot_motion_queue = CobotMotionQueue(chunk_size=chunk_size)
+        self.__cobot_motion_planner = CobotMotionPlanner(chunk_size=chunk_size)
+        # the waypoint check shares the thresholds of the singularity monitor watching the live robot
+        self.__cobot_motion_validator = CobotMotionValidator(
+            robot_type=robot_type, singularity_monitor=robot_connection_manager.get_singularity_monitor())
         self.__cobot_iot_lock = True
         self.__enable_control_response_model = None
         self.__disable_control_response_model = None
         self.__move_j_control_response_model = None
         self.__move_l_control_response_model = None
         self.__move_p_control_response_model = None
+        self.__plan_motion_control_response_model = None
+        self.__get_motion_queue_control_response_model = None
+        self.__cancel_motion_control_response_model = None
         self.__pause_control_response_model = None
         self.__play_control_response_model = None
         self.__power_on_control_response_model = None
@@ -92,6 +117,14 @@ class Cobot(object):
         self.__stop_iot_command_response_model = None
         self.__log_text_helper = LogTextHelper(class_name=self.__class__.__name__)
 
+    @staticmethod
+    def get_chunk_size(control_configuration_path):
+        # the planner and the queue share one chunk size, so planned durations match the executed programs
+        config_element_tree = ET.parse(control_configuration_path)
+        chunk_size = int(config_element_tree.findtext('settings/chunk_size', default="0"))
+        logging.info("cobot.get_chunk_size:chunk_size={chunk_size}".format(chunk_size=chunk_size))
+        return chunk_size if chunk_size > 0 else None
+
     def stdin_listener(self):
         while True:
             config_element_tree = ET.parse(self.__cobot_client_configuration_path)
@@ -99,8 +132,8 @@ class Cobot(object):
             process_continue = cobot_configuration.find('status').text
             if process_continue == "False":
                 try:
-                    self.__ur_script_ext.close()
-                    self.__cobot_control_lock = True
+                    self.__cobot_motion_queue.terminate()
+                    self.__robot_connection_manager.close()
                 except AttributeError:
                     logging.error("cobot.stdin_listener:No UR Script Ext error=AttributeError")
                 logging.info("cobot.stdin_listener:break process_continue={process_continue}"
@@ -109,61 +142,6 @@ class Cobot(object):
             else:
                 time.sleep(1)
 
-    def move_j_control_task_callback(self, move_j_control_model):
-        if not self.__cobot_control_lock:
-            log_text = self.__log_text_helper.get_log_text(
-                status=LogTextStatus.STARTING,
-                command_name=inspect.currentframe().f_code.co_name,
-                input_dictionary={
-                    "cobot_control_lock": self.__cobot_control_lock
-                })
-            logging.info(log_text)
-
-            self.__cobot_control_lock = True
-            self.__cobot_control_task = CobotControlTask(robot=self.__ur_script_ext)
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                loop.run_until_complete(self.__cobot_control_task.move_j(move_j_control_model=move_j_control_model))
-
-                log_text = self.__log_text_helper.get_log_text(
-                    status=LogTextStatus.COMPLETED,
-                    command_name=inspect.currentframe().f_code.co_name,
-                    input_dictionary={
-                        "cobot_control_lock": self.__cobot_control_lock
-                    })
-                logging.info(log_text)
-            except RuntimeError:
-                log_text = self.__log_text_helper.get_log_text(
-                    status=LogTextStatus.ERROR,
-                    command_name=inspect.currentframe().f_code.co_name,
-                    input_dictionary={
-                        "error": RuntimeError.__dict__
-                    })
-                logging.error(log_text)
-
-            loop.close()
-            self.__cobot_control_lock = False
-
-            log_text = self.__log_text_helper.get_log_text(
-                status=LogTextStatus.COMPLETED,
-                command_name=inspect.currentframe().f_code.co_name,
-                input_dictionary={
-                    "cobot_control_lock": self.__cobot_control_lock
-                })
-            logging.info(log_text)
-        else:
-            self.__cobot_control_lock = True
-
-            log_text = self.__log_text_helper.get_log_text(
-                status=LogTextStatus.ERROR,
-                command_name=inspect.currentframe().f_code.co_name,
-                input_dictionary={
-                    "cobot_control_lock": self.__cobot_control_lock
-                })
-            logging.error(log_text)
-
     async def move_j_control_command_handler(self, values):
         self.__move_j_control_response_model = MoveJControlResponseModel()
         if self.__is_ur_basic_running:
@@ -179,9 +157,23 @@ class Cobot(object):
 
                 move_j_control_request_model = MoveJControlRequestModel\
                     .get_move_j_control_request_model_from_values(values)
-                self.__cobot_control_thread = Thread(target=self.move_j_control_task_callback,
-                                                     args=(move_j_control_request_model,))
-                self.__cobot_control_thread.start()
+                LatencyTrace.mark_current(LatencyStage.PARSE)
+                validation_result = self.__cobot_motion_validator.check(motion_type=MotionType.MOVE_J,
+                                                                        request_model=move_j_control_request_model)
+                self.__move_j_control_response_model.validation = validation_result.get()
+                motion_plan = self.__cobot_motion_planner.plan(
+                    motion_type=MotionType.MOVE_J,
+                    request_model=move_j_control_request_model,
+                    start_position=self.get_start_position(motion_type=MotionType.MOVE_J))
+                motion = self.__cobot_motion_queue.enqueue(motion_type=MotionType.MOVE_J,
+                                                           request_model=move_j_control_request_model,
+                                                           priority=move_j_control_request_model.priority,
+                                                           motion_plan=motion_plan)
+                self.__move_j_control_response_model.motion_id = motion.motion_id
+                self.__move_j_control_response_model.queue_length = self.__cobot_motion_queue.get_queue_length()
+                self.__move_j_control_response_model.expected_duration = motion_plan.total_duration
+                self.__move_j_control_response_model.expected_completion_time = \
+                    self.__cobot_motion_queue.get_expected_completion_time(motion)
 
                 log_text = self.__log_text_helper.get_log_text(
                     status=LogTextStatus.COMPLETED,
@@ -190,7 +182,8 @@ class Cobot(object):
                         "values": values,
                         "is_ur_basic_running": self.__is_ur_basic_running,
                         "move_j_control_request_model": move_j_control_request_model.__dict__,
-                        "move_j_control_request_model_type": str(type(move_j_control_request_model))
+                        "move_j_control_request_model_type": str(type(move_j_control_request_model)),
+                        "motion_id": motion.motion_id
                     })
                 logging.info(log_text)
                 self.__move_j_control_response_model \
@@ -208,6 +201,46 @@ class Cobot(object):
                 logging.info(log_text)
                 self.__move_j_control_response_model \
                     .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
+            except KeyError:
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": "KeyError"
+                    })
+                logging.info(log_text)
+                self.__move_j_control_response_model \
+                    .set_response(status=Status.COMMAND_SYNTAX_ERROR, log_text=log_text)
+            except CobotMotionValidationError as cobot_motion_validation_error:
+                validation = cobot_motion_validation_error.cobot_motion_validation_result.get()
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": "CobotMotionValidationError",
+                        "validation": validation
+                    })
+                logging.info(log_text)
+                self.__move_j_control_response_model.validation = validation
+                self.__move_j_control_response_model \
+                    .set_response(status=Status.COMMAND_VALIDATION_ERROR, log_text=log_text)
+            except (ValueError, TypeError, ZeroDivisionError) as error:
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": type(error).__name__,
+                        "message": str(error)
+                    })
+                logging.info(log_text)
+                self.__move_j_control_response_model \
+                    .set_response(status=Status.COMMAND_SYNTAX_ERROR, log_text=log_text)
         else:
             log_text = self.__log_text_helper.get_log_text(
                 status=LogTextStatus.ERROR,
@@ -221,8 +254,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def move_j_control_response_handler(self, values):
-        response_payload = json.dumps(self.__move_j_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__move_j_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -232,34 +264,6 @@ class Cobot(object):
             }))
         return response_payload
 
-    def move_p_control_task_callback(self, move_p_control_model):
-        if not self.__cobot_control_lock:
-            logging.info("cobot.move_p_control_task_callback:__cobot_control_lock={cobot_control_lock}"
-                         .format(cobot_control_lock=self.__cobot_control_lock))
-            self.__cobot_control_lock = True
-            logging.info("cobot.move_p_control_task_callback:Robot initialised")
-
-            self.__cobot_control_task = CobotControlTask(robot=self.__ur_script_ext)
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                loop.run_until_complete(self.__cobot_control_task.move_p(move_p_control_model=move_p_control_model))
-
-                logging.info('cobot.move_p_control_task_callback:Thread completed')
-            except RuntimeError:
-                logging.error('cobot.move_p_control_task_callback:Thread failed runtime_error={runtime_error}'
-                              .format(runtime_error=RuntimeError.__dict__))
-            logging.info('cobot.move_p_control_task_callback:Close')
-
-            loop.close()
-            self.__cobot_control_lock = False
-
-        else:
-            logging.error("cobot.move_p_control_task_callback:__cobot_control_lock={cobot_control_lock}"
-                          .format(cobot_control_lock=self.__cobot_control_lock))
-            self.__cobot_control_lock = True
-
     async def move_p_control_command_handler(self, values):
         self.__move_p_control_response_model = MovePControlResponseModel()
         if self.__is_ur_basic_running:
@@ -275,9 +279,25 @@ class Cobot(object):
 
                 move_p_control_request_model = MovePControlRequestModel\
                     .get_move_p_control_request_model_from_values(values)
-                self.__cobot_control_thread = Thread(target=self.move_p_control_task_callback,
-                                                     args=(move_p_control_request_model,))
-                self.__cobot_control_thread.start()
+                LatencyTrace.mark_current(LatencyStage.PARSE)
+                validation_result = self.__cobot_motion_validator.check(
+                    motion_type=MotionType.MOVE_P,
+                    request_model=move_p_control_request_model,
+                    start_joint_position=self.get_start_position(motion_type=MotionType.MOVE_J))
+                self.__move_p_control_response_model.validation = validation_result.get()
+                motion_plan = self.__cobot_motion_planner.plan(
+                    motion_type=MotionType.MOVE_P,
+                    request_model=move_p_control_request_model,
+                    start_position=self.get_start_position(motion_type=MotionType.MOVE_P))
+                motion = self.__cobot_motion_queue.enqueue(motion_type=MotionType.MOVE_P,
+                                                           request_model=move_p_control_request_model,
+                                                           priority=move_p_control_request_model.priority,
+                                                           motion_plan=motion_plan)
+                self.__move_p_control_response_model.motion_id = motion.motion_id
+                self.__move_p_control_response_model.queue_length = self.__cobot_motion_queue.get_queue_length()
+                self.__move_p_control_response_model.expected_duration = motion_plan.total_duration
+                self.__move_p_control_response_model.expected_completion_time = \
+                    self.__cobot_motion_queue.get_expected_completion_time(motion)
 
                 log_text = self.__log_text_helper.get_log_text(
                     status=LogTextStatus.COMPLETED,
@@ -286,7 +306,8 @@ class Cobot(object):
                         "values": values,
                         "is_ur_basic_running": self.__is_ur_basic_running,
                         "move_p_control_request_model": move_p_control_request_model.__dict__,
-                        "move_p_control_request_model_type": str(type(move_p_control_request_model))
+                        "move_p_control_request_model_type": str(type(move_p_control_request_model)),
+                        "motion_id": motion.motion_id
                     })
                 logging.info(log_text)
                 self.__move_p_control_response_model \
@@ -303,6 +324,46 @@ class Cobot(object):
                 logging.info(log_text)
                 self.__move_p_control_response_model \
                     .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
+            except KeyError:
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": "KeyError"
+                    })
+                logging.info(log_text)
+                self.__move_p_control_response_model \
+                    .set_response(status=Status.COMMAND_SYNTAX_ERROR, log_text=log_text)
+            except CobotMotionValidationError as cobot_motion_validation_error:
+                validation = cobot_motion_validation_error.cobot_motion_validation_result.get()
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": "CobotMotionValidationError",
+                        "validation": validation
+                    })
+                logging.info(log_text)
+                self.__move_p_control_response_model.validation = validation
+                self.__move_p_control_response_model \
+                    .set_response(status=Status.COMMAND_VALIDATION_ERROR, log_text=log_text)
+            except (ValueError, TypeError, ZeroDivisionError) as error:
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": type(error).__name__,
+                        "message": str(error)
+                    })
+                logging.info(log_text)
+                self.__move_p_control_response_model \
+                    .set_response(status=Status.COMMAND_SYNTAX_ERROR, log_text=log_text)
         else:
             log_text = self.__log_text_helper.get_log_text(
                 status=LogTextStatus.ERROR,
@@ -316,8 +377,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def move_p_control_response_handler(self, values):
-        response_payload = json.dumps(self.__move_p_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__move_p_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -327,58 +387,6 @@ class Cobot(object):
             }))
         return response_payload
 
-    def move_l_control_task_callback(self, move_l_control_model):
-        if not self.__cobot_control_lock:
-            log_text = self.__log_text_helper.get_log_text(
-                status=LogTextStatus.STARTING,
-                command_name=inspect.currentframe().f_code.co_name,
-                input_dictionary={
-                    "cobot_control_lock": self.__cobot_control_lock
-                })
-            logging.info(log_text)
-
-            self.__cobot_control_lock = True
-            self.__cobot_control_task = CobotControlTask(robot=self.__ur_script_ext)
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(self.__cobot_control_task.move_l(move_l_control_model=move_l_control_model))
-                log_text = self.__log_text_helper.get_log_text(
-                    status=LogTextStatus.COMPLETED,
-                    command_name=inspect.currentframe().f_code.co_name,
-                    input_dictionary={
-                        "cobot_control_lock": self.__cobot_control_lock
-                    })
-                logging.info(log_text)
-            except RuntimeError:
-                log_text = self.__log_text_helper.get_log_text(
-                    status=LogTextStatus.ERROR,
-                    command_name=inspect.currentframe().f_code.co_name,
-                    input_dictionary={
-                        "error": RuntimeError.__dict__
-                    })
-                logging.error(log_text)
-
-            loop.close()
-            self.__cobot_control_lock = False
-
-            log_text = self.__log_text_helper.get_log_text(
-                status=LogTextStatus.COMPLETED,
-                command_name=inspect.currentframe().f_code.co_name,
-                input_dictionary={
-                    "cobot_control_lock": self.__cobot_control_lock
-                })
-            logging.info(log_text)
-        else:
-            self.__cobot_control_lock = True
-            log_text = self.__log_text_helper.get_log_text(
-                status=LogTextStatus.ERROR,
-                command_name=inspect.currentframe().f_code.co_name,
-                input_dictionary={
-                    "cobot_control_lock": self.__cobot_control_lock
-                })
-            logging.error(log_text)
-
     async def move_l_control_command_handler(self, values):
         self.__move_l_control_response_model = MoveLControlResponseModel()
         if self.__is_ur_basic_running:
@@ -394,9 +402,25 @@ class Cobot(object):
 
                 move_l_control_request_model = MoveLControlRequestModel\
                     .get_move_l_control_request_model_from_values(values)
-                self.__cobot_control_thread = Thread(target=self.move_l_control_task_callback,
-                                                     args=(move_l_control_request_model,))
-                self.__cobot_control_thread.start()
+                LatencyTrace.mark_current(LatencyStage.PARSE)
+                validation_result = self.__cobot_motion_validator.check(
+                    motion_type=MotionType.MOVE_L,
+                    request_model=move_l_control_request_model,
+                    start_joint_position=self.get_start_position(motion_type=MotionType.MOVE_J))
+                self.__move_l_control_response_model.validation = validation_result.get()
+                motion_plan = self.__cobot_motion_planner.plan(
+                    motion_type=MotionType.MOVE_L,
+                    request_model=move_l_control_request_model,
+                    start_position=self.get_start_position(motion_type=MotionType.MOVE_L))
+                motion = self.__cobot_motion_queue.enqueue(motion_type=MotionType.MOVE_L,
+                                                           request_model=move_l_control_request_model,
+                                                           priority=move_l_control_request_model.priority,
+                                                           motion_plan=motion_plan)
+                self.__move_l_control_response_model.motion_id = motion.motion_id
+                self.__move_l_control_response_model.queue_length = self.__cobot_motion_queue.get_queue_length()
+                self.__move_l_control_response_model.expected_duration = motion_plan.total_duration
+                self.__move_l_control_response_model.expected_completion_time = \
+                    self.__cobot_motion_queue.get_expected_completion_time(motion)
 
                 log_text = self.__log_text_helper.get_log_text(
                     status=LogTextStatus.COMPLETED,
@@ -405,7 +429,8 @@ class Cobot(object):
                         "values": values,
                         "is_ur_basic_running": self.__is_ur_basic_running,
                         "move_l_control_model": move_l_control_request_model.__dict__,
-                        "move_l_control_model_type": str(type(move_l_control_request_model))
+                        "move_l_control_model_type": str(type(move_l_control_request_model)),
+                        "motion_id": motion.motion_id
                     })
                 logging.info(log_text)
                 self.__move_l_control_response_model \
@@ -423,6 +448,46 @@ class Cobot(object):
                 logging.info(log_text)
                 self.__move_l_control_response_model \
                     .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
+            except KeyError:
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": "KeyError"
+                    })
+                logging.info(log_text)
+                self.__move_l_control_response_model \
+                    .set_response(status=Status.COMMAND_SYNTAX_ERROR, log_text=log_text)
+            except CobotMotionValidationError as cobot_motion_validation_error:
+                validation = cobot_motion_validation_error.cobot_motion_validation_result.get()
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": "CobotMotionValidationError",
+                        "validation": validation
+                    })
+                logging.info(log_text)
+                self.__move_l_control_response_model.validation = validation
+                self.__move_l_control_response_model \
+                    .set_response(status=Status.COMMAND_VALIDATION_ERROR, log_text=log_text)
+            except (ValueError, TypeError, ZeroDivisionError) as error:
+                log_text = self.__log_text_helper.get_log_text(
+                    status=LogTextStatus.ERROR,
+                    command_name=inspect.currentframe().f_code.co_name,
+                    input_dictionary={
+                        "values": values,
+                        "is_ur_basic_running": self.__is_ur_basic_running,
+                        "error": type(error).__name__,
+                        "message": str(error)
+                    })
+                logging.info(log_text)
+                self.__move_l_control_response_model \
+                    .set_response(status=Status.COMMAND_SYNTAX_ERROR, log_text=log_text)
         else:
             log_text = self.__log_text_helper.get_log_text(
                 status=LogTextStatus.ERROR,
@@ -436,8 +501,216 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def move_l_control_response_handler(self, values):
-        response_payload = json.dumps(self.__move_l_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__move_l_control_response_model.to_json()
+        logging.info(self.__log_text_helper.get_log_text(
+            status=LogTextStatus.COMPLETED,
+            command_name=inspect.currentframe().f_code.co_name,
+            input_dictionary={
+                "values": values,
+                "response_payload": response_payload
+            }))
+        return response_payload
+
+    async def plan_motion_control_command_handler(self, values):
+        self.__plan_motion_control_response_model = PlanMotionControlResponseModel()
+        try:
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.STARTING,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running
+                })
+            logging.info(log_text)
+
+            plan_motion_control_request_model = PlanMotionControlRequestModel \
+                .get_plan_motion_control_request_model_from_values(values)
+            move_control_request_model = plan_motion_control_request_model.move_control_request_model
+            validation_result = self.__cobot_motion_validator.validate(
+                motion_type=plan_motion_control_request_model.motion_type,
+                request_model=move_control_request_model,
+                start_joint_position=self.get_start_position(motion_type=MotionType.MOVE_J))
+            motion_plan = self.__cobot_motion_planner.plan(
+                motion_type=plan_motion_control_request_model.motion_type,
+                request_model=move_control_request_model,
+                start_position=self.get_start_position(motion_type=plan_motion_control_request_model.motion_type))
+            expected_start_time = self.__cobot_motion_queue.get_expected_start_time(
+                priority=move_control_request_model.priority)
+            self.__plan_motion_control_response_model.motion_plan = motion_plan.get()
+            self.__plan_motion_control_response_model.validation = validation_result.get()
+            self.__plan_motion_control_response_model.expected_start_time = expected_start_time
+            self.__plan_motion_control_response_model.expected_completion_time = \
+                expected_start_time + motion_plan.total_duration
+
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.COMPLETED,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running,
+                    "motion_type": plan_motion_control_request_model.motion_type,
+                    "total_duration": motion_plan.total_duration
+                })
+            logging.info(log_text)
+            self.__plan_motion_control_response_model \
+                .set_response(status=Status.COBOT_CLIENT_EXECUTED, log_text=log_text)
+
+        except JSONDecodeError:
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.ERROR,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running,
+                    "error": "JSONDecodeError"
+                })
+            logging.info(log_text)
+            self.__plan_motion_control_response_model \
+                .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
+        except KeyError:
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.ERROR,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running,
+                    "error": "KeyError"
+                })
+            logging.info(log_text)
+            self.__plan_motion_control_response_model \
+                .set_response(status=Status.COMMAND_SYNTAX_ERROR, log_text=log_text)
+        except (ValueError, TypeError, ZeroDivisionError) as error:
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.ERROR,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running,
+                    "error": type(error).__name__,
+                    "message": str(error)
+                })
+            logging.info(log_text)
+            self.__plan_motion_control_response_model \
+                .set_response(status=Status.COMMAND_SYNTAX_ERROR, log_text=log_text)
+
+    def plan_motion_control_response_handler(self, values):
+        response_payload = self.__plan_motion_control_response_model.to_json()
+        logging.info(self.__log_text_helper.get_log_text(
+            status=LogTextStatus.COMPLETED,
+            command_name=inspect.currentframe().f_code.co_name,
+            input_dictionary={
+                "values": values,
+                "response_payload": response_payload
+            }))
+        return response_payload
+
+    async def get_motion_queue_control_command_handler(self, values):
+        self.__get_motion_queue_control_response_model = GetMotionQueueControlResponseModel()
+        if self.__is_ur_basic_running:
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.STARTING,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running
+                })
+            logging.info(log_text)
+
+            running_motion = self.__cobot_motion_queue.get_running_motion()
+            if running_motion is not None:
+                self.__get_motion_queue_control_response_model.running_motion = running_motion.get()
+            for queued_motion in self.__cobot_motion_queue.get_queued_motions():
+                self.__get_motion_queue_control_response_model.queued_motion_array = queued_motion.get()
+            self.__get_motion_queue_control_response_model.is_held = self.__cobot_motion_queue.is_held()
+
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.COMPLETED,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running,
+                    "motion_queue_held": self.__cobot_motion_queue.is_held(),
+                    "queue_length": self.__cobot_motion_queue.get_queue_length()
+                })
+            logging.info(log_text)
+            self.__get_motion_queue_control_response_model \
+                .set_response(status=Status.COBOT_CLIENT_EXECUTED, log_text=log_text)
+        else:
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.ERROR,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running
+                })
+            logging.info(log_text)
+            self.__get_motion_queue_control_response_model \
+                .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
+
+    def get_motion_queue_control_response_handler(self, values):
+        response_payload = self.__get_motion_queue_control_response_model.to_json()
+        logging.info(self.__log_text_helper.get_log_text(
+            status=LogTextStatus.COMPLETED,
+            command_name=inspect.currentframe().f_code.co_name,
+            input_dictionary={
+                "values": values,
+                "response_payload": response_payload
+            }))
+        return response_payload
+
+    async def cancel_motion_control_command_handler(self, values):
+        self.__cancel_motion_control_response_model = CancelMotionControlResponseModel()
+        if self.__is_ur_basic_running:
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.STARTING,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running
+                })
+            logging.info(log_text)
+
+            cancel_motion_control_request_model = CancelMotionControlRequestModel\
+                .get_cancel_motion_control_request_model_from_values(values)
+            if cancel_motion_control_request_model.motion_id is None:
+                cancelled_motions = self.__cobot_motion_queue.cancel_all()
+            else:
+                cancelled_motion = self.__cobot_motion_queue.cancel(
+                    motion_id=cancel_motion_control_request_model.motion_id)
+                cancelled_motions = [] if cancelled_motion is None else [cancelled_motion]
+            for cancelled_motion in cancelled_motions:
+                self.__cancel_motion_control_response_model.cancelled_motion_array = cancelled_motion.get()
+
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.COMPLETED,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running,
+                    "motion_id": cancel_motion_control_request_model.motion_id,
+                    "cancelled_motions": len(cancelled_motions)
+                })
+            logging.info(log_text)
+            if len(cancelled_motions) > 0 or cancel_motion_control_request_model.motion_id is None:
+                self.__cancel_motion_control_response_model \
+                    .set_response(status=Status.COBOT_CLIENT_EXECUTED, log_text=log_text)
+            else:
+                self.__cancel_motion_control_response_model \
+                    .set_response(status=Status.COMMAND_EXECUTION_SEQUENCE_ERROR, log_text=log_text)
+        else:
+            log_text = self.__log_text_helper.get_log_text(
+                status=LogTextStatus.ERROR,
+                command_name=inspect.currentframe().f_code.co_name,
+                input_dictionary={
+                    "values": values,
+                    "is_ur_basic_running": self.__is_ur_basic_running
+                })
+            logging.info(log_text)
+            self.__cancel_motion_control_response_model \
+                .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
+
+    def cancel_motion_control_response_handler(self, values):
+        response_payload = self.__cancel_motion_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -456,15 +729,21 @@ class Cobot(object):
                 input_dictionary={
                     "values": values,
                     "rtde_host": self.__rtde_host,
-                    "cobot_control_lock": self.__cobot_control_lock,
+                    "motion_queue_held": self.__cobot_motion_queue.is_held(),
                     "is_ur_basic_running": self.__is_ur_basic_running
                 })
             logging.info(log_text)
 
-            robotModel = URBasic.robotModel.RobotModel()
-            self.__ur_script_ext = URBasic.urScriptExt.UrScriptExt(host=self.__rtde_host, robotModel=robotModel)
-            self.__ur_script_ext.reset_error()
-            self.__cobot_control_lock = False
+            loop = asyncio.get_running_loop()
+            self.__ur_script_ext = await loop.run_in_executor(None, self.__robot_connection_manager.enable_control)
+            self.__cobot_motion_queue.start(robot=self.__ur_script_ext,
+                                            position_provider=lambda motion_type: self.get_actual_position(
+                                                motion_type=motion_type))
+            if self.__dashboard_client is None or not self.__dashboard_client.IsConnected():
+                self.__dashboard_client = AsyncDashBoard(host=self.__rtde_host)
+                await self.__dashboard_client.connect()
+            self.__robot_state_cache = RobotStateCache(robotModel=self.__ur_script_ext.robotConnector.RobotModel,
+                                                       dashboard=self.__dashboard_client)
             self.__is_ur_basic_running = True
             self.__enable_control_response_model.elapsed_time = self.__ur_script_ext.get_elapsed_time()
 
@@ -474,7 +753,7 @@ class Cobot(object):
                 input_dictionary={
                     "values": values,
                     "rtde_host": self.__rtde_host,
-                    "cobot_control_lock": self.__cobot_control_lock,
+                    "motion_queue_held": self.__cobot_motion_queue.is_held(),
                     "is_ur_basic_running": self.__is_ur_basic_running
                 })
             logging.info(log_text)
@@ -487,7 +766,7 @@ class Cobot(object):
                 input_dictionary={
                     "values": values,
                     "rtde_host": self.__rtde_host,
-                    "cobot_control_lock": self.__cobot_control_lock,
+                    "motion_queue_held": self.__cobot_motion_queue.is_held(),
                     "is_ur_basic_running": self.__is_ur_basic_running
                 })
             logging.info(log_text)
@@ -496,9 +775,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def enable_control_response_handler(self, values):
-        response_payload = json.dumps(self.__enable_control_response_model.get(),
-                                      default=lambda o: o.__dict__,
-                                      sort_keys=True)
+        response_payload = self.__enable_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -519,8 +796,10 @@ class Cobot(object):
                 })
             logging.info(log_text)
 
-            self.__ur_script_ext.close()
-            self.__cobot_control_lock = True
+            # terminate joins the worker thread, off the event loop so the other listeners keep running
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.__cobot_motion_queue.terminate)
+            self.__robot_connection_manager.disable_control()
             self.__is_ur_basic_running = False
 
             log_text = self.__log_text_helper.get_log_text(
@@ -528,7 +807,7 @@ class Cobot(object):
                 command_name=inspect.currentframe().f_code.co_name,
                 input_dictionary={
                     "values": values,
-                    "cobot_control_lock": self.__cobot_control_lock,
+                    "motion_queue_held": self.__cobot_motion_queue.is_held(),
                 })
             self.__disable_control_response_model \
                 .set_response(status=Status.COBOT_CLIENT_EXECUTED, log_text=log_text)
@@ -539,7 +818,7 @@ class Cobot(object):
                 input_dictionary={
                     "values": values,
                     "rtde_host": self.__rtde_host,
-                    "cobot_control_lock": self.__cobot_control_lock,
+                    "motion_queue_held": self.__cobot_motion_queue.is_held(),
                     "is_ur_basic_running": self.__is_ur_basic_running
                 })
             logging.info(log_text)
@@ -547,8 +826,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def disable_control_response_handler(self, values):
-        response_payload = json.dumps(self.__disable_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__disable_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -570,11 +848,18 @@ class Cobot(object):
                 })
             logging.info(log_text)
 
-            self.__ur_script_ext.pause()
-            time.sleep(5)
+            self.__cobot_motion_queue.hold()
+            # stopj waits for the running program thread, so it runs off the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.__cobot_motion_queue.preempt)
+            if not await self.send_dashboard_command(command="pause", fallback=self.__ur_script_ext.pause):
+                self.set_dashboard_error_response(response_model=self.__pause_control_response_model,
+                                                  command_name=inspect.currentframe().f_code.co_name,
+                                                  command="pause", values=values)
+                return
+            await asyncio.sleep(5)
             self.__pause_control_response_model.robot_mode = self.__ur_script_ext.get_robot_mode()
             self.__pause_control_response_model.robot_status = self.__ur_script_ext.get_robot_status()
-            self.__cobot_control_lock = True
 
             log_text = self.__log_text_helper.get_log_text(
                 status=LogTextStatus.COMPLETED,
@@ -582,7 +867,7 @@ class Cobot(object):
                 input_dictionary={
                     "values": values,
                     "is_ur_basic_running": self.__is_ur_basic_running,
-                    "cobot_control_lock": self.__cobot_control_lock
+                    "motion_queue_held": self.__cobot_motion_queue.is_held()
                 })
             logging.info(log_text)
             self.__pause_control_response_model \
@@ -600,8 +885,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def pause_control_response_handler(self, values):
-        response_payload = json.dumps(self.__pause_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__pause_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -623,9 +907,13 @@ class Cobot(object):
                 })
             logging.info(log_text)
 
-            self.__ur_script_ext.play()
-            self.__cobot_control_lock = False
-            time.sleep(5)
+            if not await self.send_dashboard_command(command="play", fallback=self.__ur_script_ext.play):
+                self.set_dashboard_error_response(response_model=self.__play_control_response_model,
+                                                  command_name=inspect.currentframe().f_code.co_name,
+                                                  command="play", values=values)
+                return
+            self.__cobot_motion_queue.resume()
+            await asyncio.sleep(5)
             self.__play_control_response_model.robot_mode = self.__ur_script_ext.get_robot_mode()
             self.__play_control_response_model.robot_status = self.__ur_script_ext.get_robot_status()
 
@@ -652,8 +940,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def play_control_response_handler(self, values):
-        response_payload = json.dumps(self.__play_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__play_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -675,9 +962,14 @@ class Cobot(object):
                 })
             logging.info(log_text)
 
-            self.__ur_script_ext.unlock_protective_stop()
-            self.__cobot_control_lock = False
-            time.sleep(5)
+            if not await self.send_dashboard_command(command="unlock protective stop",
+                                                     fallback=self.__ur_script_ext.unlock_protective_stop):
+                self.set_dashboard_error_response(response_model=self.__unlock_protective_stop_control_response_model,
+                                                  command_name=inspect.currentframe().f_code.co_name,
+                                                  command="unlock protective stop", values=values)
+                return
+            self.__cobot_motion_queue.resume()
+            await asyncio.sleep(5)
             self.__unlock_protective_stop_control_response_model.robot_mode = self.__ur_script_ext.get_robot_mode()
             self.__unlock_protective_stop_control_response_model.robot_status = self.__ur_script_ext.get_robot_status()
             self.__unlock_protective_stop_control_response_model.robot_safety_status \
@@ -706,8 +998,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def unlock_protective_stop_control_response_handler(self, values):
-        response_payload = json.dumps(self.__unlock_protective_stop_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__unlock_protective_stop_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -730,9 +1021,14 @@ class Cobot(object):
                 })
             logging.info(log_text)
 
-            self.__ur_script_ext.close_safety_popup()
-            self.__cobot_control_lock = False
-            time.sleep(5)
+            if not await self.send_dashboard_command(command="close safety popup",
+                                                     fallback=self.__ur_script_ext.close_safety_popup):
+                self.set_dashboard_error_response(response_model=self.__close_safety_popup_control_response_model,
+                                                  command_name=inspect.currentframe().f_code.co_name,
+                                                  command="close safety popup", values=values)
+                return
+            self.__cobot_motion_queue.resume()
+            await asyncio.sleep(5)
 
             self.__close_safety_popup_control_response_model.robot_mode = self.__ur_script_ext.get_robot_mode()
             self.__close_safety_popup_control_response_model.robot_status = self.__ur_script_ext.get_robot_status()
@@ -762,8 +1058,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def close_safety_popup_control_response_handler(self, values):
-        response_payload = json.dumps(self.__close_safety_popup_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__close_safety_popup_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -789,7 +1084,15 @@ class Cobot(object):
             open_popup_control_request_model = OpenPopupControlRequestModel\
                 .get_open_popup_control_request_model_from_values(values)
             logging.info(open_popup_control_request_model.popup_text)
-            self.__ur_script_ext.open_popup(popup_text=open_popup_control_request_model.popup_text)
+            popup_command = "popup " + open_popup_control_request_model.popup_text
+            if not await self.send_dashboard_command(
+                    command=popup_command,
+                    fallback=lambda: self.__ur_script_ext.open_popup(
+                        popup_text=open_popup_control_request_model.popup_text)):
+                self.set_dashboard_error_response(response_model=self.__open_popup_control_response_model,
+                                                  command_name=inspect.currentframe().f_code.co_name,
+                                                  command=popup_command, values=values)
+                return
 
             log_text = self.__log_text_helper.get_log_text(
                 status=LogTextStatus.RUNNING,
@@ -814,8 +1117,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def open_popup_control_response_handler(self, values):
-        response_payload = json.dumps(self.__open_popup_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__open_popup_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -838,7 +1140,11 @@ class Cobot(object):
                 })
             logging.info(log_text)
 
-            self.__ur_script_ext.close_popup()
+            if not await self.send_dashboard_command(command="close popup", fallback=self.__ur_script_ext.close_popup):
+                self.set_dashboard_error_response(response_model=self.__close_popup_control_response_model,
+                                                  command_name=inspect.currentframe().f_code.co_name,
+                                                  command="close popup", values=values)
+                return
 
             log_text = self.__log_text_helper.get_log_text(
                 status=LogTextStatus.RUNNING,
@@ -863,8 +1169,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def close_popup_control_response_handler(self, values):
-        response_payload = json.dumps(self.__close_popup_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__close_popup_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -887,8 +1192,13 @@ class Cobot(object):
                 })
             logging.info(log_text)
 
-            self.__ur_script_ext.power_on()
-            time.sleep(5)
+            if not await self.send_dashboard_command(command="power on", fallback=self.__ur_script_ext.power_on):
+                self.set_dashboard_error_response(response_model=self.__power_on_control_response_model,
+                                                  command_name=inspect.currentframe().f_code.co_name,
+                                                  command="power on", values=values)
+                return
+            self.__cobot_motion_queue.resume()
+            await self.wait_for_robot_mode(mode_array=["IDLE", "RUNNING"], timeout=5)
             self.__power_on_control_response_model.robot_mode = self.__ur_script_ext.get_robot_mode()
             self.__power_on_control_response_model.robot_status = self.__ur_script_ext.get_robot_status()
 
@@ -915,8 +1225,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def power_on_control_response_handler(self, values):
-        response_payload = json.dumps(self.__power_on_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__power_on_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -938,8 +1247,16 @@ class Cobot(object):
                 })
             logging.info(log_text)
 
-            self.__ur_script_ext.power_off()
-            time.sleep(5)
+            self.__cobot_motion_queue.hold()
+            # stopj waits for the running program thread, so it runs off the event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.__cobot_motion_queue.preempt)
+            if not await self.send_dashboard_command(command="power off", fallback=self.__ur_script_ext.power_off):
+                self.set_dashboard_error_response(response_model=self.__power_off_control_response_model,
+                                                  command_name=inspect.currentframe().f_code.co_name,
+                                                  command="power off", values=values)
+                return
+            await self.wait_for_robot_mode(mode_array=["POWER_OFF"], timeout=5)
             self.__power_off_control_response_model.robot_mode = self.__ur_script_ext.get_robot_mode()
             self.__power_off_control_response_model.robot_status = self.__ur_script_ext.get_robot_status()
 
@@ -966,8 +1283,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def power_off_control_response_handler(self, values):
-        response_payload = json.dumps(self.__power_off_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__power_off_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -982,7 +1298,7 @@ class Cobot(object):
         if self.__is_ur_basic_running:
 
             self.__ur_script_ext.freedrive_mode()
-            time.sleep(5)
+            await asyncio.sleep(5)
             self.__start_free_drive_control_response_model.robot_mode = self.__ur_script_ext.get_robot_mode()
             self.__start_free_drive_control_response_model.robot_status = self.__ur_script_ext.get_robot_status()
             self.__start_free_drive_control_response_model.robot_safety_status \
@@ -1011,8 +1327,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def start_free_drive_control_response_handler(self, values):
-        response_payload = json.dumps(self.__start_free_drive_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__start_free_drive_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -1036,7 +1351,7 @@ class Cobot(object):
             logging.info(log_text)
 
             self.__ur_script_ext.end_freedrive_mode()
-            time.sleep(5)
+            await asyncio.sleep(5)
             self.__stop_free_drive_control_response_model.robot_mode = self.__ur_script_ext.get_robot_mode()
             self.__stop_free_drive_control_response_model.robot_status = self.__ur_script_ext.get_robot_status()
             self.__stop_free_drive_control_response_model.robot_safety_status \
@@ -1065,8 +1380,7 @@ class Cobot(object):
                 .set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
 
     def stop_free_drive_control_response_handler(self, values):
-        response_payload = json.dumps(self.__stop_free_drive_control_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__stop_free_drive_control_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -1132,8 +1446,7 @@ class Cobot(object):
                 .set_response(status=Status.COMMAND_EXECUTION_SEQUENCE_ERROR, log_text=log_text)
 
     def start_cobot_iot_command_response_handler(self, values):
-        response_payload = json.dumps(self.__start_iot_command_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__start_iot_command_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -1173,8 +1486,7 @@ class Cobot(object):
                                                                 log_text=log_text)
 
     def stop_cobot_iot_command_response_handler(self, values):
-        response_payload = json.dumps(self.__stop_iot_command_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__stop_iot_command_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -1195,6 +1507,19 @@ class Cobot(object):
 
         await self.__cobot_device.iot_hub_device_client.connect()
 
+        self.__cobot_metrics_iot_task = CobotMetricsIotTask(
+            cobot_device=self.__cobot_device,
+            metric_provider_dictionary={
+                "latency": latency_registry.get,
+                "reported_properties": self.__cobot_device.get_reported_properties_metrics,
+                "robot_state_cache": self.get_robot_state_cache_statistics
+            })
+
+        self.__cobot_progress_iot_task = CobotProgressIotTask(
+            cobot_device=self.__cobot_device,
+            cobot_motion_queue=self.__cobot_motion_queue,
+            position_provider=lambda motion_type: self.get_actual_position(motion_type=motion_type))
+
         command_listeners = asyncio.gather(
             self.__cobot_device.execute_command_listener(
                 method_name="EnableControlCommand",
@@ -1221,6 +1546,21 @@ class Cobot(object):
                 user_command_handler=self.move_l_control_command_handler,
                 create_user_response_handler=self.move_l_control_response_handler,
             ),
+            self.__cobot_device.execute_command_listener(
+                method_name="PlanMotionControlCommand",
+                user_command_handler=self.plan_motion_control_command_handler,
+                create_user_response_handler=self.plan_motion_control_response_handler,
+            ),
+            self.__cobot_device.execute_command_listener(
+                method_name="GetMotionQueueControlCommand",
+                user_command_handler=self.get_motion_queue_control_command_handler,
+                create_user_response_handler=self.get_motion_queue_control_response_handler,
+            ),
+            self.__cobot_device.execute_command_listener(
+                method_name="CancelMotionControlCommand",
+                user_command_handler=self.cancel_motion_control_command_handler,
+                create_user_response_handler=self.cancel_motion_control_response_handler,
+            ),
             self.__cobot_device.execute_command_listener(
                 method_name="PauseControlCommand",
                 user_command_handler=self.pause_control_command_handler,
@@ -1282,6 +1622,8 @@ class Cobot(object):
                 create_user_response_handler=self.stop_cobot_iot_command_response_handler,
             ),
             self.__cobot_device.execute_property_listener(),
+            self.__cobot_metrics_iot_task.connect(),
+            self.__cobot_progress_iot_task.connect(),
         )
 
         loop = asyncio.get_running_loop()
@@ -1289,15 +1631,86 @@ class Cobot(object):
 
         await user_finished
 
+        self.__cobot_metrics_iot_task.terminate()
+        self.__cobot_progress_iot_task.terminate()
+        if self.__dashboard_client is not None:
+            await self.__dashboard_client.close()
         if not command_listeners.done():
             command_listeners.set_result(["Cobot done"])
 
         command_listeners.cancel()
 
-        await self.__cobot_device.iot_hub_device_client.shutdown()
+        await self.__cobot_device.shutdown()
         logging.info("cobot.connect_azure_iot:queue.put")
         await queue.put(None)
 
+    async def send_dashboard_command(self, command, fallback):
+        # returns False when the command may have reached the robot without a reply, a resend could execute it twice
+        if self.__dashboard_client is not None and self.__dashboard_client.IsConnected():
+            try:
+                respond = await self.__dashboard_client.SendCommand(command)
+                logging.info("cobot.send_dashboard_command:Respond command={command} respond={respond}"
+                             .format(command=command, respond=respond))
+                self.__robot_state_cache.Invalidate()
+                return True
+            except DashBoardNotConnectedError as error:
+                logging.error("cobot.send_dashboard_command:Not sent command={command} error={error}"
+                              .format(command=command, error=str(error)))
+            except (asyncio.TimeoutError, ConnectionError) as error:
+                logging.error("cobot.send_dashboard_command:Failed command={command} error={error}"
+                              .format(command=command, error=repr(error)))
+                self.__robot_state_cache.Invalidate()
+                return False
+        logging.info("cobot.send_dashboard_command:Fallback command={command}".format(command=command))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, fallback)
+        return True
+
+    def set_dashboard_error_response(self, response_model, command_name, command, values):
+        log_text = self.__log_text_helper.get_log_text(
+            status=LogTextStatus.ERROR,
+            command_name=command_name,
+            input_dictionary={
+                "values": values,
+                "is_ur_basic_running": self.__is_ur_basic_running,
+                "command": command,
+                "error": "DashboardNoReply"
+            })
+        logging.info(log_text)
+        response_model.set_response(status=Status.COBOT_CLIENT_ERROR, log_text=log_text)
+
+    async def wait_for_robot_mode(self, mode_array, timeout):
+        if self.__robot_state_cache is not None:
+            try:
+                robot_mode = await self.__robot_state_cache.WaitForRobotMode(mode_array, timeout=timeout)
+                logging.info("cobot.wait_for_robot_mode:Robot mode robot_mode={robot_mode} statistics={statistics}"
+                             .format(robot_mode=robot_mode,
+                                     statistics=self.__robot_state_cache.GetStatistics()))
+                return robot_mode
+            except (asyncio.TimeoutError, ConnectionError) as error:
+                logging.error("cobot.wait_for_robot_mode:Failed error={error}".format(error=str(error)))
+                return None
+        await asyncio.sleep(timeout)
+        return None
+
+    def get_robot_state_cache_statistics(self):
+        if self.__robot_state_cache is None:
+            return None
+        return self.__robot_state_cache.GetStatistics()
+
+    def get_start_position(self, motion_type):
+        if self.__cobot_motion_queue.get_running_motion() is not None \
+                or self.__cobot_motion_queue.get_queue_length() > 0:
+            return None
+        return self.get_actual_position(motion_type=motion_type)
+
+    def get_actual_position(self, motion_type):
+        if not self.__is_ur_basic_running:
+            return None
+        if motion_type == MotionType.MOVE_J:
+            return self.__ur_script_ext.get_actual_joint_positions(wait=False)
+        return self.__ur_script_ext.get_actual_tcp_pose(wait=False)
+
     @staticmethod
     def check_valid_literal(values):
         try:
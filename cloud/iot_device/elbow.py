@@ -4,7 +4,6 @@ __copyright__ = "University of Derby"
 import asyncio
 import inspect
 import logging
-import json
 from threading import Thread
 from azure.iot.device.common.pipeline.pipeline_exceptions import PipelineNotRunning
 from cloud.device import Device
@@ -108,8 +107,7 @@ class Elbow(object):
                                                                  log_text=log_text)
 
     def start_iot_command_response_handler(self, values):
-        response_payload = json.dumps(self.__start_iot_command_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__start_iot_command_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -148,8 +146,7 @@ class Elbow(object):
                                                                 log_text=log_text)
 
     def stop_iot_command_response_handler(self, values):
-        response_payload = json.dumps(self.__stop_iot_command_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__stop_iot_command_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -194,6 +191,6 @@ class Elbow(object):
 
         command_listeners.cancel()
 
-        await self.__device.iot_hub_device_client.shutdown()
+        await self.__device.shutdown()
         logging.info("elbow.connect_azure_iot:queue.put")
         await queue.put(None)
@@ -4,7 +4,6 @@ __copyright__ = "University of Derby"
 import asyncio
 import inspect
 import logging
-import json
 from threading import Thread
 from azure.iot.device.common.pipeline.pipeline_exceptions import PipelineNotRunning
 from cloud.device import Device
@@ -109,8 +108,7 @@ class Shoulder(object):
                                                                  log_text=log_text)
 
     def start_iot_command_response_handler(self, values):
-        response_payload = json.dumps(self.__start_iot_command_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__start_iot_command_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -149,8 +147,7 @@ class Shoulder(object):
                                                                 log_text=log_text)
 
     def stop_iot_command_response_handler(self, values):
-        response_payload = json.dumps(self.__stop_iot_command_response_model.get(),
-                                      default=lambda o: o.__dict__, sort_keys=True)
+        response_payload = self.__stop_iot_command_response_model.to_json()
         logging.info(self.__log_text_helper.get_log_text(
             status=LogTextStatus.COMPLETED,
             command_name=inspect.currentframe().f_code.co_name,
@@ -195,6 +192,6 @@ class Shoulder(object):
 
         command_listeners.cancel()
 
-        await self.__device.iot_hub_device_client.shutdown()
+        await self.__device.shutdown()
         logging.info("shoulder.connect_azure_iot:queue.put")
         await queue.put(None)
@@ -31,7 +31,10 @@ class BaseIotTask:
             if self.__cache_json_content != self.load_json_content():
                 telemetry = {"Position": self.__cache_json_content['base_model']['_position'],
                              "Temperature": self.__cache_json_content['base_model']['_temperature'],
-                             "Voltage": self.__cache_json_content['base_model']['_voltage']}
+                             "Voltage": self.__cache_json_content['base_model']['_voltage'],
+                             "X": self.__cache_json_content['base_model'].get('_x'),
+                             "Y": self.__cache_json_content['base_model'].get('_y'),
+                             "Z": self.__cache_json_content['base_model'].get('_z')}
                 logging.info("base_iot_task.connect:" + str(telemetry))
                 await self.__device.send_telemetry(telemetry)
                 self.__cache_json_content = self.load_json_content()
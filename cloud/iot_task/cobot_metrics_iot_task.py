@@ -0,0 +1,38 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import asyncio
+
+
+class CobotMetricsIotTask:
+
+    def __init__(self, cobot_device, metric_provider_dictionary, interval=10):
+        self.__device = cobot_device
+        self.__metric_provider_dictionary = metric_provider_dictionary
+        self.__interval = interval
+        self.__running = True
+
+    def terminate(self):
+        self.__running = False
+
+    def get_metrics(self):
+        metrics = {}
+        for name, metric_provider in self.__metric_provider_dictionary.items():
+            metrics[name] = metric_provider()
+        return metrics
+
+    async def connect(self):
+        logging.info("cobot_metrics_iot_task.connect:Starting interval={interval}".format(interval=self.__interval))
+
+        while self.__running:
+            await asyncio.sleep(self.__interval)
+            telemetry = {"Metrics": self.get_metrics()}
+            logging.debug("cobot_metrics_iot_task.connect:" + str(telemetry))
+            try:
+                await self.__device.send_telemetry(telemetry)
+            except Exception as ex:
+                logging.error("cobot_metrics_iot_task.connect:Sending metrics failed error={error}"
+                              .format(error=ex))
+
+        logging.debug("cobot_metrics_iot_task.connect:Complete")
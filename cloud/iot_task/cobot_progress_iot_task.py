@@ -0,0 +1,72 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import asyncio
+from cloud.control_task.cobot_motion_progress import CobotMotionProgress
+
+
+class CobotProgressIotTask:
+
+    def __init__(self, cobot_device, cobot_motion_queue, position_provider, interval=0.5, min_fraction_change=0.01):
+        self.__device = cobot_device
+        self.__cobot_motion_queue = cobot_motion_queue
+        self.__position_provider = position_provider
+        self.__interval = interval
+        self.__min_fraction_change = min_fraction_change
+        self.__cobot_motion_progress = None
+        self.__tracked_motion = None
+        self.__last_fraction_complete = None
+        self.__running = True
+
+    def terminate(self):
+        self.__running = False
+
+    def get_progress(self):
+        running_motion = self.__cobot_motion_queue.get_running_motion()
+        progress_array = []
+        if self.__tracked_motion is not None and self.__tracked_motion is not running_motion:
+            progress = self.__cobot_motion_progress.complete(state=self.__tracked_motion.state)
+            progress["state"] = self.__tracked_motion.state
+            progress_array.append(progress)
+            self.__tracked_motion = None
+            self.__cobot_motion_progress = None
+            self.__last_fraction_complete = None
+
+        if running_motion is None or running_motion.motion_plan is None:
+            return progress_array
+
+        actual_position = self.__position_provider(running_motion.motion_type)
+        if self.__tracked_motion is None:
+            # the queue records the pose at dequeue, the first sample here may already be past the first waypoint
+            start_position = running_motion.start_position
+            if start_position is None:
+                start_position = actual_position
+            if start_position is None:
+                return progress_array
+            self.__tracked_motion = running_motion
+            self.__cobot_motion_progress = CobotMotionProgress(motion=running_motion, start_position=start_position)
+
+        progress = self.__cobot_motion_progress.update(actual_position)
+        if self.__last_fraction_complete is None \
+                or progress["fraction_complete"] - self.__last_fraction_complete >= self.__min_fraction_change:
+            self.__last_fraction_complete = progress["fraction_complete"]
+            progress["state"] = running_motion.state
+            progress_array.append(progress)
+        return progress_array
+
+    async def connect(self):
+        logging.info("cobot_progress_iot_task.connect:Starting interval={interval}".format(interval=self.__interval))
+
+        while self.__running:
+            await asyncio.sleep(self.__interval)
+            for progress in self.get_progress():
+                telemetry = {"MotionProgress": progress}
+                logging.debug("cobot_progress_iot_task.connect:" + str(telemetry))
+                try:
+                    await self.__device.send_telemetry(telemetry)
+                except Exception as ex:
+                    logging.error("cobot_progress_iot_task.connect:Sending progress failed error={error}"
+                                  .format(error=ex))
+
+        logging.debug("cobot_progress_iot_task.connect:Complete")
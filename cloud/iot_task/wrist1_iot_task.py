@@ -28,9 +28,12 @@ class Wrist1IotTask:
         self.__cache_json_content = self.load_json_content()
         while self.__running:
             if self.__cache_json_content != self.load_json_content():
-                telemetry = {"Position": self.__cache_json_content['base_model']['_position'],
-                             "Temperature": self.__cache_json_content['base_model']['_temperature'],
-                             "Voltage": self.__cache_json_content['base_model']['_voltage']}
+                telemetry = {"Position": self.__cache_json_content['wrist1_model']['_position'],
+                             "Temperature": self.__cache_json_content['wrist1_model']['_temperature'],
+                             "Voltage": self.__cache_json_content['wrist1_model']['_voltage'],
+                             "X": self.__cache_json_content['wrist1_model'].get('_x'),
+                             "Y": self.__cache_json_content['wrist1_model'].get('_y'),
+                             "Z": self.__cache_json_content['wrist1_model'].get('_z')}
                 logging.info("wrist1_iot_task.connect:" + str(telemetry))
                 await self.__device.send_telemetry(telemetry)
                 self.__cache_json_content = self.load_json_content()
@@ -28,9 +28,12 @@ class Wrist2IotTask:
         self.__cache_json_content = self.load_json_content()
         while self.__running:
             if self.__cache_json_content != self.load_json_content():
-                telemetry = {"Position": self.__cache_json_content['base_model']['_position'],
-                             "Temperature": self.__cache_json_content['base_model']['_temperature'],
-                             "Voltage": self.__cache_json_content['base_model']['_voltage']}
+                telemetry = {"Position": self.__cache_json_content['wrist2_model']['_position'],
+                             "Temperature": self.__cache_json_content['wrist2_model']['_temperature'],
+                             "Voltage": self.__cache_json_content['wrist2_model']['_voltage'],
+                             "X": self.__cache_json_content['wrist2_model'].get('_x'),
+                             "Y": self.__cache_json_content['wrist2_model'].get('_y'),
+                             "Z": self.__cache_json_content['wrist2_model'].get('_z')}
                 logging.info("wrist2_iot_task.connect:" + str(telemetry))
                 await self.__device.send_telemetry(telemetry)
                 self.__cache_json_content = self.load_json_content()
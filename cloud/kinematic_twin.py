@@ -0,0 +1,71 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import numpy as np
+from URBasic.kinematic import Pose2Tran_MatArray, Tran_Mat2PoseArray, TransMatrix_DH_FramesArray
+from URBasic.robotRegistry import GetRobot
+
+# component of the digital twin and the DH frame of its joint, the tool uses the flange frame and the TCP offset
+KINEMATIC_TWIN_FRAME_DICTIONARY = {
+    "base_model": 0,
+    "shoulder_model": 1,
+    "elbow_model": 2,
+    "wrist1_model": 3,
+    "wrist2_model": 4,
+    "wrist3_model": 5,
+    "tool_model": 6
+}
+
+
+# Derives the position of every component from actual_q, so the RTDE recipe does not need elbow_position or
+# actual_TCP_pose. Joint positions are the origins of the DH frames (on the joint axes), the tool pose is the
+# flange pose with the TCP offset applied.
+class KinematicTwin:
+
+    def __init__(self, robot_type="ur10", tcp_offset=None):
+        GetRobot(robot_type)
+        self.__robot_type = robot_type
+        self.__tcp_offset = Pose2Tran_MatArray([[0] * 6 if tcp_offset is None else tcp_offset])[0]
+        self.__frame_count = 0
+
+    @property
+    def robot_type(self):
+        return self.__robot_type
+
+    @property
+    def frame_count(self):
+        return self.__frame_count
+
+    # base to component transformation matrices of N joint vectors, N x 7 x 4 x 4
+    def get_frame_array(self, actual_q_array):
+        frame_array = TransMatrix_DH_FramesArray(rob=self.__robot_type, joint_array=actual_q_array)
+        frame_array[:, 6] = np.matmul(frame_array[:, 6], self.__tcp_offset)
+        self.__frame_count += len(frame_array)
+        return frame_array
+
+    # N x 7 x 3 component positions and N x 6 tool poses [x, y, z, rx, ry, rz] of N joint vectors
+    def get_position_array(self, actual_q_array):
+        frame_array = self.get_frame_array(actual_q_array)
+        return frame_array[:, :, :3, 3], Tran_Mat2PoseArray(frame_array[:, 6])
+
+    # values read from the RTDE recipe are kept, only the missing ones are derived
+    def update_rtdl_dt_model(self, rtdl_dt_model):
+        actual_q = [rtdl_dt_model.base_model.position, rtdl_dt_model.shoulder_model.position,
+                    rtdl_dt_model.elbow_model.position, rtdl_dt_model.wrist1_model.position,
+                    rtdl_dt_model.wrist2_model.position, rtdl_dt_model.wrist3_model.position]
+        if None in actual_q:
+            logging.warning("kinematic_twin.update_rtdl_dt_model:Missing joint position actual_q={actual_q}"
+                            .format(actual_q=actual_q))
+            return rtdl_dt_model
+        position_array, tool_pose_array = self.get_position_array([actual_q])
+        for component, frame in KINEMATIC_TWIN_FRAME_DICTIONARY.items():
+            component_model = getattr(rtdl_dt_model, component)
+            for attribute, value in zip(["x", "y", "z"], position_array[0, frame]):
+                if getattr(component_model, attribute) is None:
+                    setattr(component_model, attribute, float(value))
+        tool_model = rtdl_dt_model.tool_model
+        for attribute, value in zip(["rx", "ry", "rz"], tool_pose_array[0, 3:]):
+            if getattr(tool_model, attribute) is None:
+                setattr(tool_model, attribute, float(value))
+        return rtdl_dt_model
@@ -0,0 +1,96 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import logging
+import threading
+import URBasic
+from URBasic.singularityMonitor import SingularityMonitor
+from types import SimpleNamespace
+
+
+class RobotConnectionManager:
+
+    def __init__(self, host, rtde_configuration_path, robot_type="ur10"):
+        self.__host = host
+        self.__rtde_configuration_path = rtde_configuration_path
+        # checks actual_q of every RTDE frame from the RTDE thread
+        self.__singularity_monitor = SingularityMonitor(rob=robot_type)
+        self.__singularity_monitor.AddEventListener(self.log_singularity_event)
+        self.__connection_lock = threading.Lock()
+        self.__robot_model = None
+        self.__ur_script_ext = None
+        self.__is_control_enabled = False
+        self.__last_timestamp = None
+
+    def connect(self):
+        with self.__connection_lock:
+            if self.__ur_script_ext is None:
+                logging.info("robot_connection_manager.connect:Connecting host={host} "
+                             "rtde_configuration_path={rtde_configuration_path}"
+                             .format(host=self.__host, rtde_configuration_path=self.__rtde_configuration_path))
+                self.__robot_model = URBasic.robotModel.RobotModel()
+                self.__singularity_monitor.Attach(self.__robot_model)
+                self.__ur_script_ext = URBasic.urScriptExt.UrScriptExt(
+                    host=self.__host,
+                    robotModel=self.__robot_model,
+                    rtde_conf_filename=self.__rtde_configuration_path,
+                    hasDataLog=False)
+                logging.info("robot_connection_manager.connect:Connected")
+            return self.__ur_script_ext
+
+    def is_connected(self):
+        return self.__ur_script_ext is not None
+
+    def is_control_enabled(self):
+        return self.__is_control_enabled
+
+    def get_robot_model(self):
+        return self.__robot_model
+
+    def get_ur_script_ext(self):
+        return self.__ur_script_ext
+
+    def get_singularity_monitor(self):
+        return self.__singularity_monitor
+
+    @staticmethod
+    def log_singularity_event(event):
+        if event["type"] == "enter":
+            logging.warning("robot_connection_manager.log_singularity_event:Near singular manipulability="
+                            "{manipulability:.5f} condition={condition:.1f} actual_q={joints}"
+                            .format(manipulability=event["manipulability"], condition=event["condition"],
+                                    joints=event["joints"]))
+        else:
+            logging.info("robot_connection_manager.log_singularity_event:Clear of singularity manipulability="
+                         "{manipulability:.5f} condition={condition:.1f}"
+                         .format(manipulability=event["manipulability"], condition=event["condition"]))
+
+    def enable_control(self):
+        ur_script_ext = self.connect()
+        ur_script_ext.reset_error()
+        self.__is_control_enabled = True
+        logging.info("robot_connection_manager.enable_control:Enabled")
+        return ur_script_ext
+
+    def disable_control(self):
+        self.__is_control_enabled = False
+        logging.info("robot_connection_manager.disable_control:Disabled connection kept warm")
+
+    def get_state(self):
+        if self.__robot_model is None:
+            return None
+        data_dir = self.__robot_model.dataDir.copy()
+        if data_dir['timestamp'] is None or data_dir['timestamp'] == self.__last_timestamp:
+            return None
+        self.__last_timestamp = data_dir['timestamp']
+        return SimpleNamespace(**data_dir)
+
+    def close(self):
+        with self.__connection_lock:
+            if self.__ur_script_ext is not None:
+                self.__singularity_monitor.Detach()
+                self.__ur_script_ext.close()
+                self.__ur_script_ext = None
+                self.__robot_model = None
+                self.__is_control_enabled = False
+                logging.info("robot_connection_manager.close:Closed")
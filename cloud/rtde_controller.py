@@ -8,6 +8,7 @@ import sys
 from jsondiff import diff
 import rtde.rtde as rtde
 import rtde.rtde_config as rtde_config
+from cloud.kinematic_twin import KinematicTwin
 from model.rtdl.rtdl_dt_model import RtdlDtModel
 from model.rtdl.rtdl_model import RtdlModel
 from twin_writer import TwinWriter
@@ -15,12 +16,15 @@ import xml.etree.ElementTree as ET
 
 
 class RtdeController:
-    def __init__(self, host, port, config, frequency, cobot_client_configuration_path):
+    def __init__(self, host, port, config, frequency, cobot_client_configuration_path,
+                 robot_connection_manager=None, robot_type="ur10"):
         self.__host = host
         self.__port = port
         self.__config = config
         self.__frequency = frequency
         self.__cobot_client_configuration_path = cobot_client_configuration_path
+        self.__robot_connection_manager = robot_connection_manager
+        self.__kinematic_twin = KinematicTwin(robot_type=robot_type)
         self.__rtde_connection = None
         self.__sync_running = True
         self.__connect_running = True
@@ -35,22 +39,30 @@ class RtdeController:
             config_file = rtde_config.ConfigFile(self.__config)
             output_names, output_types = config_file.get_recipe("out")
 
-            self.__rtde_connection = rtde.RTDE(self.__host, self.__port)
-            self.__rtde_connection.connect()
+            loop = asyncio.get_running_loop()
 
-            self.__rtde_connection.get_controller_version()
+            if self.__robot_connection_manager is None:
+                self.__rtde_connection = rtde.RTDE(self.__host, self.__port)
+                self.__rtde_connection.connect()
 
-            if not self.__rtde_connection.send_output_setup(output_names, output_types, self.__frequency):
-                logging.error("rtde_controller.connect:Unable to configure output")
-                sys.exit()
+                self.__rtde_connection.get_controller_version()
 
-            logging.info("rtde_controller.connect:Successfully configured output")
+                if not self.__rtde_connection.send_output_setup(output_names, output_types, self.__frequency):
+                    logging.error("rtde_controller.connect:Unable to configure output")
+                    sys.exit()
 
-            if not self.__rtde_connection.send_start():
-                logging.error("rtde_controller.connect:Unable to start synchronization")
-                sys.exit()
+                logging.info("rtde_controller.connect:Successfully configured output")
 
-            logging.info("rtde_controller.connect:Successfully started synchronization")
+                if not self.__rtde_connection.send_start():
+                    logging.error("rtde_controller.connect:Unable to start synchronization")
+                    sys.exit()
+
+                logging.info("rtde_controller.connect:Successfully started synchronization")
+                receive_state = self.__rtde_connection.receive
+            else:
+                await loop.run_in_executor(None, self.__robot_connection_manager.connect)
+                logging.info("rtde_controller.connect:Successfully attached to shared robot connection")
+                receive_state = self.__robot_connection_manager.get_state
 
             twin_writer = TwinWriter(output_names, output_types)
 
@@ -58,31 +70,35 @@ class RtdeController:
 
             logging.info("rtde_controller.connect:header_row")
 
-            loop = asyncio.get_running_loop()
             user_finished = loop.run_in_executor(None, self.stdin_listener)
 
             cache_json_content = self.load_json_content()
 
             while self.__sync_running:
                 try:
-                    state = self.__rtde_connection.receive()
+                    state = receive_state()
                     if state is not None:
                         data_row = twin_writer.get_data_row(state)
                         logging.info("rtde_controller.connect:data_row")
                         rtdl_model = RtdlModel.get_from_rows(header_row, data_row)
                         rtdl_dt_model = RtdlDtModel.get_from_rtdl_model(rtdl_model)
-                        self.create_json(rtdl_dt_model.get_json())
-                        if cache_json_content != rtdl_dt_model.get_json():
-                            changes = diff(cache_json_content, rtdl_dt_model.get_json())
+                        self.__kinematic_twin.update_rtdl_dt_model(rtdl_dt_model)
+                        json_object = rtdl_dt_model.to_dict()
+                        self.create_json(json_object)
+                        if cache_json_content != json_object:
+                            changes = diff(cache_json_content, json_object)
                             logging.info("rtde_controller.connect:Modified json_object={changes}".format(changes=changes))
-                            cache_json_content = rtdl_dt_model.get_json()
+                            cache_json_content = json_object
                         else:
                             logging.info("rtde_controller.connect:No changes in {cache_json_file}"
                                          .format(cache_json_file=self.__cache_json_file))
                         await asyncio.sleep(5)
+                    else:
+                        await asyncio.sleep(1 / self.__frequency)
 
                 except rtde.RTDEException as ex:
-                    self.__rtde_connection.disconnect()
+                    if self.__rtde_connection is not None:
+                        self.__rtde_connection.disconnect()
                     logging.error("rtde_controller.connect:While={error}".format(error=str(ex)))
                     self.terminate()
                     sys.exit()
@@ -90,8 +106,9 @@ class RtdeController:
             await user_finished
 
             logging.debug("rtde_controller.connect:Complete")
-            self.__rtde_connection.send_pause()
-            self.__rtde_connection.disconnect()
+            if self.__rtde_connection is not None:
+                self.__rtde_connection.send_pause()
+                self.__rtde_connection.disconnect()
             logging.info("rtde_controller.connect:queue.put")
             sys.exit()
 
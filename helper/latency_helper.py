@@ -0,0 +1,136 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import bisect
+import contextvars
+import threading
+import time
+
+
+class LatencyStage:
+    HUB_RECEIVE = "hub_receive"
+    PARSE = "parse"
+    ENQUEUE = "enqueue"
+    URSCRIPT_SEND = "urscript_send"
+    PROGRAM_START = "program_start"
+    PROGRAM_FINISH = "program_finish"
+    RESPONSE_SENT = "response_sent"
+
+    ORDER = [HUB_RECEIVE, PARSE, ENQUEUE, URSCRIPT_SEND, PROGRAM_START, PROGRAM_FINISH, RESPONSE_SENT]
+
+
+class LatencyHistogram:
+    BUCKET_BOUNDS = [0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0]
+
+    def __init__(self):
+        self._bucket_counts = [0] * (len(self.BUCKET_BOUNDS) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = None
+        self._max = None
+
+    @property
+    def count(self):
+        return self._count
+
+    def record(self, value):
+        self._bucket_counts[bisect.bisect_left(self.BUCKET_BOUNDS, value)] += 1
+        self._count += 1
+        self._sum += value
+        self._min = value if self._min is None else min(self._min, value)
+        self._max = value if self._max is None else max(self._max, value)
+
+    def get_percentile(self, percentile):
+        if self._count == 0:
+            return None
+        rank = percentile / 100.0 * self._count
+        cumulative_count = 0
+        for index, bucket_count in enumerate(self._bucket_counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank and bucket_count > 0:
+                if index < len(self.BUCKET_BOUNDS):
+                    return min(self.BUCKET_BOUNDS[index], self._max)
+                return self._max
+        return self._max
+
+    def get(self):
+        return {
+            "count": self._count,
+            "mean": self._sum / self._count if self._count > 0 else None,
+            "min": self._min,
+            "max": self._max,
+            "p50": self.get_percentile(50),
+            "p95": self.get_percentile(95),
+            "p99": self.get_percentile(99)
+        }
+
+
+class LatencyRegistry:
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__histograms = {}
+
+    def record(self, name, value):
+        with self.__lock:
+            histogram = self.__histograms.get(name)
+            if histogram is None:
+                histogram = LatencyHistogram()
+                self.__histograms[name] = histogram
+            histogram.record(value)
+
+    def get(self):
+        with self.__lock:
+            return {name: histogram.get() for name, histogram in sorted(self.__histograms.items())}
+
+    def reset(self):
+        with self.__lock:
+            self.__histograms = {}
+
+
+latency_registry = LatencyRegistry()
+current_latency_trace = contextvars.ContextVar("current_latency_trace", default=None)
+
+
+class LatencyTrace:
+
+    def __init__(self, command_name, registry=None):
+        self.__command_name = command_name
+        self.__registry = latency_registry if registry is None else registry
+        self.__lock = threading.Lock()
+        self.__marks = {}
+
+    @property
+    def command_name(self):
+        return self.__command_name
+
+    def get_marks(self):
+        with self.__lock:
+            return dict(self.__marks)
+
+    def mark(self, stage, perf_counter=None):
+        if perf_counter is None:
+            perf_counter = time.perf_counter()
+        with self.__lock:
+            if stage in self.__marks:
+                return
+            previous_stage = None
+            for candidate_stage in LatencyStage.ORDER[:LatencyStage.ORDER.index(stage)]:
+                if candidate_stage in self.__marks:
+                    previous_stage = candidate_stage
+            previous_perf_counter = self.__marks.get(previous_stage)
+            hub_receive = self.__marks.get(LatencyStage.HUB_RECEIVE)
+            self.__marks[stage] = perf_counter
+
+        if previous_stage is not None:
+            self.__registry.record("{previous_stage}_to_{stage}".format(previous_stage=previous_stage, stage=stage),
+                                   perf_counter - previous_perf_counter)
+        if hub_receive is not None and previous_stage != LatencyStage.HUB_RECEIVE and stage != LatencyStage.HUB_RECEIVE:
+            self.__registry.record("hub_receive_to_{stage}".format(stage=stage), perf_counter - hub_receive)
+
+    @staticmethod
+    def mark_current(stage, perf_counter=None):
+        latency_trace = current_latency_trace.get()
+        if latency_trace is not None:
+            latency_trace.mark(stage, perf_counter)
+        return latency_trace
@@ -0,0 +1,43 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+import math
+
+
+class RequestValueError(ValueError):
+    def __init__(self, key, value, reason):
+        super().__init__("Invalid {key}={value} {reason}".format(key=key, value=value, reason=reason))
+        self.key = key
+        self.value = value
+        self.reason = reason
+
+
+class RequestValueHelper:
+
+    @staticmethod
+    def get_float(values, key):
+        value = values[key]
+        # bool is an int, but true is not a number a payload means
+        if isinstance(value, bool):
+            raise RequestValueError(key=key, value=value, reason="is not a number")
+        try:
+            float_value = float(value)
+        except (TypeError, ValueError):
+            raise RequestValueError(key=key, value=value, reason="is not a number")
+        if not math.isfinite(float_value):
+            raise RequestValueError(key=key, value=value, reason="is not finite")
+        return float_value
+
+    @staticmethod
+    def get_positive_float(values, key):
+        float_value = RequestValueHelper.get_float(values, key)
+        if float_value <= 0:
+            raise RequestValueError(key=key, value=values[key], reason="must be greater than 0")
+        return float_value
+
+    @staticmethod
+    def get_non_negative_float(values, key):
+        float_value = RequestValueHelper.get_float(values, key)
+        if float_value < 0:
+            raise RequestValueError(key=key, value=values[key], reason="must not be negative")
+        return float_value
@@ -12,6 +12,7 @@ from cloud.iot_device.cobot import Cobot
 from cloud.iot_device.control_box import ControlBox
 from cloud.iot_device.elbow import Elbow
 from cloud.iot_device.payload import Payload
+from cloud.robot_connection_manager import RobotConnectionManager
 from cloud.rtde_controller import RtdeController
 from cloud.iot_device.base import Base
 from cloud.iot_device.shoulder import Shoulder
@@ -30,7 +31,7 @@ for handler in logging.root.handlers[:]:
 logging.basicConfig(filename=cobot_log_path, encoding='utf-8', level=logging.INFO)
 
 
-async def rtde_controller(queue):
+async def rtde_controller(queue, robot_connection_manager):
     config_element_tree = ET.parse(cobot_iot_configuration_path)
     rtde_configuration = config_element_tree.find('rtde')
 
@@ -38,16 +39,19 @@ async def rtde_controller(queue):
     rtde_port = int(rtde_configuration.find('connection/port').text)
     iot_config = rtde_configuration.find('settings/iot_configuration_path').text
     frequency = int(rtde_configuration.find('settings/frequency').text)
+    robot_type = rtde_configuration.findtext('settings/robot_type', default="ur10")
 
     rtde_cntr = RtdeController(host=rtde_host,
                                port=rtde_port,
                                config=iot_config,
                                frequency=frequency,
-                               cobot_client_configuration_path=cobot_client_configuration_path)
+                               cobot_client_configuration_path=cobot_client_configuration_path,
+                               robot_connection_manager=robot_connection_manager,
+                               robot_type=robot_type)
     await rtde_cntr.connect(queue)
 
 
-async def cobot(queue):
+async def cobot(queue, robot_connection_manager):
     config_element_tree = ET.parse(cobot_iot_configuration_path)
     cobot_configuration = config_element_tree.find('cobot')
     rtde_configuration = config_element_tree.find('rtde')
@@ -56,6 +60,7 @@ async def cobot(queue):
     rtde_port = int(rtde_configuration.find('connection/port').text)
     control_configuration_path = rtde_configuration.find('settings/control_configuration_path').text
     cache_json_path = rtde_configuration.find('settings/cache_json_path').text
+    robot_type = rtde_configuration.findtext('settings/robot_type', default="ur10")
 
     model_id = cobot_configuration.find('model_id').text
     provisioning_host = cobot_configuration.find('provisioning_host').text
@@ -72,7 +77,9 @@ async def cobot(queue):
                          id_scope=id_scope,
                          registration_id=registration_id,
                          symmetric_key=symmetric_key,
-                         cache_json_path=cache_json_path)
+                         cache_json_path=cache_json_path,
+                         robot_connection_manager=robot_connection_manager,
+                         robot_type=robot_type)
     await cobot_device.connect_azure_iot(queue)
 
 
@@ -281,6 +288,9 @@ async def main():
 
     control_configuration_path = rtde_configuration.find('settings/control_configuration_path').text
     iot_configuration_path = rtde_configuration.find('settings/iot_configuration_path').text
+    rtde_host = rtde_configuration.find('connection/host').text
+    rtde_configuration_path = rtde_configuration.find('settings/rtde_configuration_path').text
+    robot_type = rtde_configuration.findtext('settings/robot_type', default="ur10")
 
     control_configuration_exists = exists(control_configuration_path)
     iot_configuration_exists = exists(iot_configuration_path)
@@ -303,8 +313,11 @@ async def main():
 
         try:
             queue = asyncio.Queue()
-            await asyncio.gather(rtde_controller(queue),
-                                 cobot(queue),
+            robot_connection_manager = RobotConnectionManager(host=rtde_host,
+                                                              rtde_configuration_path=rtde_configuration_path,
+                                                              robot_type=robot_type)
+            await asyncio.gather(rtde_controller(queue, robot_connection_manager),
+                                 cobot(queue, robot_connection_manager),
                                  control_box(queue),
                                  elbow(queue),
                                  payload(queue),
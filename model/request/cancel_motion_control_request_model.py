@@ -0,0 +1,21 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+
+class CancelMotionControlRequestModel:
+    def __init__(self):
+        self._motion_id = None
+
+    @property
+    def motion_id(self):
+        return self._motion_id
+
+    @motion_id.setter
+    def motion_id(self, value):
+        self._motion_id = value
+
+    @staticmethod
+    def get_cancel_motion_control_request_model_from_values(values):
+        cancel_motion_control_request_model = CancelMotionControlRequestModel()
+        cancel_motion_control_request_model.motion_id = values.get("MotionId")
+        return cancel_motion_control_request_model
@@ -2,6 +2,7 @@ __author__ = "100638182"
 __copyright__ = "University of Derby"
 
 import math
+from helper.request_value_helper import RequestValueHelper
 
 
 class JointPositionModel:
@@ -64,12 +65,12 @@ class JointPositionModel:
     @staticmethod
     def get_joint_position_model_from_joint_position_model_object(joint_position_model_object):
         joint_position_model = JointPositionModel()
-        joint_position_model.base = joint_position_model_object["Base"]
-        joint_position_model.shoulder = joint_position_model_object["Shoulder"]
-        joint_position_model.elbow = joint_position_model_object["Elbow"]
-        joint_position_model.wrist1 = joint_position_model_object["Wrist1"]
-        joint_position_model.wrist2 = joint_position_model_object["Wrist2"]
-        joint_position_model.wrist3 = joint_position_model_object["Wrist3"]
+        joint_position_model.base = RequestValueHelper.get_float(joint_position_model_object, "Base")
+        joint_position_model.shoulder = RequestValueHelper.get_float(joint_position_model_object, "Shoulder")
+        joint_position_model.elbow = RequestValueHelper.get_float(joint_position_model_object, "Elbow")
+        joint_position_model.wrist1 = RequestValueHelper.get_float(joint_position_model_object, "Wrist1")
+        joint_position_model.wrist2 = RequestValueHelper.get_float(joint_position_model_object, "Wrist2")
+        joint_position_model.wrist3 = RequestValueHelper.get_float(joint_position_model_object, "Wrist3")
         return joint_position_model
 
     @staticmethod
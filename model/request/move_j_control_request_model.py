@@ -1,6 +1,7 @@
 __author__ = "100638182"
 __copyright__ = "University of Derby"
 
+from helper.request_value_helper import RequestValueHelper
 from model.request.joint_position_model import JointPositionModel
 
 
@@ -10,6 +11,7 @@ class MoveJControlRequestModel:
         self._velocity = None
         self._time_s = None
         self._blend_radius = None
+        self._priority = None
         self._joint_position_model_array = []
 
     @property
@@ -28,6 +30,10 @@ class MoveJControlRequestModel:
     def blend_radius(self):
         return self._blend_radius
 
+    @property
+    def priority(self):
+        return self._priority
+
     @property
     def joint_position_model_array(self):
         return self._joint_position_model_array
@@ -48,6 +54,10 @@ class MoveJControlRequestModel:
     def blend_radius(self, value):
         self._blend_radius = value
 
+    @priority.setter
+    def priority(self, value):
+        self._priority = value
+
     @joint_position_model_array.setter
     def joint_position_model_array(self, value):
         self._joint_position_model_array.append(value)
@@ -55,10 +65,11 @@ class MoveJControlRequestModel:
     @staticmethod
     def get_move_j_control_request_model_from_values(values):
         move_j_control_request_model = MoveJControlRequestModel()
-        move_j_control_request_model.acceleration = values["Acceleration"]
-        move_j_control_request_model.velocity = values["Velocity"]
-        move_j_control_request_model.time_s = values["TimeS"]
-        move_j_control_request_model.blend_radius = values["BlendRadius"]
+        move_j_control_request_model.acceleration = RequestValueHelper.get_positive_float(values, "Acceleration")
+        move_j_control_request_model.velocity = RequestValueHelper.get_positive_float(values, "Velocity")
+        move_j_control_request_model.time_s = RequestValueHelper.get_non_negative_float(values, "TimeS")
+        move_j_control_request_model.blend_radius = RequestValueHelper.get_non_negative_float(values, "BlendRadius")
+        move_j_control_request_model.priority = values.get("Priority", "NORMAL")
         for joint_position_model_array_object in values["JointPositionModelArray"]:
             joint_position_model = JointPositionModel.get_joint_position_model_from_joint_position_model_object(
                 joint_position_model_array_object["JointPositionModel"])
@@ -1,6 +1,7 @@
 __author__ = "100638182"
 __copyright__ = "University of Derby"
 
+from helper.request_value_helper import RequestValueHelper
 from model.request.tcp_position_model import TcpPositionModel
 
 
@@ -10,6 +11,7 @@ class MoveLControlRequestModel:
         self._velocity = None
         self._time_s = None
         self._blend_radius = None
+        self._priority = None
         self._tcp_position_model_array = []
 
     @property
@@ -28,6 +30,10 @@ class MoveLControlRequestModel:
     def blend_radius(self):
         return self._blend_radius
 
+    @property
+    def priority(self):
+        return self._priority
+
     @property
     def tcp_position_model_array(self):
         return self._tcp_position_model_array
@@ -48,6 +54,10 @@ class MoveLControlRequestModel:
     def blend_radius(self, value):
         self._blend_radius = value
 
+    @priority.setter
+    def priority(self, value):
+        self._priority = value
+
     @tcp_position_model_array.setter
     def tcp_position_model_array(self, value):
         self._tcp_position_model_array.append(value)
@@ -55,10 +65,11 @@ class MoveLControlRequestModel:
     @staticmethod
     def get_move_l_control_request_model_from_values(values):
         move_l_control_request_model = MoveLControlRequestModel()
-        move_l_control_request_model.acceleration = values["Acceleration"]
-        move_l_control_request_model.velocity = values["Velocity"]
-        move_l_control_request_model.time_s = values["TimeS"]
-        move_l_control_request_model.blend_radius = values["BlendRadius"]
+        move_l_control_request_model.acceleration = RequestValueHelper.get_positive_float(values, "Acceleration")
+        move_l_control_request_model.velocity = RequestValueHelper.get_positive_float(values, "Velocity")
+        move_l_control_request_model.time_s = RequestValueHelper.get_non_negative_float(values, "TimeS")
+        move_l_control_request_model.blend_radius = RequestValueHelper.get_non_negative_float(values, "BlendRadius")
+        move_l_control_request_model.priority = values.get("Priority", "NORMAL")
         for tcp_position_model_array_object in values["TcpPositionModelArray"]:
             tcp_position_model = TcpPositionModel.get_tcp_position_model_from_tcp_position_model_object(
                 tcp_position_model_array_object["TcpPositionModel"])
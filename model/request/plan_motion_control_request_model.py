@@ -0,0 +1,45 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+from model.request.move_j_control_request_model import MoveJControlRequestModel
+from model.request.move_l_control_request_model import MoveLControlRequestModel
+from model.request.move_p_control_request_model import MovePControlRequestModel
+
+
+class PlanMotionControlRequestModel:
+    def __init__(self):
+        self._motion_type = None
+        self._move_control_request_model = None
+
+    @property
+    def motion_type(self):
+        return self._motion_type
+
+    @property
+    def move_control_request_model(self):
+        return self._move_control_request_model
+
+    @motion_type.setter
+    def motion_type(self, value):
+        self._motion_type = value
+
+    @move_control_request_model.setter
+    def move_control_request_model(self, value):
+        self._move_control_request_model = value
+
+    @staticmethod
+    def get_plan_motion_control_request_model_from_values(values):
+        plan_motion_control_request_model = PlanMotionControlRequestModel()
+        plan_motion_control_request_model.motion_type = values["MotionType"]
+        if plan_motion_control_request_model.motion_type == "MOVE_J":
+            plan_motion_control_request_model.move_control_request_model = MoveJControlRequestModel \
+                .get_move_j_control_request_model_from_values(values)
+        elif plan_motion_control_request_model.motion_type == "MOVE_L":
+            plan_motion_control_request_model.move_control_request_model = MoveLControlRequestModel \
+                .get_move_l_control_request_model_from_values(values)
+        elif plan_motion_control_request_model.motion_type == "MOVE_P":
+            plan_motion_control_request_model.move_control_request_model = MovePControlRequestModel \
+                .get_move_p_control_request_model_from_values(values)
+        else:
+            raise KeyError(plan_motion_control_request_model.motion_type)
+        return plan_motion_control_request_model
@@ -1,6 +1,8 @@
 __author__ = "100638182"
 __copyright__ = "University of Derby"
 
+from helper.request_value_helper import RequestValueHelper
+
 
 class TcpPositionModel:
     def __init__(self):
@@ -62,12 +64,12 @@ class TcpPositionModel:
     @staticmethod
     def get_tcp_position_model_from_tcp_position_model_object(tcp_position_model_object):
         tcp_position_model = TcpPositionModel()
-        tcp_position_model.x = tcp_position_model_object["X"]
-        tcp_position_model.y = tcp_position_model_object["Y"]
-        tcp_position_model.z = tcp_position_model_object["Z"]
-        tcp_position_model.rx = tcp_position_model_object["Rx"]
-        tcp_position_model.ry = tcp_position_model_object["Ry"]
-        tcp_position_model.rz = tcp_position_model_object["Rz"]
+        tcp_position_model.x = RequestValueHelper.get_float(tcp_position_model_object, "X")
+        tcp_position_model.y = RequestValueHelper.get_float(tcp_position_model_object, "Y")
+        tcp_position_model.z = RequestValueHelper.get_float(tcp_position_model_object, "Z")
+        tcp_position_model.rx = RequestValueHelper.get_float(tcp_position_model_object, "Rx")
+        tcp_position_model.ry = RequestValueHelper.get_float(tcp_position_model_object, "Ry")
+        tcp_position_model.rz = RequestValueHelper.get_float(tcp_position_model_object, "Rz")
         return tcp_position_model
 
     @staticmethod
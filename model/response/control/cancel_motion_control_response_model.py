@@ -0,0 +1,28 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+from model.response.response_model import ResponseModel
+
+
+class CancelMotionControlResponseModel(ResponseModel):
+    __slots__ = ("_cancelled_motion_array",)
+
+    def __init__(self):
+        super().__init__()
+        self._cancelled_motion_array = []
+
+    @property
+    def cancelled_motion_array(self):
+        return self._cancelled_motion_array
+
+    @cancelled_motion_array.setter
+    def cancelled_motion_array(self, value):
+        self._cancelled_motion_array.append(value)
+
+    def to_dict(self):
+        return {
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration,
+            "cancelled_motion_array": self.cancelled_motion_array
+        }
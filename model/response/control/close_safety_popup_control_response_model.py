@@ -5,6 +5,8 @@ from model.response.response_model import ResponseModel
 
 
 class CloseSafetyPopupControlResponseModel(ResponseModel):
+    __slots__ = ("_robot_mode", "_robot_status", "_robot_safety_status")
+
     def __init__(self):
         super().__init__()
         self._robot_mode = None
@@ -35,13 +37,12 @@ class CloseSafetyPopupControlResponseModel(ResponseModel):
     def robot_safety_status(self, value):
         self._robot_safety_status = value
 
-    def get(self):
-        super_result = super().get()
+    def to_dict(self):
         return {
-            "status": super_result.status,
-            "log_text": super_result.log_text,
-            "duration": super_result.duration,
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration,
             "robot_mode": self.robot_mode,
-            "robot_status": self.robot_status,
-            "robot_safety_status": self.robot_safety_status,
+            "robot_status": self.get_status_bit_dict(self._robot_status),
+            "robot_safety_status": self.get_status_bit_dict(self._robot_safety_status),
         }
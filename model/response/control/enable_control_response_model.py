@@ -5,6 +5,8 @@ from model.response.response_model import ResponseModel
 
 
 class EnableControlResponseModel(ResponseModel):
+    __slots__ = ("_elapsed_time",)
+
     def __init__(self):
         super().__init__()
         self._elapsed_time = None
@@ -17,11 +19,10 @@ class EnableControlResponseModel(ResponseModel):
     def elapsed_time(self, value):
         self._elapsed_time = value
 
-    def get(self):
-        super_result = super().get()
+    def to_dict(self):
         return {
-            "status": super_result.status,
-            "log_text": super_result.log_text,
-            "duration": super_result.duration,
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration,
             "elapsed_time": self.elapsed_time
         }
@@ -0,0 +1,48 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+from model.response.response_model import ResponseModel
+
+
+class GetMotionQueueControlResponseModel(ResponseModel):
+    __slots__ = ("_is_held", "_running_motion", "_queued_motion_array")
+
+    def __init__(self):
+        super().__init__()
+        self._is_held = None
+        self._running_motion = None
+        self._queued_motion_array = []
+
+    @property
+    def is_held(self):
+        return self._is_held
+
+    @property
+    def running_motion(self):
+        return self._running_motion
+
+    @property
+    def queued_motion_array(self):
+        return self._queued_motion_array
+
+    @is_held.setter
+    def is_held(self, value):
+        self._is_held = value
+
+    @running_motion.setter
+    def running_motion(self, value):
+        self._running_motion = value
+
+    @queued_motion_array.setter
+    def queued_motion_array(self, value):
+        self._queued_motion_array.append(value)
+
+    def to_dict(self):
+        return {
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration,
+            "is_held": self.is_held,
+            "running_motion": self.running_motion,
+            "queued_motion_array": self.queued_motion_array
+        }
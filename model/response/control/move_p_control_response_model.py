@@ -5,13 +5,64 @@ from model.response.response_model import ResponseModel
 
 
 class MovePControlResponseModel(ResponseModel):
+    __slots__ = ("_motion_id", "_queue_length", "_expected_duration", "_expected_completion_time", "_validation")
+
     def __init__(self):
         super().__init__()
+        self._motion_id = None
+        self._queue_length = None
+        self._expected_duration = None
+        self._expected_completion_time = None
+        self._validation = None
+
+    @property
+    def motion_id(self):
+        return self._motion_id
+
+    @property
+    def queue_length(self):
+        return self._queue_length
+
+    @property
+    def expected_duration(self):
+        return self._expected_duration
+
+    @property
+    def expected_completion_time(self):
+        return self._expected_completion_time
+
+    @property
+    def validation(self):
+        return self._validation
+
+    @motion_id.setter
+    def motion_id(self, value):
+        self._motion_id = value
+
+    @queue_length.setter
+    def queue_length(self, value):
+        self._queue_length = value
+
+    @expected_duration.setter
+    def expected_duration(self, value):
+        self._expected_duration = value
+
+    @expected_completion_time.setter
+    def expected_completion_time(self, value):
+        self._expected_completion_time = value
+
+    @validation.setter
+    def validation(self, value):
+        self._validation = value
 
-    def get(self):
-        super_result = super().get()
+    def to_dict(self):
         return {
-            "status": super_result.status,
-            "log_text": super_result.log_text,
-            "duration": super_result.duration
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration,
+            "motion_id": self.motion_id,
+            "queue_length": self.queue_length,
+            "expected_duration": self.expected_duration,
+            "expected_completion_time": self.expected_completion_time,
+            "validation": self.validation
         }
@@ -5,13 +5,14 @@ from model.response.response_model import ResponseModel
 
 
 class OpenPopupControlResponseModel(ResponseModel):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
-    def get(self):
-        super_result = super().get()
+    def to_dict(self):
         return {
-            "status": super_result.status,
-            "log_text": super_result.log_text,
-            "duration": super_result.duration
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration
         }
@@ -0,0 +1,58 @@
+__author__ = "100638182"
+__copyright__ = "University of Derby"
+
+from model.response.response_model import ResponseModel
+
+
+class PlanMotionControlResponseModel(ResponseModel):
+    __slots__ = ("_motion_plan", "_expected_start_time", "_expected_completion_time", "_validation")
+
+    def __init__(self):
+        super().__init__()
+        self._motion_plan = None
+        self._expected_start_time = None
+        self._expected_completion_time = None
+        self._validation = None
+
+    @property
+    def motion_plan(self):
+        return self._motion_plan
+
+    @property
+    def expected_start_time(self):
+        return self._expected_start_time
+
+    @property
+    def expected_completion_time(self):
+        return self._expected_completion_time
+
+    @property
+    def validation(self):
+        return self._validation
+
+    @motion_plan.setter
+    def motion_plan(self, value):
+        self._motion_plan = value
+
+    @expected_start_time.setter
+    def expected_start_time(self, value):
+        self._expected_start_time = value
+
+    @expected_completion_time.setter
+    def expected_completion_time(self, value):
+        self._expected_completion_time = value
+
+    @validation.setter
+    def validation(self, value):
+        self._validation = value
+
+    def to_dict(self):
+        return {
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration,
+            "motion_plan": self.motion_plan,
+            "expected_start_time": self.expected_start_time,
+            "expected_completion_time": self.expected_completion_time,
+            "validation": self.validation
+        }
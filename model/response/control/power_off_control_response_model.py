@@ -5,6 +5,8 @@ from model.response.response_model import ResponseModel
 
 
 class PowerOffControlResponseModel(ResponseModel):
+    __slots__ = ("_robot_mode", "_robot_status")
+
     def __init__(self):
         super().__init__()
         self._robot_mode = None
@@ -26,12 +28,11 @@ class PowerOffControlResponseModel(ResponseModel):
     def robot_status(self, value):
         self._robot_status = value
 
-    def get(self):
-        super_result = super().get()
+    def to_dict(self):
         return {
-            "status": super_result.status,
-            "log_text": super_result.log_text,
-            "duration": super_result.duration,
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration,
             "robot_mode": self._robot_mode,
-            "robot_status": self._robot_status
+            "robot_status": self.get_status_bit_dict(self._robot_status)
         }
@@ -1,19 +1,26 @@
 __author__ = "100638182"
 __copyright__ = "University of Derby"
 
+import json
 import time
+from helper.latency_helper import latency_registry
 
 
 class Status:
     COMMAND_EXECUTION_SEQUENCE_ERROR = "COMMAND_EXECUTION_SEQUENCE_ERROR"
     COMMAND_SYNTAX_ERROR = "COMMAND_SYNTAX_ERROR"
+    COMMAND_VALIDATION_ERROR = "COMMAND_VALIDATION_ERROR"
     COBOT_CLIENT_ERROR = "COBOT_CLIENT_ERROR"
     AZURE_IOT_ERROR = "AZURE_IOT_ERROR"
     COBOT_CLIENT_EXECUTED = "COBOT_CLIENT_EXECUTED"
     AZURE_IOT_EXECUTED = "AZURE_IOT_EXECUTED"
 
 
+# responses are created for every command, the fields are slots and to_dict lists them explicitly instead of
+# serializing __dict__ through json.dumps(default=...)
 class ResponseModel:
+    __slots__ = ("_status", "_log_text", "_duration", "_start_perf_counter", "_end_perf_counter")
+
     def __init__(self):
         self._status = None
         self._log_text = None
@@ -49,4 +56,23 @@ class ResponseModel:
     def get(self):
         self._end_perf_counter = time.perf_counter()
         self._duration = self._end_perf_counter - self._start_perf_counter
-        return self
+        latency_registry.record(self.__class__.__name__, self._duration)
+        return self.to_dict()
+
+    def to_dict(self):
+        return {
+            "status": self._status,
+            "log_text": self._log_text,
+            "duration": self._duration
+        }
+
+    # RobotStatusBit and SafetyStatusBit of URBasic.robotModel
+    @staticmethod
+    def get_status_bit_dict(status_bit):
+        return None if status_bit is None else status_bit.to_dict()
+
+    def to_json(self):
+        return json.dumps(self.get(), sort_keys=True)
+
+    def to_bytes(self):
+        return self.to_json().encode("utf-8")
@@ -3,10 +3,15 @@ __copyright__ = "University of Derby"
 
 
 class BaseModel:
+    __slots__ = ("_position", "_temperature", "_voltage", "_x", "_y", "_z")
+
     def __init__(self):
         self._position = None
         self._temperature = None
         self._voltage = None
+        self._x = None
+        self._y = None
+        self._z = None
 
     @property
     def position(self):
@@ -20,6 +25,18 @@ class BaseModel:
     def voltage(self):
         return self._voltage
 
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    @property
+    def z(self):
+        return self._z
+
     @position.setter
     def position(self, value):
         self._position = value
@@ -32,6 +49,18 @@ class BaseModel:
     def voltage(self, value):
         self._voltage = value
 
+    @x.setter
+    def x(self, value):
+        self._x = value
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+
+    @z.setter
+    def z(self, value):
+        self._z = value
+
     @staticmethod
     def get_from_rtdl_model(rtdl_model):
         base_model = BaseModel()
@@ -46,4 +75,17 @@ class BaseModel:
         base_model.position = parsed_data["base_model"]["_position"]
         base_model.temperature = parsed_data["base_model"]["_temperature"]
         base_model.voltage = parsed_data["base_model"]["_temperature"]
+        base_model.x = parsed_data["base_model"].get("_x")
+        base_model.y = parsed_data["base_model"].get("_y")
+        base_model.z = parsed_data["base_model"].get("_z")
         return base_model
+
+    def to_dict(self):
+        return {
+            "_position": self._position,
+            "_temperature": self._temperature,
+            "_voltage": self._voltage,
+            "_x": self._x,
+            "_y": self._y,
+            "_z": self._z
+        }
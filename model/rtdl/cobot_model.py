@@ -3,6 +3,8 @@ __copyright__ = "University of Derby"
 
 
 class CobotModel(object):
+    __slots__ = ("_elapsed_time",)
+
     def __init__(self):
         self._elapsed_time = None
 
@@ -25,3 +27,8 @@ class CobotModel(object):
         cobot_model = CobotModel()
         cobot_model.elapsed_time = parsed_data["cobot_model"]["_elapsed_time"]
         return cobot_model
+
+    def to_dict(self):
+        return {
+            "_elapsed_time": self._elapsed_time
+        }
@@ -3,6 +3,8 @@ __copyright__ = "University of Derby"
 
 
 class ControlBoxModel(object):
+    __slots__ = ("_voltage",)
+
     def __init__(self):
         self._voltage = None
 
@@ -25,3 +27,8 @@ class ControlBoxModel(object):
         control_box_model = ControlBoxModel()
         control_box_model.voltage = parsed_data["control_box_model"]["_voltage"]
         return control_box_model
+
+    def to_dict(self):
+        return {
+            "_voltage": self._voltage
+        }
@@ -3,6 +3,8 @@ __copyright__ = "University of Derby"
 
 
 class ElbowModel:
+    __slots__ = ("_position", "_temperature", "_voltage", "_x", "_y", "_z")
+
     def __init__(self):
         self._position = None
         self._temperature = None
@@ -65,9 +67,9 @@ class ElbowModel:
         elbow_model.position = rtdl_model.data_row[rtdl_model.header_row.index("actual_q_2")]
         elbow_model.temperature = rtdl_model.data_row[rtdl_model.header_row.index("joint_temperatures_2")]
         elbow_model.voltage = rtdl_model.data_row[rtdl_model.header_row.index("actual_current_2")]
-        elbow_model.x = rtdl_model.data_row[rtdl_model.header_row.index("elbow_position_0")]
-        elbow_model.y = rtdl_model.data_row[rtdl_model.header_row.index("elbow_position_1")]
-        elbow_model.z = rtdl_model.data_row[rtdl_model.header_row.index("elbow_position_2")]
+        elbow_model.x = rtdl_model.get_value("elbow_position_0")
+        elbow_model.y = rtdl_model.get_value("elbow_position_1")
+        elbow_model.z = rtdl_model.get_value("elbow_position_2")
         return elbow_model
 
     @staticmethod
@@ -80,3 +82,13 @@ class ElbowModel:
         elbow_model.y = parsed_data["elbow_model"]["_y"]
         elbow_model.z = parsed_data["elbow_model"]["_z"]
         return elbow_model
+
+    def to_dict(self):
+        return {
+            "_position": self._position,
+            "_temperature": self._temperature,
+            "_voltage": self._voltage,
+            "_x": self._x,
+            "_y": self._y,
+            "_z": self._z
+        }
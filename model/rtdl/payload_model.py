@@ -3,6 +3,8 @@ __copyright__ = "University of Derby"
 
 
 class PayloadModel(object):
+    __slots__ = ("_mass", "_cogx", "_cogy", "_cogz")
+
     def __init__(self):
         self._mass = None
         self._cogx = None
@@ -58,3 +60,11 @@ class PayloadModel(object):
         payload_model.cogy = parsed_data["payload_model"]["_cogy"]
         payload_model.cogz = parsed_data["payload_model"]["_cogz"]
         return payload_model
+
+    def to_dict(self):
+        return {
+            "_mass": self._mass,
+            "_cogx": self._cogx,
+            "_cogy": self._cogy,
+            "_cogz": self._cogz
+        }
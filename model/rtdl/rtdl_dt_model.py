@@ -1,7 +1,7 @@
 __author__ = "100638182"
 __copyright__ = "University of Derby"
 
-
+import json
 from model.rtdl.base_model import BaseModel
 from model.rtdl.cobot_model import CobotModel
 from model.rtdl.control_box_model import ControlBoxModel
@@ -14,7 +14,11 @@ from model.rtdl.wrist2_model import Wrist2Model
 from model.rtdl.wrist3_model import Wrist3Model
 
 
+# rebuilt for every RTDE frame, so the models are slotted and serialize their fields explicitly
 class RtdlDtModel(object):
+    __slots__ = ("_cobot_model", "_control_box_model", "_payload_model", "_base_model", "_shoulder_model",
+                 "_elbow_model", "_wrist1_model", "_wrist2_model", "_wrist3_model", "_tool_model")
+
     def __init__(self):
         self._cobot_model = None
         self._control_box_model = None
@@ -141,19 +145,19 @@ class RtdlDtModel(object):
         rtdl_dt_model._tool_model = ToolModel.get_from_parsed_data(parsed_data)
         return rtdl_dt_model
 
-    def get_json(self):
-        rtdl_dt_model = {
-            "cobot_model": self._cobot_model.__dict__,
-            "control_box_model": self._control_box_model.__dict__,
-            "payload_model": self._payload_model.__dict__,
-            "base_model": self._base_model.__dict__,
-            "shoulder_model": self._shoulder_model.__dict__,
-            "elbow_model": self._elbow_model.__dict__,
-            "wrist1_model": self._wrist1_model.__dict__,
-            "wrist2_model": self._wrist2_model.__dict__,
-            "wrist3_model": self._wrist3_model.__dict__,
-            "tool_model": self._tool_model.__dict__,
+    def to_dict(self):
+        return {
+            "cobot_model": self._cobot_model.to_dict(),
+            "control_box_model": self._control_box_model.to_dict(),
+            "payload_model": self._payload_model.to_dict(),
+            "base_model": self._base_model.to_dict(),
+            "shoulder_model": self._shoulder_model.to_dict(),
+            "elbow_model": self._elbow_model.to_dict(),
+            "wrist1_model": self._wrist1_model.to_dict(),
+            "wrist2_model": self._wrist2_model.to_dict(),
+            "wrist3_model": self._wrist3_model.to_dict(),
+            "tool_model": self._tool_model.to_dict()
         }
-        return rtdl_dt_model
-
 
+    def to_bytes(self):
+        return json.dumps(self.to_dict()).encode("utf-8")
@@ -3,6 +3,8 @@ __copyright__ = "University of Derby"
 
 
 class RtdlModel:
+    __slots__ = ("_header_row", "_data_row")
+
     def __init__(self):
         self._header_row = None
         self._data_row = None
@@ -23,6 +25,12 @@ class RtdlModel:
     def data_row(self, value):
         self._data_row = value
 
+    def get_value(self, name, default=None):
+        # fields derived by the kinematic twin may be missing from the recipe
+        if name not in self._header_row:
+            return default
+        return self._data_row[self._header_row.index(name)]
+
     @staticmethod
     def get_from_rows(header_row, data_row):
         rtdl_model = RtdlModel()
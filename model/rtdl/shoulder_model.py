@@ -4,10 +4,15 @@ __copyright__ = "University of Derby"
 
 
 class ShoulderModel:
+    __slots__ = ("_position", "_temperature", "_voltage", "_x", "_y", "_z")
+
     def __init__(self):
         self._position = None
         self._temperature = None
         self._voltage = None
+        self._x = None
+        self._y = None
+        self._z = None
 
     @property
     def position(self):
@@ -21,6 +26,18 @@ class ShoulderModel:
     def voltage(self):
         return self._voltage
 
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    @property
+    def z(self):
+        return self._z
+
     @position.setter
     def position(self, value):
         self._position = value
@@ -33,6 +50,18 @@ class ShoulderModel:
     def voltage(self, value):
         self._voltage = value
 
+    @x.setter
+    def x(self, value):
+        self._x = value
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+
+    @z.setter
+    def z(self, value):
+        self._z = value
+
     @staticmethod
     def get_from_rtdl_model(rtdl_model):
         shoulder_model = ShoulderModel()
@@ -47,4 +76,17 @@ class ShoulderModel:
         shoulder_model.position = parsed_data["shoulder_model"]["_position"]
         shoulder_model.temperature = parsed_data["shoulder_model"]["_temperature"]
         shoulder_model.voltage = parsed_data["shoulder_model"]["_voltage"]
+        shoulder_model.x = parsed_data["shoulder_model"].get("_x")
+        shoulder_model.y = parsed_data["shoulder_model"].get("_y")
+        shoulder_model.z = parsed_data["shoulder_model"].get("_z")
         return shoulder_model
+
+    def to_dict(self):
+        return {
+            "_position": self._position,
+            "_temperature": self._temperature,
+            "_voltage": self._voltage,
+            "_x": self._x,
+            "_y": self._y,
+            "_z": self._z
+        }
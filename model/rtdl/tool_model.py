@@ -4,6 +4,8 @@ __copyright__ = "University of Derby"
 
 
 class ToolModel:
+    __slots__ = ("_temperature", "_voltage", "_x", "_y", "_z", "_rx", "_ry", "_rz")
+
     def __init__(self):
         self._temperature = None
         self._voltage = None
@@ -83,12 +85,12 @@ class ToolModel:
         tool_model = ToolModel()
         tool_model.temperature = rtdl_model.data_row[rtdl_model.header_row.index("tool_temperature")]
         tool_model.voltage = rtdl_model.data_row[rtdl_model.header_row.index("tool_output_voltage")]
-        tool_model.x = rtdl_model.data_row[rtdl_model.header_row.index("actual_TCP_pose_0")]
-        tool_model.y = rtdl_model.data_row[rtdl_model.header_row.index("actual_TCP_pose_1")]
-        tool_model.z = rtdl_model.data_row[rtdl_model.header_row.index("actual_TCP_pose_2")]
-        tool_model.rx = rtdl_model.data_row[rtdl_model.header_row.index("actual_TCP_pose_3")]
-        tool_model.ry = rtdl_model.data_row[rtdl_model.header_row.index("actual_TCP_pose_4")]
-        tool_model.rz = rtdl_model.data_row[rtdl_model.header_row.index("actual_TCP_pose_5")]
+        tool_model.x = rtdl_model.get_value("actual_TCP_pose_0")
+        tool_model.y = rtdl_model.get_value("actual_TCP_pose_1")
+        tool_model.z = rtdl_model.get_value("actual_TCP_pose_2")
+        tool_model.rx = rtdl_model.get_value("actual_TCP_pose_3")
+        tool_model.ry = rtdl_model.get_value("actual_TCP_pose_4")
+        tool_model.rz = rtdl_model.get_value("actual_TCP_pose_5")
         return tool_model
 
     @staticmethod
@@ -103,3 +105,15 @@ class ToolModel:
         tool_model.ry = parsed_data["tool_model"]["_ry"]
         tool_model.rz = parsed_data["tool_model"]["_rz"]
         return tool_model
+
+    def to_dict(self):
+        return {
+            "_temperature": self._temperature,
+            "_voltage": self._voltage,
+            "_x": self._x,
+            "_y": self._y,
+            "_z": self._z,
+            "_rx": self._rx,
+            "_ry": self._ry,
+            "_rz": self._rz
+        }
@@ -4,10 +4,15 @@ __copyright__ = "University of Derby"
 
 
 class Wrist1Model:
+    __slots__ = ("_position", "_temperature", "_voltage", "_x", "_y", "_z")
+
     def __init__(self):
         self._position = None
         self._temperature = None
         self._voltage = None
+        self._x = None
+        self._y = None
+        self._z = None
 
     @property
     def position(self):
@@ -21,6 +26,18 @@ class Wrist1Model:
     def voltage(self):
         return self._voltage
 
+    @property
+    def x(self):
+        return self._x
+
+    @property
+    def y(self):
+        return self._y
+
+    @property
+    def z(self):
+        return self._z
+
     @position.setter
     def position(self, value):
         self._position = value
@@ -33,6 +50,18 @@ class Wrist1Model:
     def voltage(self, value):
         self._voltage = value
 
+    @x.setter
+    def x(self, value):
+        self._x = value
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+
+    @z.setter
+    def z(self, value):
+        self._z = value
+
     @staticmethod
     def get_from_rtdl_model(rtdl_model):
         wrist1_model = Wrist1Model()
@@ -47,4 +76,17 @@ class Wrist1Model:
         wrist1_model.position = parsed_data["wrist1_model"]["_position"]
         wrist1_model.temperature = parsed_data["wrist1_model"]["_temperature"]
         wrist1_model.voltage = parsed_data["wrist1_model"]["_voltage"]
+        wrist1_model.x = parsed_data["wrist1_model"].get("_x")
+        wrist1_model.y = parsed_data["wrist1_model"].get("_y")
+        wrist1_model.z = parsed_data["wrist1_model"].get("_z")
         return wrist1_model
+
+    def to_dict(self):
+        return {
+            "_position": self._position,
+            "_temperature": self._temperature,
+            "_voltage": self._voltage,
+            "_x": self._x,
+            "_y": self._y,
+            "_z": self._z
+        }